@@ -0,0 +1,86 @@
+import functools
+
+from asgiref.sync import sync_to_async
+from custom_auth.authentication import CachedTokenAuthentication
+from django.conf import settings
+from django.core.exceptions import ObjectDoesNotExist
+from django.http import JsonResponse
+from rest_framework import exceptions
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+token_authentication = CachedTokenAuthentication()
+authenticate = sync_to_async(token_authentication.authenticate)
+
+
+def error_response(exc):
+    response = JsonResponse({"detail": exc.detail}, status=exc.status_code)
+    if isinstance(exc, exceptions.NotAuthenticated):
+        response["WWW-Authenticate"] = token_authentication.keyword
+    return response
+
+
+def async_api_view(permission_classes=()):
+    """
+    Turns an async function into a read only JSON endpoint served without
+    DRF. The request is authenticated by token as the DRF views do, the
+    permissions are checked with the user and API errors are rendered the
+    DRF way. The function returns the data to render.
+    """
+
+    def decorator(view):
+        @functools.wraps(view)
+        async def wrapper(request, *args, **kwargs):
+            try:
+                if request.method != "GET":
+                    raise exceptions.MethodNotAllowed(request.method)
+                user_token = await authenticate(request)
+                if user_token is None:
+                    raise exceptions.NotAuthenticated()
+                request.user = user_token[0]
+                for permission in (cls() for cls in permission_classes):
+                    if not permission.has_permission(request, None):
+                        raise exceptions.PermissionDenied(
+                            getattr(permission, "message", None)
+                        )
+                data = await view(request, *args, **kwargs)
+            except ObjectDoesNotExist:
+                return error_response(exceptions.NotFound())
+            except exceptions.APIException as exc:
+                return error_response(exc)
+            return JsonResponse(data, safe=False)
+
+        return wrapper
+
+    return decorator
+
+
+async def paginate(request, queryset, serialize):
+    """
+    Loads a page of the queryset with the async ORM and returns it in the
+    shape of the default page number pagination.
+    """
+    page_size = settings.REST_FRAMEWORK["PAGE_SIZE"]
+    try:
+        page = int(request.GET.get("page", 1))
+    except ValueError:
+        raise exceptions.NotFound("Invalid page.")
+    count = await queryset.acount()
+    offset = (page - 1) * page_size
+    if page < 1 or (offset and offset >= count):
+        raise exceptions.NotFound("Invalid page.")
+
+    objects = [obj async for obj in queryset[offset : offset + page_size]]
+    url = request.build_absolute_uri()
+    next_url = previous_url = None
+    if offset + page_size < count:
+        next_url = replace_query_param(url, "page", page + 1)
+    if page == 2:
+        previous_url = remove_query_param(url, "page")
+    elif page > 2:
+        previous_url = replace_query_param(url, "page", page - 1)
+    return {
+        "count": count,
+        "next": next_url,
+        "previous": previous_url,
+        "results": serialize(objects),
+    }
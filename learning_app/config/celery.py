@@ -1,9 +1,18 @@
 import os
 
 from celery import Celery
+from celery.worker.control import inspect_command
+
+from .db_pool.pool import pool_stats
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
 app = Celery("config")
 app.config_from_object("django.conf:settings", namespace="CELERY")
 
 app.autodiscover_tasks()
+
+
+@inspect_command()
+def db_pool_stats(state):
+    """The metrics of the connection pools of the worker."""
+    return pool_stats()
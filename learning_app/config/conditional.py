@@ -0,0 +1,79 @@
+import hashlib
+from functools import partial
+
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
+
+
+class ConditionalGetMixin:
+    """
+    Answers list and detail GETs of a viewset with 304 Not Modified when
+    the client's copy is current, without serializing anything.
+
+    The state is read with one aggregate query over `last_modified_field`,
+    which has to change whenever anything in the serialized object does.
+    Lists get an ETag only: the newest timestamp doesn't move when an object
+    is deleted, but the count in the ETag does. Details get Last-Modified
+    as well.
+    """
+
+    last_modified_field = "updated_at"
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        return self.conditional_response(
+            request,
+            queryset,
+            partial(super().list, request, *args, **kwargs),
+            detail=False,
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        queryset = self.filter_queryset(self.get_queryset()).filter(
+            **{self.lookup_field: kwargs[lookup_url_kwarg]}
+        )
+        return self.conditional_response(
+            request,
+            queryset,
+            partial(super().retrieve, request, *args, **kwargs),
+            detail=True,
+        )
+
+    def conditional_state(self, queryset):
+        return queryset.order_by().aggregate(
+            last_modified=Max(self.last_modified_field), count=Count("pk")
+        )
+
+    def conditional_response(self, request, queryset, respond, detail):
+        state = self.conditional_state(queryset)
+        if detail and not state["count"]:
+            return respond()
+
+        last_modified = state["last_modified"]
+        etag = '"{}"'.format(
+            hashlib.md5(
+                ":".join(
+                    (
+                        str(request.user.pk),
+                        request.get_full_path(),
+                        request.accepted_renderer.format,
+                        last_modified.isoformat() if last_modified else "",
+                        str(state["count"]),
+                    )
+                ).encode()
+            ).hexdigest()
+        )
+        timestamp = int(last_modified.timestamp()) if detail else None
+
+        response = get_conditional_response(
+            request, etag=etag, last_modified=timestamp
+        )
+        if response is None:
+            response = respond()
+        response["ETag"] = etag
+        if timestamp is not None:
+            response["Last-Modified"] = http_date(timestamp)
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
@@ -0,0 +1,47 @@
+from functools import partial
+
+from django.db.backends.postgresql import base
+
+from .pool import get_pool
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    """
+    The PostgreSQL backend with connections checked out from a pool shared
+    by the threads of the process instead of opened per thread. Closing the
+    connection, at the end of every request with `CONN_MAX_AGE` 0, returns
+    it to the pool. The pool is configured by the "POOL" key of the
+    database settings.
+    """
+
+    pooled = None
+
+    @property
+    def pool(self):
+        settings_dict = self.settings_dict
+        key = (
+            self.alias,
+            settings_dict["HOST"],
+            settings_dict["PORT"],
+            settings_dict["NAME"],
+            settings_dict["USER"],
+        )
+        return get_pool(key, **settings_dict.get("POOL", {}))
+
+    def get_new_connection(self, conn_params):
+        self.pooled = self.pool.checkout(
+            partial(super().get_new_connection, conn_params)
+        )
+        connection = self.pooled.connection
+        # Set by the parent for new connections only.
+        self.isolation_level = self.settings_dict["OPTIONS"].get(
+            "isolation_level", connection.isolation_level
+        )
+        return connection
+
+    def _close(self):
+        if self.pooled is None:
+            return super()._close()
+        pooled, self.pooled = self.pooled, None
+        with self.wrap_database_errors:
+            self.pool.checkin(pooled)
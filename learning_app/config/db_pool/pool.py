@@ -0,0 +1,211 @@
+import os
+import threading
+import time
+from collections import deque
+
+
+class PoolTimeout(Exception):
+    pass
+
+
+class PooledConnection:
+    def __init__(self, connection):
+        self.connection = connection
+        self.created_at = time.monotonic()
+
+
+class ConnectionPool:
+    """
+    A thread safe pool of DB-API connections. It keeps up to `size`
+    connections open and opens up to `max_overflow` more under load, which
+    are closed instead of returned once the load is gone. A checkout waits
+    up to `timeout` seconds for a free connection.
+
+    Connections older than `max_lifetime` seconds are replaced and, with
+    `health_check`, every connection is pinged on checkout. A forked child
+    process starts with an empty pool rather than share the parent's
+    sockets.
+    """
+
+    def __init__(
+        self,
+        size=10,
+        max_overflow=0,
+        timeout=5,
+        max_lifetime=None,
+        health_check=True,
+    ):
+        self.size = size
+        self.max_overflow = max_overflow
+        self.timeout = timeout
+        self.max_lifetime = max_lifetime
+        self.health_check = health_check
+        self._condition = threading.Condition()
+        self._reset()
+
+    def _reset(self):
+        self._pid = os.getpid()
+        self._idle = deque()
+        self._open = 0
+        self._in_use = 0
+        self._checkouts = 0
+        self._waits = 0
+        self._wait_time = 0.0
+        self._max_wait_time = 0.0
+        self._timeouts = 0
+        self._discarded = 0
+
+    def checkout(self, connect):
+        """
+        Returns a healthy idle connection, or one made by `connect` when
+        there's none and the pool may grow.
+        """
+        started = time.monotonic()
+        deadline = started + self.timeout
+        while True:
+            pooled = self._reserve(deadline)
+            if pooled is None:
+                try:
+                    pooled = PooledConnection(connect())
+                except Exception:
+                    self._release()
+                    raise
+            elif not self._usable(pooled):
+                self._discard(pooled)
+                continue
+            break
+
+        waited = time.monotonic() - started
+        with self._condition:
+            self._in_use += 1
+            self._checkouts += 1
+            self._wait_time += waited
+            self._max_wait_time = max(self._max_wait_time, waited)
+        return pooled
+
+    def _reserve(self, deadline):
+        """
+        Takes an idle connection, or returns None after reserving a slot
+        for a new one.
+        """
+        with self._condition:
+            if self._pid != os.getpid():
+                self._reset()
+            waited = False
+            while True:
+                if self._idle:
+                    return self._idle.pop()
+                if self._open < self.size + self.max_overflow:
+                    self._open += 1
+                    return None
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._timeouts += 1
+                    raise PoolTimeout(
+                        f"No connection was freed within {self.timeout}s."
+                    )
+                if not waited:
+                    self._waits += 1
+                    waited = True
+                self._condition.wait(remaining)
+
+    def checkin(self, pooled):
+        with self._condition:
+            if self._pid != os.getpid():
+                return
+            self._in_use -= 1
+            keep = self._open <= self.size and not self._expired(pooled)
+        if keep and self._reset_connection(pooled):
+            with self._condition:
+                self._idle.append(pooled)
+                self._condition.notify()
+        else:
+            self._discard(pooled)
+
+    def _expired(self, pooled):
+        return (
+            self.max_lifetime is not None
+            and time.monotonic() - pooled.created_at > self.max_lifetime
+        )
+
+    def _usable(self, pooled):
+        if self._expired(pooled) or pooled.connection.closed:
+            return False
+        if not self.health_check:
+            return True
+        try:
+            with pooled.connection.cursor() as cursor:
+                cursor.execute("SELECT 1")
+        except Exception:
+            return False
+        return True
+
+    def _reset_connection(self, pooled):
+        """Rolls back what the last user left open."""
+        if pooled.connection.closed:
+            return False
+        try:
+            pooled.connection.rollback()
+        except Exception:
+            return False
+        return True
+
+    def _discard(self, pooled):
+        try:
+            pooled.connection.close()
+        except Exception:
+            pass
+        self._release(discarded=True)
+
+    def _release(self, discarded=False):
+        with self._condition:
+            self._open -= 1
+            self._discarded += discarded
+            self._condition.notify()
+
+    def close(self):
+        with self._condition:
+            idle, self._idle = self._idle, deque()
+        for pooled in idle:
+            self._discard(pooled)
+
+    def stats(self):
+        with self._condition:
+            checkouts = self._checkouts
+            wait_time_avg = self._wait_time / checkouts if checkouts else 0
+            return {
+                "size": self.size,
+                "max_overflow": self.max_overflow,
+                "open": self._open,
+                "idle": len(self._idle),
+                "in_use": self._in_use,
+                "overflow": max(0, self._open - self.size),
+                "checkouts": checkouts,
+                "waits": self._waits,
+                "timeouts": self._timeouts,
+                "discarded": self._discarded,
+                "wait_time_avg": wait_time_avg,
+                "wait_time_max": self._max_wait_time,
+            }
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(key, **options):
+    """Returns the pool of the process for `key`, creating it first."""
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = _pools[key] = ConnectionPool(**options)
+        return pool
+
+
+def pool_stats():
+    with _pools_lock:
+        pools = dict(_pools)
+    return {
+        "/".join(str(part) for part in key if part): pool.stats()
+        for key, pool in pools.items()
+    }
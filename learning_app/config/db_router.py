@@ -0,0 +1,112 @@
+import contextlib
+import hashlib
+import random
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import FileResponse
+from rest_framework.permissions import SAFE_METHODS
+
+replica_reads = ContextVar("replica_reads", default=False)
+
+
+@contextlib.contextmanager
+def read_from_primary():
+    """Sends the reads of the block to the primary database."""
+    token = replica_reads.set(False)
+    try:
+        yield
+    finally:
+        replica_reads.reset(token)
+
+
+class PrimaryReplicaRouter:
+    """
+    Sends the reads allowed on a replica to one of `DATABASE_REPLICAS` and
+    everything else to the primary. Reads outside of a request, e.g. in
+    Celery tasks or commands, go to the primary as they often follow a write
+    which a replica may not have yet.
+    """
+
+    def db_for_read(self, model, **hints):
+        if settings.DATABASE_REPLICAS and replica_reads.get():
+            return random.choice(settings.DATABASE_REPLICAS)
+        return "default"
+
+    def db_for_write(self, model, **hints):
+        return "default"
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # The replicas hold the same data as the primary.
+        return True
+
+    def allow_migrate(self, db, app_label, **hints):
+        return db == "default"
+
+
+def pin_key(request):
+    """
+    The cache key of the client's pin to the primary, derived from its
+    credentials: the token or the session. Anonymous clients aren't pinned.
+    """
+    credential = request.META.get("HTTP_AUTHORIZATION") or (
+        request.COOKIES.get(settings.SESSION_COOKIE_NAME)
+    )
+    if not credential:
+        return None
+    return "db:pin:" + hashlib.sha256(credential.encode()).hexdigest()
+
+
+def with_replica_reads(content, value):
+    """
+    Sets `replica_reads` while every chunk of a streaming body is produced,
+    as its queries run after the middleware has returned.
+    """
+    iterator = iter(content)
+    end = object()
+    while True:
+        token = replica_reads.set(value)
+        try:
+            chunk = next(iterator, end)
+        finally:
+            replica_reads.reset(token)
+        if chunk is end:
+            return
+        yield chunk
+
+
+class ReadYourWritesMiddleware:
+    """
+    Lets the safe requests read from the replicas, unless the client made
+    a write in the last `DATABASE_REPLICA_PIN_TIMEOUT` seconds, which the
+    replicas may not have replicated yet. The whole of a write request uses
+    the primary. The body of a streaming response is read from the same
+    database as the view.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        key = pin_key(request)
+        if request.method not in SAFE_METHODS:
+            response = self.get_response(request)
+            if key is not None:
+                cache.set(
+                    key, True, timeout=settings.DATABASE_REPLICA_PIN_TIMEOUT
+                )
+            return response
+
+        pinned = key is not None and cache.get(key, False)
+        token = replica_reads.set(not pinned)
+        try:
+            response = self.get_response(request)
+        finally:
+            replica_reads.reset(token)
+        # Files are streamed without queries, and maybe by the server.
+        if response.streaming and not isinstance(response, FileResponse):
+            response.streaming_content = with_replica_reads(
+                response.streaming_content, not pinned
+            )
+        return response
@@ -0,0 +1,326 @@
+import http.client
+import json
+import random
+import socket
+import threading
+import time
+from urllib.parse import urlencode, urlsplit
+
+
+def percentile(values, q):
+    """The nearest rank percentile of sorted values."""
+    if not values:
+        return 0
+    return values[min(len(values) - 1, int(len(values) * q))]
+
+
+class Stats:
+    """The latencies and failures of the requests, by request name."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._latencies = {}
+        self._errors = {}
+
+    def record(self, name, latency, ok):
+        with self._lock:
+            self._latencies.setdefault(name, []).append(latency)
+            self._errors[name] = self._errors.get(name, 0) + (not ok)
+
+    def summary(self, elapsed):
+        with self._lock:
+            latencies = {k: sorted(v) for k, v in self._latencies.items()}
+            errors = dict(self._errors)
+        requests = {
+            name: self.summarize(values, errors[name], elapsed)
+            for name, values in sorted(latencies.items())
+        }
+        total = self.summarize(
+            sorted(v for values in latencies.values() for v in values),
+            sum(errors.values()),
+            elapsed,
+        )
+        return requests, total
+
+    @staticmethod
+    def summarize(latencies, errors, elapsed):
+        ms = 1000
+        return {
+            "requests": len(latencies),
+            "errors": errors,
+            "rps": round(len(latencies) / elapsed, 2),
+            "mean_ms": round(
+                sum(latencies) / len(latencies) * ms if latencies else 0, 2
+            ),
+            "p50_ms": round(percentile(latencies, 0.5) * ms, 2),
+            "p90_ms": round(percentile(latencies, 0.9) * ms, 2),
+            "p99_ms": round(percentile(latencies, 0.99) * ms, 2),
+            "max_ms": round(latencies[-1] * ms if latencies else 0, 2),
+        }
+
+
+class Client:
+    """
+    The keep-alive HTTP connection of a virtual user, authenticated by its
+    token. Every request is timed and recorded under its name, a response
+    with an unexpected status or no response at all counts as an error.
+    """
+
+    def __init__(self, url, token, stats, timeout=30):
+        parts = urlsplit(url)
+        self.host = parts.hostname
+        self.port = parts.port or 80
+        self.headers = {
+            "Authorization": f"Token {token}",
+            "Accept": "application/json",
+        }
+        self.stats = stats
+        self.timeout = timeout
+        self.connection = None
+
+    def request(self, name, method, path, data=None, query=None, ok=(200,)):
+        if query:
+            path += "?" + urlencode(query)
+        headers = dict(self.headers)
+        body = None
+        if data is not None:
+            body = json.dumps(data).encode()
+            headers["Content-Type"] = "application/json"
+
+        started = time.perf_counter()
+        try:
+            if self.connection is None:
+                self.connection = http.client.HTTPConnection(
+                    self.host, self.port, timeout=self.timeout
+                )
+            self.connection.request(method, path, body, headers)
+            response = self.connection.getresponse()
+            content = response.read()
+        except (OSError, http.client.HTTPException):
+            self.stats.record(name, time.perf_counter() - started, False)
+            self.close()
+            return None, None
+        self.stats.record(
+            name, time.perf_counter() - started, response.status in ok
+        )
+        if response.will_close:
+            self.close()
+        if response.getheader("Content-Type", "").startswith(
+            "application/json"
+        ):
+            return response.status, json.loads(content or b"null")
+        return response.status, content
+
+    def close(self):
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
+
+
+def submitted_task_ids(client):
+    """The tasks the student has submitted, read from all result pages."""
+    task_ids = set()
+    page = 1
+    while page:
+        status, data = client.request(
+            "student_results", "GET", "/student/result/", query={"page": page}
+        )
+        if status != 200:
+            break
+        task_ids.update(result["task"] for result in data["results"])
+        page = page + 1 if data.get("next") else None
+    return task_ids
+
+
+def student_scenario(client, user, rng, state):
+    """
+    Browses the catalog, joins a course, reads its tasks, answers the first
+    question of one and submits the task with the rest of the answers.
+    """
+    if "submitted" not in state:
+        state["submitted"] = submitted_task_ids(client)
+
+    client.request("catalog", "GET", "/course/")
+    course_id = rng.choice(user["courses"])
+    client.request(
+        "join_course",
+        "POST",
+        f"/student/course/{course_id}/join_course/",
+        ok=(200, 202),
+    )
+    status, data = client.request(
+        "student_tasks",
+        "GET",
+        "/student/task/",
+        query={"course_id": course_id},
+    )
+    if status != 200:
+        return
+    tasks = [t for t in data["results"] if t["id"] not in state["submitted"]]
+    if not tasks:
+        return
+
+    task_id = rng.choice(tasks)["id"]
+    status, task = client.request(
+        "student_task", "GET", f"/student/task/{task_id}/"
+    )
+    if status != 200 or not task["questions"]:
+        return
+    first, *rest = [question["id"] for question in task["questions"]]
+    client.request(
+        "answer",
+        "POST",
+        "/student/answer/",
+        data={"question": first, "text": "My answer."},
+        ok=(201,),
+    )
+    client.request(
+        "submit",
+        "POST",
+        f"/student/task/{task_id}/submit/",
+        data={
+            "answers": [
+                {"question": question, "text": "My answer."}
+                for question in rest
+            ]
+        },
+        ok=(201,),
+    )
+    state["submitted"].add(task_id)
+    client.request("student_results", "GET", "/student/result/")
+
+
+def professor_scenario(client, user, rng, state):
+    """
+    Grades the answers and results of one of the professor's tasks, one by
+    one and in bulk, reads the gradebook and exports the grades as CSV.
+    """
+    client.request("professor_courses", "GET", "/professor/course/")
+    task = rng.choice(user["tasks"])
+    query = {"task_id": task["id"]}
+
+    status, data = client.request(
+        "professor_answers", "GET", "/professor/answer/", query=query
+    )
+    if status == 200 and data["results"]:
+        answers = data["results"]
+        client.request(
+            "grade_answer",
+            "PATCH",
+            f"/professor/answer/{rng.choice(answers)['id']}/",
+            data={"grade": rng.randint(0, 100)},
+        )
+        client.request(
+            "bulk_grade_answers",
+            "POST",
+            "/professor/answer/bulk_grade/",
+            data={
+                "grades": [
+                    {"id": answer["id"], "grade": rng.randint(0, 100)}
+                    for answer in answers
+                ]
+            },
+        )
+
+    status, data = client.request(
+        "professor_results", "GET", "/professor/result/", query=query
+    )
+    if status == 200 and data["results"]:
+        client.request(
+            "bulk_grade_results",
+            "POST",
+            "/professor/result/bulk_grade/",
+            data={
+                "grades": [
+                    {"id": result["id"], "grade": rng.randint(0, 100)}
+                    for result in data["results"]
+                ]
+            },
+        )
+
+    client.request(
+        "gradebook", "GET", f"/professor/course/{task['course']}/gradebook/"
+    )
+    client.request(
+        "export_results", "GET", "/professor/result/export/", query=query
+    )
+    client.request(
+        "export_answers", "GET", "/professor/answer/export/", query=query
+    )
+
+
+SCENARIOS = {"student": student_scenario, "professor": professor_scenario}
+
+
+def run(url, seed, virtual_users, duration, think_time=0, random_seed=0):
+    """
+    Runs the scenario of every virtual user, given as (role, user) pairs of
+    the seed, in a loop from its own thread for `duration` seconds and
+    returns the statistics of the requests.
+    """
+    stats = Stats()
+    deadline = time.monotonic() + duration
+    iterations = []
+
+    def virtual_user(number, role, user):
+        client = Client(url, user["token"], stats)
+        rng = random.Random(f"{random_seed}:{number}")
+        scenario = SCENARIOS[role]
+        state = {}
+        count = 0
+        try:
+            while time.monotonic() < deadline:
+                scenario(client, user, rng, state)
+                count += 1
+                if think_time:
+                    time.sleep(rng.uniform(0, 2 * think_time))
+        finally:
+            client.close()
+            iterations.append(count)
+
+    threads = [
+        threading.Thread(target=virtual_user, args=(number, role, user))
+        for number, (role, user) in enumerate(virtual_users)
+    ]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    requests, total = stats.summary(elapsed)
+    return {
+        "elapsed_s": round(elapsed, 2),
+        "iterations": sum(iterations),
+        "requests": requests,
+        "total": total,
+    }
+
+
+def compare(baseline, report):
+    """
+    Yields the name and the relative change, in percent, of p50, p99 and
+    throughput of every request of the report which the baseline has too.
+    """
+
+    def change(old, new):
+        return round((new - old) / old * 100, 1) if old else 0.0
+
+    pairs = [
+        (name, baseline["requests"][name], stats)
+        for name, stats in report["requests"].items()
+        if name in baseline["requests"]
+    ]
+    pairs.append(("total", baseline["total"], report["total"]))
+    for name, old, new in pairs:
+        yield name, {
+            key: change(old[key], new[key])
+            for key in ("p50_ms", "p99_ms", "rps")
+        }
+
+
+def check_server(url):
+    """Fails early with a readable error when the server isn't reachable."""
+    parts = urlsplit(url)
+    socket.create_connection((parts.hostname, parts.port or 80), 5).close()
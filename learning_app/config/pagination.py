@@ -0,0 +1,109 @@
+import json
+from collections import OrderedDict
+
+from django.db import connections
+from rest_framework.compat import coreapi, coreschema
+from rest_framework.exceptions import ValidationError
+from rest_framework.pagination import CursorPagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+
+KEYSET_ORDERINGS = (("id",), ("-id",), ("pk",), ("-pk",))
+
+
+def estimate_count(queryset):
+    """
+    Returns the planner's row estimate for the queryset instead of running
+    `COUNT(*)`. Falls back to an exact count on non PostgreSQL databases.
+    """
+    connection = connections[queryset.db]
+    if connection.vendor != "postgresql":
+        return queryset.count()
+
+    sql, params = queryset.order_by().query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+class KeysetPagination(CursorPagination):
+    """
+    Cursor pagination over the `id` ordering of the view queryset.
+    Every page is a single indexed range scan, however deep it is.
+    """
+
+    ordering = "-id"
+    estimate_query_param = "estimate_total"
+    estimate_query_description = "Pass `true` to get an estimated total."
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.estimated_total = None
+        estimate = request.query_params.get(self.estimate_query_param, "")
+        if estimate.lower() in ("1", "true", "yes"):
+            self.estimated_total = estimate_count(queryset)
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_ordering(self, request, queryset, view):
+        ordering = tuple(queryset.query.order_by)
+        if ordering in KEYSET_ORDERINGS:
+            return ordering
+        return super().get_ordering(request, queryset, view)
+
+    def get_paginated_response(self, data):
+        response = OrderedDict(
+            [
+                ("next", self.get_next_link()),
+                ("previous", self.get_previous_link()),
+            ]
+        )
+        if self.estimated_total is not None:
+            response["estimated_total"] = self.estimated_total
+        response["results"] = data
+        return Response(response)
+
+    def get_schema_fields(self, view):
+        fields = super().get_schema_fields(view)
+        fields.append(
+            coreapi.Field(
+                name=self.estimate_query_param,
+                required=False,
+                location="query",
+                schema=coreschema.Boolean(
+                    title="Estimate total",
+                    description=self.estimate_query_description,
+                ),
+            )
+        )
+        return fields
+
+
+class HybridPagination(PageNumberPagination):
+    """
+    Page number pagination by default. Passing the `cursor` query param,
+    even empty, switches a list to keyset pagination. Keyset pages are in
+    `id` order, so they can't be combined with a search ranked by relevance.
+    """
+
+    keyset_class = KeysetPagination
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.keyset = None
+        if self.keyset_class.cursor_query_param in request.query_params:
+            if request.query_params.get(api_settings.SEARCH_PARAM, "").strip():
+                err = "Search results can't be paginated by cursor."
+                raise ValidationError({"cursor": err})
+            self.keyset = self.keyset_class()
+            return self.keyset.paginate_queryset(queryset, request, view)
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.keyset is not None:
+            return self.keyset.get_paginated_response(data)
+        return super().get_paginated_response(data)
+
+    def get_schema_fields(self, view):
+        keyset_fields = self.keyset_class().get_schema_fields(view)
+        return super().get_schema_fields(view) + keyset_fields
@@ -0,0 +1,57 @@
+import contextlib
+import time
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+
+class QueryCounter:
+    """A database execute wrapper counting the queries and their time."""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - started
+            self.count += 1
+
+
+@contextlib.contextmanager
+def count_queries():
+    """Counts the queries of the block to every database of the thread."""
+    counter = QueryCounter()
+    with contextlib.ExitStack() as stack:
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(counter))
+        yield counter
+
+
+class QueryCountMiddleware:
+    """
+    Reports the number of queries of a request and their time in the
+    X-DB-Query-Count, X-DB-Time (in milliseconds) and Server-Timing headers
+    when `QUERY_COUNT_HEADERS` is set. The queries made while a streaming
+    response is consumed aren't counted.
+    """
+
+    def __init__(self, get_response):
+        if not settings.QUERY_COUNT_HEADERS:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with count_queries() as counter:
+            response = self.get_response(request)
+        duration = counter.duration * 1000
+        response["X-DB-Query-Count"] = counter.count
+        response["X-DB-Time"] = f"{duration:.2f}"
+        response["Server-Timing"] = (
+            f'db;dur={duration:.2f};desc="{counter.count} queries"'
+        )
+        return response
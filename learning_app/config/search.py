@@ -0,0 +1,92 @@
+from django.contrib.postgres.search import (
+    SearchQuery,
+    SearchRank,
+    TrigramWordSimilarity,
+)
+from django.db import connections
+from django.db.models import F, FloatField, Q
+from django.db.models.functions import Coalesce
+from rest_framework.filters import SearchFilter
+
+
+def is_postgresql(queryset):
+    return connections[queryset.db].vendor == "postgresql"
+
+
+def update_search_vector(queryset, vector):
+    """
+    Recomputes the denormalized `search_vector` column of the queryset rows
+    in a single UPDATE. Other databases have no tsvector support, the column
+    is left empty there.
+    """
+    if is_postgresql(queryset):
+        queryset.update(search_vector=vector)
+
+
+def full_text_search(queryset, terms, vector_fields, trigram_fields=()):
+    """
+    Filters the queryset by the GIN indexed `vector_fields` (full-text match)
+    and `trigram_fields` (word similarity), ordering rows by relevance.
+    """
+    query = SearchQuery(terms, search_type="websearch")
+    condition = Q()
+    ranks = []
+    for field in vector_fields:
+        condition |= Q(**{field: query})
+        ranks.append(SearchRank(F(field), query))
+    for field in trigram_fields:
+        condition |= Q(**{f"{field}__trigram_word_similar": terms})
+        ranks.append(TrigramWordSimilarity(terms, field))
+
+    rank = sum(
+        (Coalesce(r, 0.0, output_field=FloatField()) for r in ranks[1:]),
+        Coalesce(ranks[0], 0.0, output_field=FloatField()),
+    )
+
+    return (
+        queryset.filter(condition)
+        .annotate(search_rank=rank)
+        .order_by("-search_rank", *queryset.query.order_by)
+    )
+
+
+class FullTextSearchFilter(SearchFilter):
+    """
+    Ranked search over the view's `search_vector_fields` and
+    `search_trigram_fields`. Uses the `search_fields` of the default
+    `SearchFilter` on databases other than PostgreSQL.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        if not is_postgresql(queryset):
+            return super().filter_queryset(request, queryset, view)
+
+        terms = " ".join(self.get_search_terms(request))
+        if not terms:
+            return queryset
+
+        return full_text_search(
+            queryset,
+            terms,
+            getattr(view, "search_vector_fields", ("search_vector",)),
+            getattr(view, "search_trigram_fields", ()),
+        )
+
+
+class FullTextSearchAdminMixin:
+    """Same as `FullTextSearchFilter` for the admin changelist search."""
+
+    search_vector_fields = ("search_vector",)
+    search_trigram_fields = ()
+
+    def get_search_results(self, request, queryset, search_term):
+        if not is_postgresql(queryset) or not search_term.strip():
+            return super().get_search_results(request, queryset, search_term)
+
+        queryset = full_text_search(
+            queryset,
+            search_term,
+            self.search_vector_fields,
+            self.search_trigram_fields,
+        )
+        return queryset, False
@@ -0,0 +1,133 @@
+import mimetypes
+import os
+import re
+from urllib.parse import quote
+
+from django.conf import settings
+from django.http import FileResponse, HttpResponse, StreamingHttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, parse_http_date_safe
+
+RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+def content_disposition(filename):
+    try:
+        filename.encode("ascii")
+    except UnicodeEncodeError:
+        return f"attachment; filename*=utf-8''{quote(filename)}"
+    filename = filename.replace("\\", "\\\\").replace('"', r"\"")
+    return f'attachment; filename="{filename}"'
+
+
+def byte_range(header, size):
+    """
+    The first and the last position of a single `bytes` range, None when
+    the whole file is to be served. Raises ValueError when the range can't
+    be satisfied.
+    """
+    match = RANGE_RE.match(header or "")
+    if not match or match.groups() == ("", ""):
+        return None
+
+    first, last = match.groups()
+    if not first:
+        first, last = max(size - int(last), 0), size - 1
+    else:
+        first = int(first)
+        last = min(int(last), size - 1) if last else size - 1
+    if first > last or first >= size:
+        raise ValueError("Unsatisfiable range.")
+    return first, last
+
+
+def if_range_matches(request, etag, last_modified):
+    if_range = request.META.get("HTTP_IF_RANGE")
+    if not if_range:
+        return True
+    if if_range.startswith(('"', "W/")):
+        return if_range == etag
+    return parse_http_date_safe(if_range) == last_modified
+
+
+def read_range(file, first, last, chunk_size=FileResponse.block_size):
+    try:
+        file.seek(first)
+        remaining = last - first + 1
+        while remaining:
+            chunk = file.read(min(remaining, chunk_size))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+    finally:
+        file.close()
+
+
+def sendfile(request, field_file, filename=None):
+    """
+    Responds with the file of a FileField, honoring conditional and single
+    range requests. With SENDFILE_BACKEND set, the body is left to the front
+    proxy: "nginx" redirects to SENDFILE_URL_PREFIX + the file name with
+    X-Accel-Redirect, "xsendfile" passes the file path in X-Sendfile. The
+    proxy handles ranges itself then.
+    """
+    storage, name = field_file.storage, field_file.name
+    filename = filename or os.path.basename(name)
+    size = storage.size(name)
+    last_modified = int(storage.get_modified_time(name).timestamp())
+    etag = f'"{last_modified:x}-{size:x}"'
+
+    response = get_conditional_response(
+        request, etag=etag, last_modified=last_modified
+    )
+    if response is None:
+        response = _file_response(
+            request, field_file, size, etag, last_modified
+        )
+
+    content_type, _ = mimetypes.guess_type(filename)
+    if response.status_code in (200, 206):
+        response["Content-Type"] = content_type or "application/octet-stream"
+        response["Content-Disposition"] = content_disposition(filename)
+    response["ETag"] = etag
+    response["Last-Modified"] = http_date(last_modified)
+    response["Cache-Control"] = "private, no-cache"
+    return response
+
+
+def _file_response(request, field_file, size, etag, last_modified):
+    backend = settings.SENDFILE_BACKEND
+    if backend == "nginx":
+        response = HttpResponse()
+        response["X-Accel-Redirect"] = settings.SENDFILE_URL_PREFIX + quote(
+            field_file.name
+        )
+        return response
+    if backend == "xsendfile":
+        response = HttpResponse()
+        response["X-Sendfile"] = field_file.path
+        return response
+
+    response_range = None
+    if if_range_matches(request, etag, last_modified):
+        try:
+            response_range = byte_range(request.META.get("HTTP_RANGE"), size)
+        except ValueError:
+            response = HttpResponse(status=416)
+            response["Content-Range"] = f"bytes */{size}"
+            return response
+
+    file = field_file.storage.open(field_file.name, "rb")
+    if response_range is None:
+        response = FileResponse(file)
+        response["Content-Length"] = size
+    else:
+        first, last = response_range
+        response = StreamingHttpResponse(
+            read_range(file, first, last), status=206
+        )
+        response["Content-Length"] = last - first + 1
+        response["Content-Range"] = f"bytes {first}-{last}/{size}"
+    response["Accept-Ranges"] = "bytes"
+    return response
@@ -1,4 +1,5 @@
 import os
+from datetime import timedelta
 from pathlib import Path
 
 from dotenv import load_dotenv
@@ -12,16 +13,46 @@ SECRET_KEY = os.getenv("SECRET_KEY")
 # SECURITY WARNING: don't run with debug turned on in production!
 DEBUG = True
 
+# Adds the query count and time of every request to its headers.
+QUERY_COUNT_HEADERS = DEBUG
+
 ALLOWED_HOSTS = []
 
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": [
-        "rest_framework.authentication.TokenAuthentication",
+        "custom_auth.authentication.CachedTokenAuthentication",
     ],
-    "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
+    "DEFAULT_PAGINATION_CLASS": "config.pagination.HybridPagination",
     "PAGE_SIZE": 10,
+    # The number of proxies in front of the app, each appending to
+    # X-Forwarded-For. The client IP is the address the outermost one saw,
+    # or REMOTE_ADDR without proxies, never what the client itself sent.
+    "NUM_PROXIES": int(os.getenv("NUM_PROXIES", 0)),
+    "DEFAULT_THROTTLE_CLASSES": [
+        "config.throttling.IPRateThrottle",
+        "config.throttling.AccountRateThrottle",
+    ],
+    # Views with a `throttle_scope` are throttled per client IP and per
+    # account at the "<scope>.ip" and "<scope>.account" rates.
+    "DEFAULT_THROTTLE_RATES": {
+        "login.ip": "20/min",
+        "login.account": "5/min",
+        "register.ip": "10/hour",
+        "register.account": "3/hour",
+        "reset_password.account": "5/hour",
+        "reset_email.account": "3/hour",
+    },
 }
 
+# Tokens are rotated on login and expire after AUTH_TOKEN_TTL. Authenticated
+# tokens are cached in the shared cache and, for a few seconds, in a process
+# local LRU.
+AUTH_TOKEN_TTL = timedelta(days=7)
+AUTH_TOKEN_ROTATE_ON_LOGIN = True
+AUTH_TOKEN_CACHE_TIMEOUT = 60 * 15
+AUTH_TOKEN_LOCAL_CACHE_SIZE = 4096
+AUTH_TOKEN_LOCAL_CACHE_TIMEOUT = 5
+
 EMAIL_HOST = "smtp.yandex.by"
 EMAIL_PORT = 465
 EMAIL_HOST_USER = os.getenv("EMAIL_HOST_USER")
@@ -29,6 +60,12 @@ EMAIL_HOST_PASSWORD = os.getenv("EMAIL_HOST_PASSWORD")
 EMAIL_USE_TLS = False
 EMAIL_USE_SSL = True
 
+# Bulk email (e.g. course announcements) is sent in batches of
+# EMAIL_BATCH_SIZE messages over one SMTP connection, a worker sends at most
+# EMAIL_BATCH_RATE_LIMIT batches to respect the provider's limits.
+EMAIL_BATCH_SIZE = 100
+EMAIL_BATCH_RATE_LIMIT = "10/m"
+
 
 # Application definition
 
@@ -39,6 +76,7 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
     "rest_framework",
     "custom_auth",
     "course",
@@ -49,6 +87,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "config.query_count.QueryCountMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -56,6 +95,7 @@ MIDDLEWARE = [
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    "config.db_router.ReadYourWritesMiddleware",
 ]
 
 ROOT_URLCONF = "config.urls"
@@ -82,17 +122,91 @@ WSGI_APPLICATION = "config.wsgi.application"
 # Database
 # https://docs.djangoproject.com/en/4.1/ref/settings/#databases
 
+# The threads of a process share a pool of connections, sized by the kind
+# of process: the web server or the Celery worker. The connections older
+# than "max_lifetime" seconds are replaced and every connection is checked
+# before it's handed out. The pool metrics are served at
+# /metrics/db-pool/ and returned by `celery -A config inspect db_pool_stats`.
+
+PROCESS_TYPE = os.getenv("PROCESS_TYPE", "web")
+
+DB_POOL_OPTIONS = {
+    "web": {
+        "size": 10,
+        "max_overflow": 10,
+        "timeout": 5,
+        "max_lifetime": 30 * 60,
+        "health_check": True,
+    },
+    "celery": {
+        "size": 4,
+        "max_overflow": 4,
+        "timeout": 30,
+        "max_lifetime": 30 * 60,
+        "health_check": True,
+    },
+}
+
 DATABASES = {
     "default": {
-        "ENGINE": "django.db.backends.postgresql_psycopg2",
+        "ENGINE": "config.db_pool",
         "NAME": os.getenv("DB_NAME"),
         "USER": os.getenv("DB_USER"),
         "PASSWORD": os.getenv("DB_PASSWORD"),
         "HOST": os.getenv("DB_HOST"),
         "PORT": os.getenv("DB_PORT"),
+        # Returns the connection to the pool after every request.
+        "CONN_MAX_AGE": 0,
+        "POOL": DB_POOL_OPTIONS[PROCESS_TYPE],
     }
 }
 
+# Safe requests read from the replicas at the comma separated
+# DB_REPLICA_HOSTS, with the credentials of the primary. A client which
+# wrote reads from the primary for DATABASE_REPLICA_PIN_TIMEOUT seconds, so
+# it sees its writes. Tests run the replicas as mirrors of the primary.
+
+DB_REPLICA_HOSTS = os.getenv("DB_REPLICA_HOSTS", "")
+DATABASE_REPLICAS = []
+for i, host in enumerate(filter(None, DB_REPLICA_HOSTS.split(","))):
+    alias = f"replica_{i + 1}"
+    DATABASES[alias] = {
+        **DATABASES["default"],
+        "HOST": host.strip(),
+        "TEST": {"MIRROR": "default"},
+    }
+    DATABASE_REPLICAS.append(alias)
+
+DATABASE_ROUTERS = ["config.db_router.PrimaryReplicaRouter"]
+DATABASE_REPLICA_PIN_TIMEOUT = 10
+
+# Cache
+# https://docs.djangoproject.com/en/4.1/topics/cache/
+
+REDIS_URL = os.getenv("REDIS_URL")
+
+if REDIS_URL:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        }
+    }
+
+# Course catalog pages and details are cached per catalog version, which
+# signals move on every change. An entry is fresh for CATALOG_CACHE_TIMEOUT
+# and served stale for CATALOG_CACHE_STALE_TIMEOUT more while one worker
+# recomputes it.
+CATALOG_CACHE_TIMEOUT = 60 * 5
+CATALOG_CACHE_STALE_TIMEOUT = 60
+CATALOG_CACHE_LOCK_TIMEOUT = 5
+
 # Password validation
 # https://docs.djangoproject.com/en/4.1/ref/settings/#auth-password-validators
 
@@ -135,6 +249,22 @@ STATIC_URL = "static/"
 MEDIA_ROOT = "media/"
 MEDIA_URL = "media/"
 
+# Resumable answer uploads are assembled in MEDIA_ROOT/ANSWER_UPLOAD_DIR, on
+# the same filesystem as the media, so finalizing one is a rename.
+ANSWER_UPLOAD_DIR = "uploads/"
+ANSWER_UPLOAD_MAX_SIZE = 1024 * 1024 * 1024
+ANSWER_UPLOAD_CHUNK_SIZE = 64 * 1024
+# A student can have this many uploads open at once, an upload without a
+# chunk for ANSWER_UPLOAD_TTL is expired and its part file removed.
+ANSWER_UPLOAD_MAX_OPEN = 3
+ANSWER_UPLOAD_TTL = timedelta(hours=24)
+
+# Attachments are served by the app unless SENDFILE_BACKEND hands them off to
+# the front proxy: "nginx" (X-Accel-Redirect to SENDFILE_URL_PREFIX) or
+# "xsendfile" (X-Sendfile with the file path).
+SENDFILE_BACKEND = os.getenv("SENDFILE_BACKEND")
+SENDFILE_URL_PREFIX = "/protected/media/"
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/4.1/ref/settings/#default-auto-field
 
@@ -144,6 +274,24 @@ AUTH_USER_MODEL = "custom_auth.User"
 
 CELERY_BROKER_URL = "redis://localhost:6379/0"
 CELERY_RESULT_BACKEND = "redis://localhost:6379/0"
+# The tasks wait on SMTP and the database rather than compute, so a worker
+# runs them in threads sharing its connection pool.
+CELERY_WORKER_POOL = "threads"
+CELERY_WORKER_CONCURRENCY = 8
+CELERY_BEAT_SCHEDULE = {
+    "send-deadline-reminders": {
+        "task": "task_result.tasks.send_deadline_reminders",
+        "schedule": timedelta(minutes=5),
+    },
+    "expire-answer-uploads": {
+        "task": "task_result.tasks.expire_answer_uploads",
+        "schedule": timedelta(hours=1),
+    },
+}
+
+# Students who haven't submitted a task are reminded when its deadline gets
+# within each of the windows.
+DEADLINE_REMINDER_WINDOWS = (timedelta(hours=24), timedelta(hours=1))
 
 SWAGGER_SETTINGS = {
     "SECURITY_DEFINITIONS": {
@@ -0,0 +1,93 @@
+import csv
+import zipfile
+
+from django.http import StreamingHttpResponse
+
+
+class Echo:
+    """A file-like object whose `write` returns the value instead of storing
+    it, so a csv writer hands back every formatted row."""
+
+    def write(self, value):
+        return value
+
+
+class ZipBuffer:
+    """An unseekable file-like object that keeps what a zip file writes only
+    until it's drained into the response."""
+
+    def __init__(self):
+        self.chunks = []
+        self.position = 0
+
+    def write(self, data):
+        self.chunks.append(bytes(data))
+        self.position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self.position
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        if self.chunks:
+            yield b"".join(self.chunks)
+            self.chunks.clear()
+
+
+# Spreadsheets run a cell starting with one of these as a formula.
+FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+
+def escape_formula(value):
+    """Makes a user-provided text cell show as text in a spreadsheet."""
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+def csv_response(filename, header, rows):
+    """
+    Streams the rows as a CSV attachment, holding a single row at a time.
+    Text cells which would run as formulas are escaped.
+    """
+    writer = csv.writer(Echo())
+
+    def content():
+        yield writer.writerow(header)
+        for row in rows:
+            yield writer.writerow([escape_formula(value) for value in row])
+
+    response = StreamingHttpResponse(content(), content_type="text/csv")
+    response["Content-Disposition"] = f'attachment; filename="{filename}"'
+    return response
+
+
+def zip_response(filename, files, chunk_size=64 * 1024):
+    """
+    Streams a ZIP archive of the `(name, open)` pairs of files, `open`
+    returning the binary file or raising FileNotFoundError to skip it.
+    The archive is written without a temporary file, holding a single
+    chunk of a file at a time.
+    """
+
+    def content():
+        buffer = ZipBuffer()
+        with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+            for name, open_file in files:
+                try:
+                    file = open_file()
+                except FileNotFoundError:
+                    continue
+                with file, archive.open(name, "w", force_zip64=True) as entry:
+                    for chunk in iter(lambda: file.read(chunk_size), b""):
+                        entry.write(chunk)
+                        yield from buffer.drain()
+                yield from buffer.drain()
+        yield from buffer.drain()
+
+    response = StreamingHttpResponse(content(), content_type="application/zip")
+    response["Content-Disposition"] = f'attachment; filename="{filename}"'
+    return response
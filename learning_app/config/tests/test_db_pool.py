@@ -0,0 +1,156 @@
+import threading
+import time
+from unittest import mock
+
+from config.db_pool.pool import ConnectionPool, PoolTimeout, pool_stats
+from custom_auth.models import User
+from custom_auth.tests.factories import UserFactory
+from django.test import SimpleTestCase
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+
+class FakeCursor:
+    def __init__(self, connection):
+        self.connection = connection
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        pass
+
+    def execute(self, sql):
+        if self.connection.broken:
+            raise OSError("server closed the connection unexpectedly")
+
+
+class FakeConnection:
+    def __init__(self):
+        self.closed = False
+        self.broken = False
+        self.rollbacks = 0
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def rollback(self):
+        self.rollbacks += 1
+
+    def close(self):
+        self.closed = True
+
+
+class TestConnectionPool(SimpleTestCase):
+    def test_reuse(self):
+        """
+        Ensure a connection returned to the pool is rolled back and handed
+        out again instead of a new one.
+        """
+        pool = ConnectionPool(size=2)
+        pooled = pool.checkout(FakeConnection)
+        pool.checkin(pooled)
+
+        self.assertIs(pool.checkout(FakeConnection), pooled)
+        self.assertEqual(pooled.connection.rollbacks, 1)
+        self.assertEqual(pool.stats()["open"], 1)
+
+    def test_health_check(self):
+        """
+        Ensure a connection which fails the check on checkout is replaced.
+        """
+        pool = ConnectionPool(size=1)
+        pooled = pool.checkout(FakeConnection)
+        pool.checkin(pooled)
+        pooled.connection.broken = True
+
+        replacement = pool.checkout(FakeConnection)
+
+        self.assertIsNot(replacement, pooled)
+        self.assertTrue(pooled.connection.closed)
+        self.assertEqual(pool.stats()["discarded"], 1)
+        self.assertEqual(pool.stats()["open"], 1)
+
+    def test_max_lifetime(self):
+        """Ensure connections are replaced once they reach the lifetime."""
+        pool = ConnectionPool(size=1, max_lifetime=60)
+        pooled = pool.checkout(FakeConnection)
+        pool.checkin(pooled)
+        pooled.created_at -= 30
+        self.assertIs(pool.checkout(FakeConnection), pooled)
+
+        pooled.created_at -= 31
+        pool.checkin(pooled)
+
+        self.assertTrue(pooled.connection.closed)
+        self.assertEqual(pool.stats()["idle"], 0)
+
+    def test_overflow(self):
+        """
+        Ensure the pool grows by the overflow under load, closes the extra
+        connections once returned, and times out past the overflow.
+        """
+        pool = ConnectionPool(size=1, max_overflow=1, timeout=0)
+        first = pool.checkout(FakeConnection)
+        second = pool.checkout(FakeConnection)
+        self.assertEqual(pool.stats()["overflow"], 1)
+        self.assertEqual(pool.stats()["in_use"], 2)
+        with self.assertRaises(PoolTimeout):
+            pool.checkout(FakeConnection)
+
+        pool.checkin(second)
+        pool.checkin(first)
+
+        self.assertTrue(second.connection.closed)
+        self.assertFalse(first.connection.closed)
+        stats = pool.stats()
+        self.assertEqual(
+            (stats["open"], stats["idle"], stats["in_use"], stats["timeouts"]),
+            (1, 1, 0, 1),
+        )
+
+    def test_wait(self):
+        """
+        Ensure a thread waits for a connection returned by another one and
+        the wait is measured.
+        """
+        pool = ConnectionPool(size=1, timeout=5)
+        pooled = pool.checkout(FakeConnection)
+        checked_out = []
+        waiter = threading.Thread(
+            target=lambda: checked_out.append(pool.checkout(FakeConnection))
+        )
+        waiter.start()
+        while not pool.stats()["waits"]:
+            time.sleep(0.001)
+        pool.checkin(pooled)
+        waiter.join()
+
+        self.assertEqual(checked_out, [pooled])
+        self.assertEqual(pool.stats()["checkouts"], 2)
+
+    def test_failed_connect(self):
+        """Ensure a failed connection doesn't take a slot of the pool."""
+        pool = ConnectionPool(size=1, timeout=0)
+        with self.assertRaises(OSError):
+            pool.checkout(mock.Mock(side_effect=OSError))
+
+        pool.checkout(FakeConnection)
+        self.assertEqual(pool.stats()["open"], 1)
+
+
+class TestDBPoolStats(APITestCase):
+    def test_admin_only(self):
+        """Ensure only admins see the pool metrics."""
+        self.client.force_authenticate(
+            UserFactory(role=User.Role.STUDENT, is_active=True)
+        )
+        response = self.client.get("/metrics/db-pool/")
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+        self.client.force_authenticate(
+            UserFactory(role=User.Role.ADMIN, is_active=True)
+        )
+        response = self.client.get("/metrics/db-pool/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, pool_stats())
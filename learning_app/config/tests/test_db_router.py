@@ -0,0 +1,195 @@
+from unittest import mock, skipUnless
+
+import time_machine
+from config.db_router import (
+    ReadYourWritesMiddleware,
+    read_from_primary,
+    replica_reads,
+)
+from course.models import Course
+from course.tests.factories import CourseFactory
+from custom_auth.models import User
+from custom_auth.tests.factories import UserFactory
+from django.core.cache import cache
+from django.conf import settings
+from django.db import connections, router
+from django.http import HttpResponse, StreamingHttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APITestCase, APITransactionTestCase
+
+REPLICAS = ["replica_1", "replica_2"]
+
+
+@override_settings(
+    DATABASE_REPLICAS=REPLICAS, DATABASE_REPLICA_PIN_TIMEOUT=10
+)
+class TestReadYourWritesRouting(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        self.factory = RequestFactory()
+        self.routed = []
+        self.middleware = ReadYourWritesMiddleware(self.respond)
+
+    def respond(self, request):
+        self.routed.append(
+            (router.db_for_read(Course), router.db_for_write(Course))
+        )
+        return HttpResponse()
+
+    def request(self, method, token="student"):
+        headers = {"HTTP_AUTHORIZATION": f"Token {token}"} if token else {}
+        self.middleware(getattr(self.factory, method)("/course/", **headers))
+        return self.routed[-1]
+
+    def test_primary_by_default(self):
+        """
+        Ensure reads outside of a request, e.g. in Celery tasks, use the
+        primary.
+        """
+        self.assertEqual(router.db_for_read(Course), "default")
+
+    def test_safe_requests_read_from_replicas(self):
+        """
+        Ensure safe requests read from a replica and write to the primary.
+        """
+        read, write = self.request("get")
+        self.assertIn(read, REPLICAS)
+        self.assertEqual(write, "default")
+
+    def test_write_requests_use_primary(self):
+        """Ensure the reads of a write request use the primary."""
+        self.assertEqual(self.request("post"), ("default", "default"))
+
+    def test_read_your_writes(self):
+        """
+        Ensure a client reads from the primary for the pin timeout after a
+        write, while other clients keep reading from the replicas.
+        """
+        with time_machine.travel(0, tick=False) as traveller:
+            self.request("post")
+            traveller.shift(9)
+            self.assertEqual(self.request("get")[0], "default")
+            self.assertIn(self.request("get", token="other")[0], REPLICAS)
+            self.assertIn(self.request("get", token=None)[0], REPLICAS)
+
+            traveller.shift(2)
+            self.assertIn(self.request("get")[0], REPLICAS)
+
+    def test_streaming_reads_from_replicas(self):
+        """
+        Ensure the queries of a streaming body, run after the view returns,
+        read from a replica too, and from the primary when pinned.
+        """
+
+        def respond(request):
+            if request.method != "GET":
+                return HttpResponse()
+            return StreamingHttpResponse(
+                router.db_for_read(Course) for _ in range(2)
+            )
+
+        self.middleware.get_response = respond
+        headers = {"HTTP_AUTHORIZATION": "Token student"}
+        response = self.middleware(self.factory.get("/course/", **headers))
+        self.assertFalse(replica_reads.get())
+        chunks = list(response.streaming_content)
+        self.assertIn(chunks[0].decode(), REPLICAS)
+        self.assertIn(chunks[1].decode(), REPLICAS)
+        self.assertFalse(replica_reads.get())
+
+        self.middleware(self.factory.post("/course/", **headers))
+        response = self.middleware(self.factory.get("/course/", **headers))
+        self.assertEqual(list(response.streaming_content), [b"default"] * 2)
+
+    def test_read_from_primary(self):
+        """Ensure a block can force the reads of a safe request to primary."""
+
+        def respond(request):
+            with read_from_primary():
+                self.routed.append(router.db_for_read(Course))
+            self.routed.append(router.db_for_read(Course))
+            return HttpResponse()
+
+        self.middleware.get_response = respond
+        self.middleware(self.factory.get("/course/"))
+
+        self.assertEqual(self.routed[0], "default")
+        self.assertIn(self.routed[1], REPLICAS)
+        self.assertFalse(replica_reads.get())
+
+
+class TestReadYourWritesAPI(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.course = CourseFactory()
+        student = UserFactory(
+            role=User.Role.STUDENT, email_confirmed=True, is_active=True
+        )
+        cls.token = Token.objects.create(user=student)
+
+    def setUp(self):
+        cache.clear()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {self.token.key}")
+
+    @override_settings(DATABASE_REPLICAS=["default"])
+    def test_student_reads_after_join(self):
+        """
+        Ensure a student browsing the catalog reads from a replica, but from
+        the primary right after joining a course.
+        """
+        with mock.patch(
+            "config.db_router.random.choice", return_value="default"
+        ) as choose_replica:
+            response = self.client.get("/student/course/")
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertTrue(choose_replica.called)
+
+            response = self.client.post(
+                f"/student/course/{self.course.id}/join_course/"
+            )
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            choose_replica.reset_mock()
+            response = self.client.get("/student/course/")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["count"], 1)
+        self.assertFalse(choose_replica.called)
+
+
+@skipUnless(settings.DATABASE_REPLICAS, "No replica is configured.")
+class TestReplicaDatabase(APITransactionTestCase):
+    """
+    Runs against the first replica alias, e.g. with
+    DB_REPLICA_HOSTS=localhost, which the test runner mirrors to the test
+    database of the primary.
+    """
+
+    databases = "__all__"
+
+    def test_student_reads_after_join(self):
+        """
+        Ensure the catalog of a student is read from the replica, and from
+        the primary right after they join a course.
+        """
+        course = CourseFactory()
+        student = UserFactory(
+            role=User.Role.STUDENT, email_confirmed=True, is_active=True
+        )
+        token = Token.objects.create(user=student)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {token.key}")
+        replica = connections[settings.DATABASE_REPLICAS[0]]
+
+        with CaptureQueriesContext(replica) as replica_queries:
+            response = self.client.get("/student/course/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(replica_queries)
+
+        self.client.post(f"/student/course/{course.id}/join_course/")
+        with CaptureQueriesContext(replica) as replica_queries:
+            response = self.client.get("/student/course/")
+
+        self.assertEqual(response.data["count"], 1)
+        self.assertFalse(replica_queries)
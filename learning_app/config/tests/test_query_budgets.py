@@ -0,0 +1,228 @@
+import re
+import shutil
+import tempfile
+from collections import namedtuple
+
+from course.models import Announcement
+from course.tests.factories import CourseFactory
+from course_task.tests.factories import QuestionFactory, TaskFactory
+from custom_auth.models import User
+from custom_auth.tests.factories import UserFactory
+from custom_auth.tokens import account_activation_token
+from django.contrib import admin
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import get_resolver
+from django.utils.encoding import force_bytes
+from django.utils.http import urlsafe_base64_encode
+from rest_framework import status
+from rest_framework.test import APITestCase
+from task_result.models import AnswerUpload
+from task_result.tests.factories import AnswerFactory, ResultFactory
+
+# The most queries a read endpoint may make, as whom it's requested, the
+# object of its {pk} and its query string. The counts must not depend on
+# the number of rows.
+Budget = namedtuple(
+    "Budget",
+    ("queries", "user", "pk", "query", "status"),
+    defaults=(None, "", status.HTTP_200_OK),
+)
+
+BUDGETS = {
+    "users/": Budget(2, "student"),
+    "users/{pk}/": Budget(1, "student", "student"),
+    "users/activate_email/": Budget(
+        3, None, query="uidb64={uidb64}&token={token}"
+    ),
+    "users/ping/": Budget(0, "student"),
+    "users/reset_email/": Budget(
+        0, "student", status=status.HTTP_400_BAD_REQUEST
+    ),
+    "users/reset_password/": Budget(
+        0, "student", status=status.HTTP_400_BAD_REQUEST
+    ),
+    "course/": Budget(3, "student"),
+    "course/{pk}/": Budget(2, "student", "course"),
+    "course/{pk}/students/": Budget(2, "student", "course"),
+    "professor/course/": Budget(2, "professor"),
+    "professor/course/{pk}/": Budget(1, "professor", "course"),
+    "professor/course/{pk}/announcements/": Budget(3, "professor", "course"),
+    "professor/course/{pk}/gradebook/": Budget(3, "professor", "course"),
+    "student/course/": Budget(3, "student"),
+    "student/course/{pk}/": Budget(2, "student", "course"),
+    "student/course/{pk}/announcements/": Budget(3, "student", "course"),
+    "professor/task/": Budget(3, "professor"),
+    "professor/task/{pk}/": Budget(2, "professor", "task"),
+    "professor/task/{pk}/attachments.zip/": Budget(3, "professor", "task"),
+    "student/task/": Budget(5, "student"),
+    "student/task/{pk}/": Budget(4, "student", "task"),
+    "professor/answer/": Budget(3, "professor"),
+    "professor/answer/export/": Budget(2, "professor"),
+    "professor/answer/{pk}/attachment/": Budget(2, "professor", "answer"),
+    "professor/result/": Budget(2, "professor"),
+    "professor/result/export/": Budget(1, "professor"),
+    "professor/result/{pk}/": Budget(1, "professor", "result"),
+    "student/answer/": Budget(3, "student"),
+    "student/answer/{pk}/attachment/": Budget(2, "student", "answer"),
+    "student/upload/{pk}/": Budget(1, "student", "upload"),
+    "student/result/": Budget(2, "student"),
+    "student/result/{pk}/": Budget(1, "student", "result"),
+}
+
+# The most queries of the change lists of the admin site.
+ADMIN_BUDGETS = {
+    "authtoken/tokenproxy": 5,
+    "course/announcement": 5,
+    "course/course": 5,
+    "course_task/question": 6,
+    "course_task/task": 5,
+    "custom_auth/user": 5,
+    "task_result/answer": 5,
+    "task_result/result": 5,
+}
+
+# The rows seeded before each measurement, added to the previous ones.
+SEED_SIZES = (1, 3)
+
+
+def router_get_routes(patterns=None, prefix=""):
+    """The routes of the viewsets with a GET action, "{pk}" for the pk."""
+    if patterns is None:
+        patterns = get_resolver().url_patterns
+    for pattern in patterns:
+        route = prefix + str(pattern.pattern).lstrip("^").rstrip("$")
+        if hasattr(pattern, "url_patterns"):
+            yield from router_get_routes(pattern.url_patterns, route)
+        elif "get" in (getattr(pattern.callback, "actions", None) or {}):
+            yield re.sub(r"\(\?P<pk>[^)]+\)", "{pk}", route)
+
+
+class TestQueryBudgets(APITestCase):
+    """
+    Requests every read endpoint of the routers and every admin change list
+    over seeded data of growing size, and fails if one exceeds its budget
+    or makes more queries with more rows.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.professor = UserFactory(role=User.Role.PROFESSOR, is_active=True)
+        cls.student = UserFactory(
+            role=User.Role.STUDENT, email_confirmed=True, is_active=True
+        )
+        cls.admin = UserFactory(role=User.Role.ADMIN, is_active=True)
+
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        settings = override_settings(MEDIA_ROOT=media_root)
+        settings.enable()
+        self.addCleanup(settings.disable)
+        self.objects = {}
+
+    def seed(self, size):
+        """
+        Adds `size` courses with as many more students, and `size` tasks per
+        course, questions per task and announcements per course, answered
+        and resulted by every student.
+        """
+        for _ in range(size):
+            course = CourseFactory(professor=self.professor)
+            students = [self.student] + [
+                UserFactory(role=User.Role.STUDENT) for _ in range(size)
+            ]
+            course.students.add(*students)
+            Announcement.objects.bulk_create(
+                Announcement(course=course, title="News", text="Hello!")
+                for _ in range(size)
+            )
+            for _ in range(size):
+                task = TaskFactory(course=course)
+                for student in students:
+                    ResultFactory(task=task, student=student)
+                for _ in range(size):
+                    question = QuestionFactory(task=task)
+                    for student in students:
+                        AnswerFactory(question=question, student=student)
+
+        if not self.objects:
+            answer = self.student.answers.earliest("id")
+            answer.attachment.save("essay.txt", ContentFile(b"An essay."))
+            self.objects = {
+                "student": self.student,
+                "course": answer.question.task.course,
+                "task": answer.question.task,
+                "answer": answer,
+                "result": self.student.results.earliest("id"),
+                "upload": AnswerUpload.objects.create(
+                    answer=answer, filename="essay.txt", size=100
+                ),
+            }
+        # An activation link can only be used once.
+        guest = UserFactory(role=User.Role.GUEST, is_active=True)
+        self.objects["uidb64"] = urlsafe_base64_encode(force_bytes(guest.pk))
+        self.objects["token"] = account_activation_token.make_token(guest)
+
+    def count_queries(self, path, user):
+        cache.clear()
+        if user is None:
+            self.client.logout()
+        else:
+            self.client.force_login(user)
+            self.client.force_authenticate(user)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(path)
+            if response.streaming:
+                b"".join(response.streaming_content)
+        return response, len(queries)
+
+    def test_every_endpoint_has_a_budget(self):
+        """Ensure a new read endpoint can't be added without a budget."""
+        self.assertEqual(set(router_get_routes()), set(BUDGETS))
+        registered = {
+            f"{model._meta.app_label}/{model._meta.model_name}"
+            for model in admin.site._registry
+        }
+        self.assertEqual(registered, set(ADMIN_BUDGETS))
+
+    def test_query_budgets(self):
+        """
+        Ensure the endpoints and the admin change lists keep to their query
+        budgets, whatever the number of rows.
+        """
+        users = {
+            "student": self.student,
+            "professor": self.professor,
+            "admin": self.admin,
+            None: None,
+        }
+        budgets = dict(BUDGETS)
+        for model, queries in ADMIN_BUDGETS.items():
+            budgets[f"admin/{model}/"] = Budget(queries, "admin")
+
+        counts = {}
+        for size in SEED_SIZES:
+            self.seed(size)
+            for route, budget in budgets.items():
+                pk = self.objects[budget.pk].pk if budget.pk else None
+                path = "/" + route.format(pk=pk)
+                if budget.query:
+                    path += "?" + budget.query.format(**self.objects)
+                user = users[budget.user]
+                response, count = self.count_queries(path, user)
+                with self.subTest(path=path, size=size):
+                    self.assertEqual(response.status_code, budget.status)
+                    self.assertLessEqual(count, budget.queries)
+                counts.setdefault(route, []).append(count)
+
+        for route, route_counts in counts.items():
+            with self.subTest(route=route):
+                self.assertEqual(
+                    len(set(route_counts)),
+                    1,
+                    f"The queries grow with the rows: {route_counts}",
+                )
@@ -0,0 +1,37 @@
+from course.tests.factories import CourseFactory
+from custom_auth.models import User
+from custom_auth.tests.factories import UserFactory
+from django.core.cache import cache
+from django.test import override_settings
+from rest_framework.test import APITestCase
+
+
+class TestQueryCountMiddleware(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.course = CourseFactory()
+        cls.student = UserFactory(role=User.Role.STUDENT, is_active=True)
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_authenticate(self.student)
+
+    @override_settings(QUERY_COUNT_HEADERS=True)
+    def test_headers(self):
+        """Ensure the query count and time of a request are reported."""
+        with self.assertNumQueries(3):
+            response = self.client.get("/course/")
+
+        self.assertEqual(response["X-DB-Query-Count"], "3")
+        self.assertGreater(float(response["X-DB-Time"]), 0)
+        self.assertTrue(response["Server-Timing"].startswith("db;dur="))
+
+        response = self.client.get("/course/")
+        self.assertEqual(response["X-DB-Query-Count"], "0")
+
+    @override_settings(QUERY_COUNT_HEADERS=False)
+    def test_disabled(self):
+        """Ensure nothing is reported when the headers are turned off."""
+        response = self.client.get("/course/")
+        self.assertNotIn("X-DB-Query-Count", response)
+        self.assertNotIn("Server-Timing", response)
@@ -0,0 +1,141 @@
+import hashlib
+import time
+import uuid
+from collections.abc import Mapping
+
+from django.core.cache import cache
+from django.core.cache.backends.redis import RedisCache
+from rest_framework.settings import api_settings
+from rest_framework.throttling import SimpleRateThrottle
+
+# Keeps the timestamps of the requests in the window in a sorted set and
+# adds the current one only if the window has room for it. Returns 0 when
+# the request is allowed, otherwise the milliseconds until the oldest
+# request leaves the window.
+SLIDING_WINDOW_SCRIPT = """
+local now = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+redis.call("ZREMRANGEBYSCORE", KEYS[1], "-inf", now - window)
+if redis.call("ZCARD", KEYS[1]) < tonumber(ARGV[3]) then
+    redis.call("ZADD", KEYS[1], now, ARGV[4])
+    redis.call("PEXPIRE", KEYS[1], window)
+    return 0
+end
+local oldest = redis.call("ZRANGE", KEYS[1], 0, 0, "WITHSCORES")
+return math.max(1, tonumber(oldest[2]) + window - now)
+"""
+
+
+def redis_sliding_window(key, limit, window):
+    client = cache._cache.get_client(key, write=True)
+    script = client.register_script(SLIDING_WINDOW_SCRIPT)
+    wait = script(
+        keys=(cache.make_key(key),),
+        args=(
+            int(time.time() * 1000),
+            int(window * 1000),
+            limit,
+            uuid.uuid4().hex,
+        ),
+    )
+    return int(wait) / 1000
+
+
+def counter_sliding_window(key, limit, window):
+    """
+    Approximates the sliding window with the counters of the current and
+    the previous fixed windows, the latter weighted by its share of the
+    sliding one. Works with any cache backend which increments atomically.
+    """
+    now = time.time()
+    bucket, elapsed = divmod(now, window)
+    current_key = f"{key}:{int(bucket)}"
+    previous = cache.get(f"{key}:{int(bucket) - 1}", 0)
+    cache.add(current_key, 0, timeout=int(window * 2))
+    current = cache.incr(current_key)
+
+    weight = (window - elapsed) / window
+    if previous * weight + current <= limit:
+        return 0
+    cache.decr(current_key)
+    if current > limit or not previous:
+        return window - elapsed
+    # Until the previous window's share drops enough to fit the request.
+    return window - elapsed - (limit - current) * window / previous
+
+
+def sliding_window_hit(key, limit, window):
+    """
+    Counts a request against `limit` requests per `window` seconds. Returns
+    0 when it's allowed, otherwise the seconds to wait.
+    """
+    if isinstance(cache, RedisCache):
+        return redis_sliding_window(key, limit, window)
+    return counter_sliding_window(key, limit, window)
+
+
+class SlidingWindowThrottle(SimpleRateThrottle):
+    """
+    Throttles the requests of the views with a `throttle_scope` by a sliding
+    window counter in the shared cache. The rate of a scope is looked up in
+    `DEFAULT_THROTTLE_RATES` as "<scope>.<kind>", views of a scope without
+    a rate for the kind aren't throttled by it.
+
+    The subclasses decide what is counted by `get_ident`. As throttles run
+    before the handler, a rejected request costs neither password hashing
+    nor a query.
+    """
+
+    kind = None
+
+    def __init__(self):
+        # The scope and the rate are only known from the view.
+        pass
+
+    def allow_request(self, request, view):
+        scope = getattr(view, "throttle_scope", None)
+        rates = api_settings.DEFAULT_THROTTLE_RATES
+        self.rate = rates.get(f"{scope}.{self.kind}")
+        if scope is None or self.rate is None:
+            return True
+
+        ident = self.get_ident(request)
+        if ident is None:
+            return True
+        self.num_requests, self.duration = self.parse_rate(self.rate)
+        digest = hashlib.md5(str(ident).encode()).hexdigest()
+        self.key = f"throttle:{scope}.{self.kind}:{digest}"
+        self.retry_after = sliding_window_hit(
+            self.key, self.num_requests, self.duration
+        )
+        return not self.retry_after
+
+    def wait(self):
+        return self.retry_after
+
+
+class IPRateThrottle(SlidingWindowThrottle):
+    """Counts the requests per client IP."""
+
+    kind = "ip"
+
+
+class AccountRateThrottle(SlidingWindowThrottle):
+    """
+    Counts the requests per account: the authenticated user, or the account
+    named in the request, so one account can't be attacked from many IPs.
+    """
+
+    kind = "account"
+    account_fields = ("username", "email")
+
+    def get_ident(self, request):
+        if request.user and request.user.is_authenticated:
+            return request.user.pk
+        if not isinstance(request.data, Mapping):
+            return None
+        for field in self.account_fields:
+            value = request.data.get(field)
+            if isinstance(value, str) and value.strip():
+                return value.strip().lower()
+        return None
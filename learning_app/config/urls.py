@@ -13,14 +13,14 @@ Including another URLconf
     1. Import the include() function: from django.urls import include, path
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
-from django.conf import settings
-from django.conf.urls.static import static
+from custom_auth.views import LoginView
 from django.contrib import admin
 from django.urls import include, path
 from drf_yasg import openapi
 from drf_yasg.views import get_schema_view
 from rest_framework import permissions
-from rest_framework.authtoken import views
+
+from .views import DBPoolStatsView
 
 schema_view = get_schema_view(
     openapi.Info(
@@ -41,7 +41,8 @@ urlpatterns = [
     path("", include("course.urls")),
     path("", include("course_task.urls")),
     path("", include("task_result.urls")),
-    path("login/", views.obtain_auth_token),
+    path("login/", LoginView.as_view()),
+    path("metrics/db-pool/", DBPoolStatsView.as_view()),
     path(
         "",
         schema_view.with_ui("swagger", cache_timeout=0),
@@ -53,4 +54,3 @@ urlpatterns = [
         name="schema-redoc",
     ),
 ]
-urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
@@ -0,0 +1,15 @@
+from rest_framework import permissions
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from .db_pool.pool import pool_stats
+
+
+class DBPoolStatsView(APIView):
+    """The metrics of the connection pools of the serving process."""
+
+    permission_classes = (permissions.IsAdminUser,)
+    swagger_schema = None
+
+    def get(self, request):
+        return Response(pool_stats())
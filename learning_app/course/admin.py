@@ -1,12 +1,12 @@
 from custom_auth.models import User
 from django.contrib import admin
 
-from .models import Course
+from .models import Announcement, Course
 
 
 @admin.register(Course)
 class AdminCourse(admin.ModelAdmin):
-    list_display = ("title", "professor", "max_students")
+    list_display = ("title", "professor", "enrolled_count", "max_students")
 
     def formfield_for_foreignkey(self, db_field, request, **kwargs):
         if db_field.name == "professor":
@@ -17,3 +17,9 @@ class AdminCourse(admin.ModelAdmin):
         if db_field.name == "students":
             kwargs["queryset"] = User.objects.filter(role=User.Role.STUDENT)
         return super().formfield_for_manytomany(db_field, request, **kwargs)
+
+
+@admin.register(Announcement)
+class AdminAnnouncement(admin.ModelAdmin):
+    list_display = ("title", "course", "created_at")
+    list_select_related = ("course",)
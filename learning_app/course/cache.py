@@ -0,0 +1,110 @@
+import hashlib
+import time
+from functools import partial
+
+from config.conditional import ConditionalGetMixin
+from config.db_router import read_from_primary
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from rest_framework.response import Response
+
+CATALOG_VERSION_KEY = "course:catalog:version"
+
+
+def catalog_version():
+    version = cache.get(CATALOG_VERSION_KEY)
+    if version is None:
+        # A fresh version must not collide with one whose entries may still
+        # be cached, so it starts from the clock instead of 1.
+        cache.add(CATALOG_VERSION_KEY, time.time_ns(), timeout=None)
+        version = cache.get(CATALOG_VERSION_KEY)
+    return version
+
+
+def bump_catalog_version():
+    try:
+        cache.incr(CATALOG_VERSION_KEY)
+    except ValueError:
+        cache.add(CATALOG_VERSION_KEY, time.time_ns(), timeout=None)
+
+
+def invalidate_catalog():
+    """
+    Retires every cached page and course detail at once by moving to a new
+    catalog version. The version is moved again when the transaction
+    commits, so a page recomputed from the data it's about to overwrite
+    doesn't outlive it.
+    """
+    bump_catalog_version()
+    transaction.on_commit(bump_catalog_version)
+
+
+def catalog_cache_key(name):
+    digest = hashlib.md5(name.encode()).hexdigest()
+    return f"course:catalog:{catalog_version()}:{digest}"
+
+
+def cached(name, compute):
+    """
+    Returns the value cached under `name` for the current catalog version.
+
+    Entries are fresh for `CATALOG_CACHE_TIMEOUT` and kept stale for
+    `CATALOG_CACHE_STALE_TIMEOUT` more. Only the worker which takes the
+    key's lock recomputes it, the others serve the stale value meanwhile,
+    or wait for the fresh one when there's none.
+
+    Values are computed on the primary database, a lagging replica would
+    otherwise cache stale data under the new version.
+    """
+    key = catalog_cache_key(name)
+    entry = cache.get(key)
+    if entry is not None and entry[0] > time.time():
+        return entry[1]
+
+    lock_key = f"{key}:lock"
+    if cache.add(lock_key, 1, timeout=settings.CATALOG_CACHE_LOCK_TIMEOUT):
+        try:
+            with read_from_primary():
+                value = compute()
+            cache.set(
+                key,
+                (time.time() + settings.CATALOG_CACHE_TIMEOUT, value),
+                timeout=settings.CATALOG_CACHE_TIMEOUT
+                + settings.CATALOG_CACHE_STALE_TIMEOUT,
+            )
+        finally:
+            cache.delete(lock_key)
+        return value
+
+    if entry is not None:
+        return entry[1]
+    deadline = time.monotonic() + settings.CATALOG_CACHE_LOCK_TIMEOUT
+    while time.monotonic() < deadline:
+        time.sleep(0.05)
+        entry = cache.get(key)
+        if entry is not None:
+            return entry[1]
+    with read_from_primary():
+        return compute()
+
+
+class CatalogCacheMixin(ConditionalGetMixin):
+    """
+    Serves list and detail GETs of the catalog, and the state their ETags
+    are made of, from the catalog cache. Entries are keyed by the absolute
+    URL, which carries the search, the page and the host of the links.
+    """
+
+    def conditional_state(self, queryset):
+        name = f"state:{self.request.build_absolute_uri()}"
+        return cached(name, partial(super().conditional_state, queryset))
+
+    def conditional_response(self, request, queryset, respond, detail):
+        name = f"data:{request.build_absolute_uri()}"
+        return super().conditional_response(
+            request,
+            queryset,
+            lambda: Response(cached(name, lambda: respond().data)),
+            detail,
+        )
@@ -0,0 +1,145 @@
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+
+from .cache import invalidate_catalog
+from .models import Course, WaitlistEntry
+
+Enrollment = Course.students.through
+
+
+def join(course, student):
+    """
+    Enrolls the student when the course has a free seat, otherwise puts them
+    on the waitlist. The seat is taken by a conditional UPDATE of the course
+    counter, concurrent joins queue on the course row and can't overbook it.
+    Returns the waitlist entry or None if the student is enrolled.
+    """
+    try:
+        with transaction.atomic():
+            if Enrollment.objects.filter(course=course, user=student).exists():
+                return None
+
+            seat_taken = Course.objects.filter(
+                pk=course.pk, enrolled_count__lt=F("max_students")
+            ).update(
+                enrolled_count=F("enrolled_count") + 1,
+                updated_at=timezone.now(),
+            )
+            if not seat_taken:
+                entry, _ = WaitlistEntry.objects.get_or_create(
+                    course=course, student=student
+                )
+                return entry
+
+            Enrollment.objects.create(course_id=course.pk, user_id=student.pk)
+            WaitlistEntry.objects.filter(
+                course=course, student=student
+            ).delete()
+            invalidate_catalog()
+    except IntegrityError:
+        # A concurrent request of the same student enrolled them first.
+        pass
+    return None
+
+
+def leave(course, student):
+    """Unenrolls or unwaitlists the student, a freed seat is given away."""
+    with transaction.atomic():
+        removed, _ = Enrollment.objects.filter(
+            course=course, user=student
+        ).delete()
+        if not removed:
+            WaitlistEntry.objects.filter(
+                course=course, student=student
+            ).delete()
+            return
+
+        Course.objects.filter(pk=course.pk).update(
+            enrolled_count=F("enrolled_count") - 1, updated_at=timezone.now()
+        )
+        invalidate_catalog()
+        promote_waitlist(course)
+
+
+def promote_waitlist(course):
+    """Enrolls students from the head of the waitlist into the free seats."""
+    with transaction.atomic():
+        course = Course.objects.select_for_update().get(pk=course.pk)
+        free_seats = course.max_students - course.enrolled_count
+        if free_seats <= 0:
+            return []
+
+        entries = list(course.waitlist.all()[:free_seats])
+        if not entries:
+            return []
+
+        Enrollment.objects.bulk_create(
+            Enrollment(course_id=course.pk, user_id=entry.student_id)
+            for entry in entries
+        )
+        WaitlistEntry.objects.filter(
+            id__in=[entry.id for entry in entries]
+        ).delete()
+        Course.objects.filter(pk=course.pk).update(
+            enrolled_count=F("enrolled_count") + len(entries),
+            updated_at=timezone.now(),
+        )
+        invalidate_catalog()
+        return entries
+
+
+def waitlist_position(entry):
+    return WaitlistEntry.objects.filter(
+        course_id=entry.course_id, id__lte=entry.id
+    ).count()
+
+
+def sync_roster(course, student_ids, remove_missing=False):
+    """
+    Makes the roster match `student_ids` with one bulk insert and one bulk
+    delete on the through table. Students missing from `student_ids` are
+    only removed when `remove_missing` is set. The list is authoritative,
+    seats it frees aren't given to the waitlist. Returns the added and
+    removed ids.
+    """
+    with transaction.atomic():
+        course = Course.objects.select_for_update().get(pk=course.pk)
+        current_ids = set(
+            Enrollment.objects.filter(course=course).values_list(
+                "user_id", flat=True
+            )
+        )
+        added_ids = set(student_ids) - current_ids
+        removed_ids = set()
+        if remove_missing:
+            removed_ids = current_ids - set(student_ids)
+
+        enrolled_count = len(current_ids) + len(added_ids) - len(removed_ids)
+        if enrolled_count > course.max_students:
+            raise ValidationError(
+                f"The roster has {enrolled_count} students, the course "
+                f"allows {course.max_students}."
+            )
+
+        Enrollment.objects.bulk_create(
+            (
+                Enrollment(course_id=course.pk, user_id=student_id)
+                for student_id in added_ids
+            ),
+            batch_size=1000,
+        )
+        if removed_ids:
+            Enrollment.objects.filter(
+                course=course, user_id__in=removed_ids
+            ).delete()
+        if added_ids:
+            WaitlistEntry.objects.filter(
+                course=course, student_id__in=added_ids
+            ).delete()
+        Course.objects.filter(pk=course.pk).update(
+            enrolled_count=enrolled_count, updated_at=timezone.now()
+        )
+        invalidate_catalog()
+    return added_ids, removed_ids
@@ -0,0 +1,140 @@
+import socketserver
+import threading
+import time
+import uuid
+
+from course.models import Announcement, Course
+from course.tasks import announcement_batches
+from custom_auth.models import User
+from custom_auth.tasks import send_email, send_email_batch
+from django.core.management.base import BaseCommand, CommandError
+from django.test import override_settings
+
+
+class SMTPStandIn(socketserver.StreamRequestHandler):
+    """Accepts and counts messages, speaking just enough SMTP for smtplib."""
+
+    def reply(self, line):
+        self.wfile.write(line.encode() + b"\r\n")
+
+    def handle(self):
+        with self.server.lock:
+            self.server.connections += 1
+        self.reply("220 localhost SMTP stand-in")
+        while line := self.rfile.readline():
+            command = line[:4].upper()
+            if command == b"DATA":
+                self.reply("354 End data with <CR><LF>.<CR><LF>")
+                while self.rfile.readline() not in (b".\r\n", b""):
+                    pass
+                with self.server.lock:
+                    self.server.messages += 1
+                self.reply("250 OK")
+            elif command == b"QUIT":
+                self.reply("221 Bye")
+                return
+            else:
+                self.reply("250 OK")
+
+
+class SMTPServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), SMTPStandIn)
+        self.lock = threading.Lock()
+        self.connections = 0
+        self.messages = 0
+
+
+class Command(BaseCommand):
+    help = (
+        "Sends an announcement to a generated course through a local SMTP "
+        "stand-in, batch by batch as the Celery workers do it (without "
+        "their rate limit), and compares the throughput with one message "
+        "and one connection per task."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--students", type=int, default=1000)
+        parser.add_argument(
+            "--keep",
+            action="store_true",
+            help="Keep the generated course and students.",
+        )
+
+    def handle(self, *args, **options):
+        run_id = uuid.uuid4().hex[:8]
+        professor = User.objects.create(
+            email=f"bench-professor-{run_id}@example.com",
+            role=User.Role.PROFESSOR,
+        )
+        course = Course.objects.create(
+            title=f"Announcement benchmark {run_id}",
+            professor=professor,
+            max_students=options["students"],
+        )
+        students = User.objects.bulk_create(
+            User(
+                email=f"bench-student-{run_id}-{i}@example.com",
+                document_number=f"A{run_id}{i}",
+                role=User.Role.STUDENT,
+            )
+            for i in range(options["students"])
+        )
+        course.students.add(*students)
+        announcement = Announcement.objects.create(
+            course=course, title="Benchmark", text="Hello, students!"
+        )
+
+        server = SMTPServer()
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        smtp = override_settings(
+            EMAIL_BACKEND="django.core.mail.backends.smtp.EmailBackend",
+            EMAIL_HOST="127.0.0.1",
+            EMAIL_PORT=server.server_address[1],
+            EMAIL_HOST_USER="bench@example.com",
+            EMAIL_HOST_PASSWORD="",
+            EMAIL_USE_SSL=False,
+            EMAIL_USE_TLS=False,
+        )
+        try:
+            with smtp:
+                results = [
+                    self.run(server, name, send, announcement)
+                    for name, send in (
+                        ("batched", self.send_batched),
+                        ("per message", self.send_single),
+                    )
+                ]
+        finally:
+            server.shutdown()
+            server.server_close()
+            if not options["keep"]:
+                User.objects.filter(pk__in=[s.pk for s in students]).delete()
+                professor.delete()
+
+        for name, messages, connections, elapsed in results:
+            self.stdout.write(
+                f"{name}: {messages} messages over {connections} "
+                f"connections in {elapsed:.2f}s, "
+                f"{messages / elapsed:.0f} msgs/s"
+            )
+        if any(messages != len(students) for _, messages, _, _ in results):
+            raise CommandError("Some messages were lost.")
+
+    def run(self, server, name, send, announcement):
+        server.connections = server.messages = 0
+        started = time.perf_counter()
+        send(announcement)
+        elapsed = time.perf_counter() - started
+        return name, server.messages, server.connections, elapsed
+
+    def send_batched(self, announcement):
+        for batch in announcement_batches(announcement):
+            send_email_batch.apply(batch, throw=True)
+
+    def send_single(self, announcement):
+        for subject, text, emails in announcement_batches(announcement):
+            for email in emails:
+                send_email.apply((subject, text, email), throw=True)
@@ -0,0 +1,185 @@
+import asyncio
+import io
+import sys
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from course.models import Course
+from course_task.models import Question, Task
+from custom_auth.models import User
+from django.core.asgi import get_asgi_application
+from django.core.management.base import BaseCommand, CommandError
+from django.core.wsgi import get_wsgi_application
+from rest_framework.authtoken.models import Token
+from task_result.models import Result
+
+ENDPOINTS = {
+    "ping": "users/ping/",
+    "catalog": "course/",
+    "tasks": "student/task/",
+    "result": "student/result/{result_id}/",
+}
+
+
+def wsgi_get(application, path, token):
+    environ = {
+        "REQUEST_METHOD": "GET",
+        "PATH_INFO": path,
+        "QUERY_STRING": "",
+        "SERVER_NAME": "localhost",
+        "SERVER_PORT": "80",
+        "HTTP_HOST": "localhost",
+        "HTTP_AUTHORIZATION": f"Token {token}",
+        "wsgi.input": io.BytesIO(),
+        "wsgi.errors": sys.stderr,
+        "wsgi.url_scheme": "http",
+    }
+    statuses = []
+    response = application(
+        environ, lambda status, headers: statuses.append(status)
+    )
+    b"".join(response)
+    response.close()
+    return int(statuses[0][:3])
+
+
+async def asgi_get(application, path, token):
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "root_path": "",
+        "headers": [
+            (b"host", b"localhost"),
+            (b"authorization", f"Token {token}".encode()),
+        ],
+        "client": ("127.0.0.1", 0),
+        "server": ("localhost", 80),
+    }
+    statuses = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            statuses.append(message["status"])
+
+    await application(scope, receive, send)
+    return statuses[0]
+
+
+class Command(BaseCommand):
+    help = (
+        "Requests a read endpoint through the WSGI handler from a pool of "
+        "threads and its async twin through the ASGI handler from as many "
+        "concurrent tasks, in process and without a server, and compares "
+        "their throughput and latencies."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--endpoint", choices=ENDPOINTS, default="catalog"
+        )
+        parser.add_argument("--requests", type=int, default=2000)
+        parser.add_argument("--workers", type=int, default=16)
+        parser.add_argument("--courses", type=int, default=30)
+        parser.add_argument(
+            "--keep",
+            action="store_true",
+            help="Keep the generated courses and users.",
+        )
+
+    def handle(self, *args, **options):
+        run_id = uuid.uuid4().hex[:8]
+        professor = User.objects.create(
+            email=f"bench-professor-{run_id}@example.com",
+            role=User.Role.PROFESSOR,
+        )
+        student = User.objects.create(
+            email=f"bench-student-{run_id}@example.com",
+            role=User.Role.STUDENT,
+            is_active=True,
+        )
+        token = Token.objects.create(user=student).key
+        for i in range(options["courses"]):
+            course = Course.objects.create(
+                title=f"ASGI benchmark {run_id} {i}", professor=professor
+            )
+            course.students.add(student)
+            task = Task.objects.create(title="Essay", course=course)
+            Question.objects.create(task=task, text="What is ASGI?")
+        result = Result.objects.create(task=task, student=student)
+
+        path = ENDPOINTS[options["endpoint"]].format(result_id=result.id)
+        try:
+            runs = (
+                ("wsgi", self.run_wsgi, f"/{path}"),
+                ("asgi", self.run_asgi, f"/async/{path}"),
+            )
+            for name, run, url in runs:
+                latencies, elapsed, statuses = run(url, token, options)
+                self.report(name, url, latencies, elapsed, options)
+                if statuses != {200}:
+                    raise CommandError(f"{name} responded with {statuses}.")
+        finally:
+            if not options["keep"]:
+                student.delete()
+                professor.delete()
+
+    def run_wsgi(self, path, token, options):
+        application = get_wsgi_application()
+
+        def request(_):
+            started = time.perf_counter()
+            status = wsgi_get(application, path, token)
+            return time.perf_counter() - started, status
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=options["workers"]) as executor:
+            results = list(executor.map(request, range(options["requests"])))
+        elapsed = time.perf_counter() - started
+        return (
+            sorted(latency for latency, _ in results),
+            elapsed,
+            {status for _, status in results},
+        )
+
+    def run_asgi(self, path, token, options):
+        application = get_asgi_application()
+        results = []
+
+        async def worker(requests):
+            for _ in range(requests):
+                started = time.perf_counter()
+                status = await asgi_get(application, path, token)
+                results.append((time.perf_counter() - started, status))
+
+        async def run():
+            workers = options["workers"]
+            requests = options["requests"] // workers
+            await asyncio.gather(*(worker(requests) for _ in range(workers)))
+
+        started = time.perf_counter()
+        asyncio.run(run())
+        elapsed = time.perf_counter() - started
+        return (
+            sorted(latency for latency, _ in results),
+            elapsed,
+            {status for _, status in results},
+        )
+
+    def report(self, name, path, latencies, elapsed, options):
+        self.stdout.write(
+            f"{name} {path}: {len(latencies)} requests, "
+            f"{options['workers']} workers, {elapsed:.2f}s, "
+            f"{len(latencies) / elapsed:.0f} req/s, "
+            f"p50: {latencies[len(latencies) // 2] * 1000:.1f}ms, "
+            f"p99: {latencies[int(len(latencies) * 0.99)] * 1000:.1f}ms"
+        )
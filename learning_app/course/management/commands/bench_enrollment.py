@@ -0,0 +1,86 @@
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from course import enrollment
+from course.models import Course, WaitlistEntry
+from custom_auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+
+class Command(BaseCommand):
+    help = (
+        "Joins many students to one course from parallel threads, each with "
+        "its own database connection, and checks the course isn't "
+        "overbooked. Meant to be run against PostgreSQL."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--students", type=int, default=1000)
+        parser.add_argument("--seats", type=int, default=150)
+        parser.add_argument("--workers", type=int, default=32)
+        parser.add_argument(
+            "--keep",
+            action="store_true",
+            help="Keep the generated course and students.",
+        )
+
+    def handle(self, *args, **options):
+        run_id = uuid.uuid4().hex[:8]
+        professor = User.objects.create(
+            email=f"bench-professor-{run_id}@example.com",
+            role=User.Role.PROFESSOR,
+        )
+        course = Course.objects.create(
+            title=f"Enrollment benchmark {run_id}",
+            professor=professor,
+            max_students=options["seats"],
+        )
+        students = User.objects.bulk_create(
+            User(
+                email=f"bench-student-{run_id}-{i}@example.com",
+                document_number=f"B{run_id}{i}",
+                role=User.Role.STUDENT,
+            )
+            for i in range(options["students"])
+        )
+
+        def join(student):
+            started = time.perf_counter()
+            try:
+                enrollment.join(course, student)
+            finally:
+                connection.close()
+            return time.perf_counter() - started
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=options["workers"]) as executor:
+            latencies = sorted(executor.map(join, students))
+        elapsed = time.perf_counter() - started
+
+        course.refresh_from_db()
+        enrolled = course.students.count()
+        waitlisted = WaitlistEntry.objects.filter(course=course).count()
+        overbooked = max(0, enrolled - course.max_students)
+
+        self.stdout.write(
+            f"joins: {len(students)}, workers: {options['workers']}, "
+            f"seats: {course.max_students}\n"
+            f"elapsed: {elapsed:.2f}s, "
+            f"throughput: {len(students) / elapsed:.0f} joins/s\n"
+            f"latency p50: {latencies[len(latencies) // 2] * 1000:.1f}ms, "
+            f"p99: {latencies[int(len(latencies) * 0.99)] * 1000:.1f}ms\n"
+            f"enrolled: {enrolled}, counter: {course.enrolled_count}, "
+            f"waitlisted: {waitlisted}, overbooked: {overbooked}"
+        )
+
+        if not options["keep"]:
+            User.objects.filter(pk__in=[s.pk for s in students]).delete()
+            professor.delete()
+
+        if overbooked or enrolled != course.enrolled_count:
+            raise CommandError("The course was overbooked.")
+        if enrolled + waitlisted != len(students):
+            raise CommandError("Some joins were lost.")
+        self.stdout.write(self.style.SUCCESS("No overbooking."))
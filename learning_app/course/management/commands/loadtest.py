@@ -0,0 +1,129 @@
+import json
+import subprocess
+from datetime import datetime, timezone
+
+from config import loadtest
+from django.core.management.base import BaseCommand, CommandError
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ("git", "rev-parse", "--short", "HEAD"),
+            capture_output=True,
+            check=True,
+            text=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+class Command(BaseCommand):
+    help = (
+        "Runs virtual students and professors against a running server, "
+        "with the users of a `loadtest_seed` file, for a fixed duration. "
+        "Prints the throughput and latencies of every request and writes "
+        "them as JSON, optionally compared with the report of a previous "
+        "run, e.g. of another commit."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("seed", help="The file of `loadtest_seed`.")
+        parser.add_argument("--url", default="http://127.0.0.1:8000")
+        parser.add_argument("--students", type=int, default=40)
+        parser.add_argument("--professors", type=int, default=5)
+        parser.add_argument("--duration", type=float, default=60)
+        parser.add_argument(
+            "--think-time",
+            type=float,
+            default=0,
+            help="Mean seconds a virtual user waits between iterations.",
+        )
+        parser.add_argument("--random-seed", type=int, default=0)
+        parser.add_argument("--output", help="The JSON report to write.")
+        parser.add_argument(
+            "--baseline", help="A JSON report to compare the run with."
+        )
+        parser.add_argument(
+            "--max-regression",
+            type=float,
+            help="Fail if the p99 latency of the run grows by more percent "
+            "than this over the baseline.",
+        )
+
+    def handle(self, *args, **options):
+        with open(options["seed"]) as file:
+            seed = json.load(file)
+        if (
+            len(seed["students"]) < options["students"]
+            or len(seed["professors"]) < options["professors"]
+        ):
+            raise CommandError("The seed has fewer users than requested.")
+        try:
+            loadtest.check_server(options["url"])
+        except OSError as exc:
+            raise CommandError(f"{options['url']} is unreachable: {exc}")
+
+        virtual_users = [
+            ("student", user)
+            for user in seed["students"][: options["students"]]
+        ] + [
+            ("professor", user)
+            for user in seed["professors"][: options["professors"]]
+        ]
+        started_at = datetime.now(timezone.utc).isoformat()
+        report = {
+            "commit": git_commit(),
+            "started_at": started_at,
+            "url": options["url"],
+            "students": options["students"],
+            "professors": options["professors"],
+            "duration_s": options["duration"],
+            "think_time_s": options["think_time"],
+            **loadtest.run(
+                options["url"],
+                seed,
+                virtual_users,
+                options["duration"],
+                options["think_time"],
+                options["random_seed"],
+            ),
+        }
+
+        rows = [*report["requests"].items(), ("total", report["total"])]
+        for name, stats in rows:
+            self.stdout.write(
+                f"{name:<20} {stats['requests']:>7} requests "
+                f"{stats['errors']:>5} errors {stats['rps']:>8.1f} req/s "
+                f"p50 {stats['p50_ms']:>8.1f}ms "
+                f"p90 {stats['p90_ms']:>8.1f}ms "
+                f"p99 {stats['p99_ms']:>8.1f}ms"
+            )
+        if options["output"]:
+            with open(options["output"], "w") as file:
+                json.dump(report, file, indent=2)
+
+        if options["baseline"]:
+            self.compare(report, options)
+
+    def compare(self, report, options):
+        with open(options["baseline"]) as file:
+            baseline = json.load(file)
+        self.stdout.write(
+            f"Compared with {baseline.get('commit') or options['baseline']}:"
+        )
+        regressions = []
+        for name, changes in loadtest.compare(baseline, report):
+            self.stdout.write(
+                f"{name:<20} p50 {changes['p50_ms']:>+7.1f}% "
+                f"p99 {changes['p99_ms']:>+7.1f}% "
+                f"req/s {changes['rps']:>+7.1f}%"
+            )
+            limit = options["max_regression"]
+            if limit is not None and changes["p99_ms"] > limit:
+                regressions.append(name)
+        if regressions:
+            raise CommandError(
+                f"The p99 latency regressed by more than "
+                f"{options['max_regression']}%: {', '.join(regressions)}."
+            )
@@ -0,0 +1,143 @@
+import json
+import uuid
+
+from course.cache import invalidate_catalog
+from course.models import Course
+from course_task.models import Question, Task
+from custom_auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from rest_framework.authtoken.models import Token
+from task_result.models import Answer, Result
+
+
+class Command(BaseCommand):
+    help = (
+        "Seeds the database for `loadtest`: professors with courses of "
+        "tasks and questions, and students enrolled in one course each with "
+        "some tasks submitted. Writes the tokens of the users and the ids "
+        "of their courses and tasks to a JSON file."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("output", help="The seed file to write.")
+        parser.add_argument("--professors", type=int, default=5)
+        parser.add_argument("--courses", type=int, default=20)
+        parser.add_argument("--students", type=int, default=500)
+        parser.add_argument("--tasks", type=int, default=30)
+        parser.add_argument("--questions", type=int, default=3)
+        parser.add_argument(
+            "--submitted",
+            type=int,
+            default=5,
+            help="Tasks per course already submitted by its students.",
+        )
+
+    @transaction.atomic
+    def handle(self, *args, **options):
+        run_id = uuid.uuid4().hex[:8]
+        professors = User.objects.bulk_create(
+            User(
+                email=f"load-professor-{run_id}-{i}@example.com",
+                document_number=f"P{run_id}{i}",
+                role=User.Role.PROFESSOR,
+                email_confirmed=True,
+                is_active=True,
+            )
+            for i in range(options["professors"])
+        )
+        students = User.objects.bulk_create(
+            User(
+                email=f"load-student-{run_id}-{i}@example.com",
+                document_number=f"S{run_id}{i}",
+                role=User.Role.STUDENT,
+                email_confirmed=True,
+                is_active=True,
+            )
+            for i in range(options["students"])
+        )
+        tokens = Token.objects.bulk_create(
+            Token(user=user, key=Token.generate_key())
+            for user in professors + students
+        )
+        token_keys = {token.user_id: token.key for token in tokens}
+
+        courses = [
+            Course.objects.create(
+                title=f"Load test {run_id} {i}",
+                professor=professors[i % len(professors)],
+                max_students=len(students),
+            )
+            for i in range(options["courses"])
+        ]
+        tasks = Task.objects.bulk_create(
+            Task(title=f"Task {i}", course=course)
+            for course in courses
+            for i in range(options["tasks"])
+        )
+        questions = Question.objects.bulk_create(
+            Question(text=f"Question {i}?", task=task)
+            for task in tasks
+            for i in range(options["questions"])
+        )
+
+        enrollments = {
+            student: courses[i % len(courses)]
+            for i, student in enumerate(students)
+        }
+        Course.students.through.objects.bulk_create(
+            Course.students.through(course=course, user=student)
+            for student, course in enrollments.items()
+        )
+        Course.objects.filter(
+            pk__in=[course.pk for course in courses]
+        ).refresh_enrolled_count()
+
+        tasks_by_course = {course.id: [] for course in courses}
+        for task in tasks:
+            tasks_by_course[task.course_id].append(task)
+        questions_by_task = {task.id: [] for task in tasks}
+        for question in questions:
+            questions_by_task[question.task_id].append(question)
+
+        submissions = [
+            (student, task)
+            for student, course in enrollments.items()
+            for task in tasks_by_course[course.id][: options["submitted"]]
+        ]
+        Answer.objects.bulk_create(
+            Answer(question=question, student=student, text="An answer.")
+            for student, task in submissions
+            for question in questions_by_task[task.id]
+        )
+        Result.objects.bulk_create(
+            Result(task=task, student=student)
+            for student, task in submissions
+        )
+        invalidate_catalog()
+
+        course_ids = [course.id for course in courses]
+        seed = {
+            "students": [
+                {"token": token_keys[student.id], "courses": course_ids}
+                for student in students
+            ],
+            "professors": [
+                {
+                    "token": token_keys[professor.id],
+                    "tasks": [
+                        {"id": task.id, "course": task.course_id}
+                        for task in tasks
+                        if task.course.professor_id == professor.id
+                    ],
+                }
+                for professor in professors
+            ],
+        }
+        with open(options["output"], "w") as file:
+            json.dump(seed, file, indent=2)
+        self.stdout.write(
+            f"Seeded {len(professors)} professors, {len(courses)} courses, "
+            f"{len(tasks)} tasks and {len(students)} students "
+            f"to {options['output']}."
+        )
@@ -0,0 +1,57 @@
+# Generated by Django 4.1.7 on 2026-10-18 16:45
+
+import django.contrib.postgres.search
+from django.contrib.postgres.search import SearchVector
+from django.db import migrations
+from django.db.models import OuterRef, Subquery, Value
+from django.db.models.functions import Concat
+
+
+def create_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+
+    schema_editor.execute(
+        "CREATE INDEX course_course_search_vector_gin "
+        "ON course_course USING gin (search_vector)"
+    )
+    schema_editor.execute(
+        "CREATE INDEX course_course_title_trgm "
+        "ON course_course USING gin (title gin_trgm_ops)"
+    )
+    Course = apps.get_model("course", "Course")
+    User = apps.get_model("custom_auth", "User")
+    professor_name = Subquery(
+        User.objects.filter(pk=OuterRef("professor"))
+        .annotate(name=Concat("first_name", Value(" "), "last_name"))
+        .values("name")
+    )
+    Course.objects.update(
+        search_vector=SearchVector("title", weight="A")
+        + SearchVector(professor_name, weight="B")
+    )
+
+
+def drop_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+
+    schema_editor.execute("DROP INDEX course_course_search_vector_gin")
+    schema_editor.execute("DROP INDEX course_course_title_trgm")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('custom_auth', '0006_user_search_vector'),
+        ('course', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='course',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.RunPython(create_search_indexes, drop_search_indexes),
+    ]
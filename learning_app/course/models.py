@@ -1,5 +1,25 @@
 from custom_auth.models import User
+from django.contrib.postgres.search import SearchVector, SearchVectorField
 from django.db import models
+from django.db.models import Count, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce, Concat
+from django.utils import timezone
+
+
+class CourseQuerySet(models.QuerySet):
+    def refresh_enrolled_count(self):
+        """Recomputes the maintained seat counter from the roster."""
+        enrollments = (
+            Course.students.through.objects.filter(course=OuterRef("pk"))
+            .order_by()
+            .values("course")
+            .annotate(count=Count("*"))
+            .values("count")
+        )
+        return self.update(
+            enrolled_count=Coalesce(Subquery(enrollments), 0),
+            updated_at=timezone.now(),
+        )
 
 
 class Course(models.Model):
@@ -7,6 +27,56 @@ class Course(models.Model):
     professor = models.ForeignKey(User, related_name="profess_courses", blank=False, on_delete=models.CASCADE)
     students = models.ManyToManyField(User, related_name="studied_courses")
     max_students = models.IntegerField(blank=False, default=150)
+    enrolled_count = models.PositiveIntegerField(default=0, editable=False)
+    updated_at = models.DateTimeField(auto_now=True)
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    objects = CourseQuerySet.as_manager()
+
+    def __str__(self):
+        return self.title
+
+
+class WaitlistEntry(models.Model):
+    course = models.ForeignKey(
+        Course, on_delete=models.CASCADE, related_name="waitlist"
+    )
+    student = models.ForeignKey(
+        User, on_delete=models.CASCADE, related_name="waitlist_entries"
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        unique_together = ("course", "student")
+        ordering = ("id",)
+
+    def __str__(self):
+        return f"Waitlist entry ({self.id})"
+
+
+class Announcement(models.Model):
+    course = models.ForeignKey(
+        Course, on_delete=models.CASCADE, related_name="announcements"
+    )
+    title = models.CharField(max_length=256)
+    text = models.TextField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ("-id",)
 
     def __str__(self):
         return self.title
+
+
+def course_search_vector():
+    """Course title and its professor's name, the latter through a subquery
+    since an UPDATE can't reference joined fields."""
+    professor_name = Subquery(
+        User.objects.filter(pk=OuterRef("professor"))
+        .annotate(name=Concat("first_name", Value(" "), "last_name"))
+        .values("name")
+    )
+    return SearchVector("title", weight="A") + SearchVector(
+        professor_name, weight="B"
+    )
@@ -0,0 +1,8 @@
+from config.pagination import KeysetPagination
+
+
+class StudentRosterPagination(KeysetPagination):
+    """Keyset pagination over a course roster, stable while students join."""
+
+    ordering = "id"
+    page_size = 50
@@ -1,14 +1,81 @@
+import csv
+import io
+
+from custom_auth.models import User
+from django.db.models import Q
 from rest_framework import serializers
+from rest_framework.validators import ValidationError
 
-from .models import Course
+from .models import Announcement, Course
 
 
 class CourseSerializer(serializers.ModelSerializer):
+    student_count = serializers.IntegerField(
+        source="enrolled_count", read_only=True
+    )
+
     class Meta:
         model = Course
-        fields = ("id", "title", "professor", "students", "max_students")
-        read_only_fields = ("professor", "students")
+        fields = ("id", "title", "professor", "student_count", "max_students")
+        read_only_fields = ("professor",)
 
     def create(self, validated_data):
         validated_data["professor"] = self.context["request"].user
         return super().create(validated_data)
+
+
+class AnnouncementSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Announcement
+        fields = ("id", "title", "text", "created_at")
+
+
+class CourseStudentSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = User
+        fields = ("id", "first_name", "last_name")
+
+
+class RosterImportSerializer(serializers.Serializer):
+    """
+    Takes student emails or document numbers as a JSON list or as the first
+    column of an uploaded CSV file and resolves them in one query. Students
+    are only removed when asked to and every identifier resolves, so a typo
+    can't unenroll anybody.
+    """
+
+    students = serializers.ListField(
+        child=serializers.CharField(max_length=254), required=False
+    )
+    file = serializers.FileField(required=False)
+    remove_missing = serializers.BooleanField(default=False)
+
+    def validate_file(self, file):
+        reader = csv.reader(io.TextIOWrapper(file, encoding="utf-8-sig"))
+        try:
+            return [
+                row[0].strip() for row in reader if row and row[0].strip()
+            ]
+        except (UnicodeDecodeError, csv.Error):
+            raise ValidationError("The file must be a UTF-8 CSV.")
+
+    def validate(self, attrs):
+        identifiers = attrs.pop("file", None) or attrs.pop("students", None)
+        if not identifiers:
+            raise ValidationError("Pass a list of students or a CSV file.")
+
+        identifiers = set(identifiers)
+        students = User.objects.filter(role=User.Role.STUDENT).filter(
+            Q(email__in=identifiers) | Q(document_number__in=identifiers)
+        )
+        attrs["student_ids"] = set()
+        for student_id, email, document_number in students.values_list(
+            "id", "email", "document_number"
+        ):
+            attrs["student_ids"].add(student_id)
+            identifiers.difference_update((email, document_number))
+        attrs["unknown"] = sorted(identifiers)
+        if attrs["remove_missing"] and attrs["unknown"]:
+            err = "Students can't be removed while some aren't found."
+            raise ValidationError({"unknown": attrs["unknown"], "detail": err})
+        return attrs
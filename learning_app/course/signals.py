@@ -0,0 +1,77 @@
+from config.search import update_search_vector
+from custom_auth.models import User
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from . import enrollment
+from .cache import invalidate_catalog
+from .models import Course, course_search_vector
+
+COURSE_SEARCH_FIELDS = {"title", "professor"}
+PROFESSOR_SEARCH_FIELDS = {"first_name", "last_name"}
+
+
+@receiver(post_save, sender=Course)
+def update_course_search_vector(
+    sender, instance, update_fields=None, **kwargs
+):
+    if update_fields and not COURSE_SEARCH_FIELDS.intersection(update_fields):
+        return
+    update_search_vector(
+        Course.objects.filter(pk=instance.pk), course_search_vector()
+    )
+
+
+@receiver(post_save, sender=User)
+def update_professor_courses_search_vector(
+    sender, instance, created=False, update_fields=None, **kwargs
+):
+    if created or not instance.is_professor:
+        return
+    if update_fields and not PROFESSOR_SEARCH_FIELDS.intersection(
+        update_fields
+    ):
+        return
+    update_search_vector(
+        Course.objects.filter(professor=instance), course_search_vector()
+    )
+    invalidate_catalog()
+
+
+@receiver(post_save, sender=Course)
+@receiver(post_delete, sender=Course)
+@receiver(m2m_changed, sender=Course.students.through)
+def invalidate_cached_catalog(sender, action=None, **kwargs):
+    if action is None or action.startswith("post_"):
+        invalidate_catalog()
+
+
+@receiver(m2m_changed, sender=Course.students.through)
+def sync_enrolled_count(
+    sender, instance, action, reverse, pk_set, **kwargs
+):
+    """
+    Keeps the seat counter right when a roster is edited through the M2M
+    manager (e.g. the admin). Enrollment code writes the through table
+    directly and maintains the counter itself.
+    """
+    if reverse and action == "pre_clear":
+        instance._cleared_course_ids = set(
+            instance.studied_courses.values_list("id", flat=True)
+        )
+        return
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+
+    if not reverse:
+        course_ids = {instance.pk}
+    elif action == "post_clear":
+        course_ids = instance.__dict__.pop("_cleared_course_ids", set())
+    else:
+        course_ids = pk_set
+
+    courses = Course.objects.filter(pk__in=course_ids)
+    courses.refresh_enrolled_count()
+    if action != "post_add":
+        for course in courses:
+            enrollment.promote_waitlist(course)
@@ -0,0 +1,39 @@
+from config.celery import app
+from custom_auth.tasks import send_email_batch
+from django.conf import settings
+
+from .models import Announcement, Course
+
+
+def announcement_batches(announcement):
+    """
+    Yields the subject, the text and a batch of `EMAIL_BATCH_SIZE` student
+    emails for each email task an announcement is sent with.
+    """
+    subject = f"{announcement.course.title}: {announcement.title}"
+    emails = list(
+        Course.students.through.objects.filter(
+            course_id=announcement.course_id
+        )
+        .order_by("user_id")
+        .values_list("user__email", flat=True)
+    )
+    batch_size = settings.EMAIL_BATCH_SIZE
+    for i in range(0, len(emails), batch_size):
+        yield subject, announcement.text, emails[i : i + batch_size]
+
+
+@app.task
+def send_announcement(announcement_id):
+    announcement = (
+        Announcement.objects.select_related("course")
+        .filter(id=announcement_id)
+        .first()
+    )
+    if announcement is None:
+        return 0
+    batches = 0
+    for batch in announcement_batches(announcement):
+        send_email_batch.delay(*batch)
+        batches += 1
+    return batches
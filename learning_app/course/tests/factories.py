@@ -0,0 +1,12 @@
+import factory
+from course.models import Course
+from custom_auth.models import User
+from custom_auth.tests.factories import UserFactory
+
+
+class CourseFactory(factory.django.DjangoModelFactory):
+    class Meta:
+        model = Course
+
+    title = factory.Sequence(lambda n: f"Course {n}")
+    professor = factory.SubFactory(UserFactory, role=User.Role.PROFESSOR)
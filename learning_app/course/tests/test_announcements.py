@@ -0,0 +1,103 @@
+import smtplib
+from unittest import mock
+
+from custom_auth.models import User
+from custom_auth.tasks import send_email_batch
+from custom_auth.tests.factories import UserFactory
+from django.core import mail
+from django.test import override_settings
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from .factories import CourseFactory
+
+
+@override_settings(EMAIL_BATCH_SIZE=2)
+class TestAnnouncements(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.course = CourseFactory()
+        cls.students = UserFactory.create_batch(5, role=User.Role.STUDENT)
+        cls.course.students.add(*cls.students)
+        cls.url = f"/professor/course/{cls.course.id}/announcements/"
+
+    def setUp(self):
+        self.client.force_authenticate(user=self.course.professor)
+
+    def test_announcement_fan_out(self):
+        """
+        Ensure an announcement is emailed to every student in batches,
+        each sent over one connection.
+        """
+        data = {"title": "Exam", "text": "The exam is on Monday."}
+        with mock.patch(
+            "custom_auth.tasks.get_connection", wraps=mail.get_connection
+        ) as get_connection, self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(self.url, data)
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(get_connection.call_count, 3)
+        self.assertEqual(
+            sorted(message.to[0] for message in mail.outbox),
+            sorted(student.email for student in self.students),
+        )
+        self.assertEqual(
+            mail.outbox[0].subject, f"{self.course.title}: Exam"
+        )
+
+        self.client.force_authenticate(user=self.students[0])
+        response = self.client.get(
+            f"/student/course/{self.course.id}/announcements/"
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["results"][0]["title"], "Exam")
+
+    def test_announcement_permissions(self):
+        """
+        Ensure only the professor of the course can post announcements.
+        """
+        self.client.force_authenticate(user=CourseFactory().professor)
+        response = self.client.post(self.url, {"title": "Exam", "text": "-"})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_batch_retries_unsent_addresses(self):
+        """
+        Ensure a batch broken midway is retried for the addresses which
+        didn't get the message only.
+        """
+        emails = ["a@example.com", "b@example.com", "c@example.com"]
+        connection = mail.get_connection()
+        connection.send_messages = mock.Mock(
+            side_effect=[1, smtplib.SMTPServerDisconnected(), 1]
+        )
+        with mock.patch(
+            "custom_auth.tasks.get_connection", return_value=connection
+        ), mock.patch.object(send_email_batch, "retry") as retry:
+            retry.side_effect = RuntimeError
+            with self.assertRaises(RuntimeError):
+                send_email_batch("Exam", "Monday", emails)
+
+        self.assertEqual(
+            retry.call_args.kwargs["args"], ("Exam", "Monday", emails[1:])
+        )
+
+    def test_batch_skips_refused_addresses(self):
+        """
+        Ensure an address refused by the server is skipped, the rest of the
+        batch is sent and nothing is retried.
+        """
+        emails = ["a@example.com", "b@example.com", "c@example.com"]
+        connection = mail.get_connection()
+        refused = smtplib.SMTPRecipientsRefused(
+            {"b@example.com": (550, b"No such user")}
+        )
+        connection.send_messages = mock.Mock(side_effect=[1, refused, 1])
+        with mock.patch(
+            "custom_auth.tasks.get_connection", return_value=connection
+        ), mock.patch.object(send_email_batch, "retry") as retry:
+            with self.assertLogs("custom_auth.tasks", "WARNING"):
+                sent = send_email_batch("Exam", "Monday", emails)
+
+        self.assertEqual(sent, 2)
+        self.assertEqual(connection.send_messages.call_count, 3)
+        retry.assert_not_called()
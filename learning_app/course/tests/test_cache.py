@@ -0,0 +1,98 @@
+from unittest import mock
+
+from course import cache as catalog_cache
+from course import enrollment
+from custom_auth.models import User
+from custom_auth.tests.factories import UserFactory
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from .factories import CourseFactory
+
+
+class TestCatalogCache(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = UserFactory(role=User.Role.STUDENT)
+        cls.course = CourseFactory(title="Algebra")
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_authenticate(user=self.user)
+
+    def test_pages_are_cached(self):
+        """
+        Ensure a repeated catalog request doesn't query the database.
+        """
+        self.client.get("/course/", {"search": "algebra"})
+        with self.assertNumQueries(0):
+            response = self.client.get("/course/", {"search": "algebra"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["results"][0]["id"], self.course.id)
+
+        response = self.client.get("/course/", {"search": "geometry"})
+        self.assertEqual(response.data["results"], [])
+
+    def test_invalidation(self):
+        """
+        Ensure course changes and enrollments retire cached pages
+        and details.
+        """
+        url = f"/course/{self.course.id}/"
+        self.client.get("/course/")
+        self.client.get(url)
+
+        enrollment.join(self.course, self.user)
+        response = self.client.get("/course/")
+        self.assertEqual(response.data["results"][0]["student_count"], 1)
+
+        self.course.title = "Geometry"
+        self.course.save()
+        self.assertEqual(self.client.get(url).data["title"], "Geometry")
+
+        self.course.students.remove(self.user)
+        response = self.client.get("/course/")
+        self.assertEqual(response.data["results"][0]["student_count"], 0)
+
+        self.course.delete()
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+@override_settings(CATALOG_CACHE_LOCK_TIMEOUT=0.2)
+class TestStampedeProtection(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.compute = mock.Mock(return_value="fresh")
+
+    def hold_lock(self, name):
+        key = catalog_cache.catalog_cache_key(name)
+        cache.add(f"{key}:lock", 1)
+        return key
+
+    def test_only_lock_holder_recomputes(self):
+        """
+        Ensure an expired entry is served stale while another worker
+        recomputes it.
+        """
+        key = self.hold_lock("page")
+        cache.set(key, (0, "stale"))
+
+        self.assertEqual(catalog_cache.cached("page", self.compute), "stale")
+        self.compute.assert_not_called()
+
+        cache.delete(f"{key}:lock")
+        self.assertEqual(catalog_cache.cached("page", self.compute), "fresh")
+        self.assertEqual(catalog_cache.cached("page", self.compute), "fresh")
+        self.compute.assert_called_once()
+
+    def test_missing_entry_waits_for_lock_holder(self):
+        """
+        Ensure a worker without a stale entry computes the value itself
+        only when the lock holder doesn't deliver it in time.
+        """
+        self.hold_lock("page")
+        self.assertEqual(catalog_cache.cached("page", self.compute), "fresh")
+        self.compute.assert_called_once()
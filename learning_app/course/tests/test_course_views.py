@@ -0,0 +1,229 @@
+from course import enrollment
+from course.models import Course
+from custom_auth.models import User
+from custom_auth.tests.factories import UserFactory
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APITestCase
+
+from .factories import CourseFactory
+
+
+class TestCourseViewSet(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = UserFactory(role=User.Role.STUDENT)
+        cls.course = CourseFactory()
+        cls.course.students.add(
+            cls.user, *UserFactory.create_batch(4, role=User.Role.STUDENT)
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_authenticate(user=self.user)
+
+    def test_list_student_count(self):
+        """
+        Ensure courses carry a student count instead of the roster.
+        """
+        response = self.client.get("/course/")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        course = response.data["results"][0]
+        self.assertEqual(course["student_count"], 5)
+        self.assertNotIn("students", course)
+
+    def test_list_query_count_does_not_grow_with_rosters(self):
+        """
+        Ensure a page of courses costs the same number of queries
+        whatever the number of courses and their rosters.
+        """
+        url = "/course/"
+        with self.assertNumQueries(3):
+            self.client.get(url)
+
+        for course in CourseFactory.create_batch(5):
+            course.students.add(
+                *UserFactory.create_batch(3, role=User.Role.STUDENT)
+            )
+        with self.assertNumQueries(3):
+            self.client.get(url)
+
+    def test_student_course_count_ignores_user_filter(self):
+        """
+        Ensure the student's course list counts the whole roster.
+        """
+        response = self.client.get("/course/")
+        student_response = self.client.get("/student/course/")
+
+        self.assertEqual(student_response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            student_response.data["results"][0]["student_count"],
+            response.data["results"][0]["student_count"],
+        )
+
+    def test_search_by_professor_name(self):
+        """
+        Ensure courses can be searched by their professor's name.
+        """
+        course = CourseFactory(professor__last_name="Wyszomirski")
+        response = self.client.get("/course/", {"search": "Wyszomirski"})
+
+        self.assertEqual(
+            [course["id"] for course in response.data["results"]],
+            [course.id],
+        )
+
+    def test_students_roster_is_cursor_paginated(self):
+        """
+        Ensure the roster endpoint walks all students by cursor.
+        """
+        url = reverse("course-students", args=(self.course.id,))
+        response = self.client.get(url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn("next", response.data)
+        self.assertNotIn("count", response.data)
+        ids = [student["id"] for student in response.data["results"]]
+        self.assertEqual(
+            ids,
+            list(
+                Course.students.through.objects.filter(course=self.course)
+                .order_by("user_id")
+                .values_list("user_id", flat=True)
+            ),
+        )
+
+
+class TestConditionalGet(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = UserFactory(role=User.Role.STUDENT)
+        cls.course = CourseFactory()
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_authenticate(user=self.user)
+
+    def test_list_not_modified(self):
+        """
+        Ensure an unchanged list is answered with 304 from the catalog
+        cache and an enrollment changes its ETag.
+        """
+        etag = self.client.get("/course/")["ETag"]
+
+        with self.assertNumQueries(0):
+            response = self.client.get("/course/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        response = self.client.get(
+            "/course/", {"search": "x"}, HTTP_IF_NONE_MATCH=etag
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        enrollment.join(self.course, self.user)
+        response = self.client.get("/course/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["results"][0]["student_count"], 1)
+
+    def test_detail_not_modified(self):
+        """
+        Ensure a course detail can be revalidated by its Last-Modified.
+        """
+        url = f"/course/{self.course.id}/"
+        response = self.client.get(url)
+        self.assertIn("Last-Modified", response)
+
+        response = self.client.get(
+            url, HTTP_IF_MODIFIED_SINCE=response["Last-Modified"]
+        )
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        response = self.client.get("/course/0/")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class TestKeysetPagination(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = UserFactory(role=User.Role.STUDENT)
+        cls.courses = CourseFactory.create_batch(15)
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_authenticate(user=self.user)
+
+    def test_page_number_by_default(self):
+        """
+        Ensure lists keep the page number format without a cursor.
+        """
+        response = self.client.get("/course/")
+
+        self.assertEqual(response.data["count"], 15)
+        self.assertEqual(len(response.data["results"]), 10)
+
+    def test_cursor_walks_all_pages(self):
+        """
+        Ensure an empty cursor opts in and the cursors walk every course
+        in the `-id` order without a count.
+        """
+        response = self.client.get("/course/", {"cursor": ""})
+        self.assertNotIn("count", response.data)
+        ids = [course["id"] for course in response.data["results"]]
+
+        response = self.client.get(response.data["next"])
+        ids += [course["id"] for course in response.data["results"]]
+
+        self.assertIsNone(response.data["next"])
+        self.assertEqual(ids, sorted((c.id for c in self.courses), reverse=True))
+
+    def test_cursor_with_search(self):
+        """
+        Ensure a search, ordered by relevance, can't be paginated by cursor.
+        """
+        response = self.client.get("/course/", {"cursor": "", "search": "a"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("cursor", response.data)
+
+    def test_estimated_total(self):
+        """
+        Ensure the estimated total is only returned on demand.
+        """
+        response = self.client.get(
+            "/course/", {"cursor": "", "estimate_total": "true"}
+        )
+
+        self.assertEqual(response.data["estimated_total"], 15)
+
+
+class TestCourseListAsync(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        user = UserFactory(role=User.Role.STUDENT, is_active=True)
+        cls.token = Token.objects.create(user=user)
+        CourseFactory(title="Linear algebra")
+        CourseFactory.create_batch(11)
+
+    def setUp(self):
+        cache.clear()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {self.token}")
+
+    def test_list_matches_sync_view(self):
+        """
+        Ensure the async catalog pages and searches like the viewset.
+        """
+        for params in ({}, {"page": 2}, {"search": "algebra"}):
+            response = self.client.get("/async/course/", params)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            expected = self.client.get("/course/", params).json()
+            for key in ("count", "results"):
+                self.assertEqual(response.json()[key], expected[key])
+
+        response = self.client.get("/async/course/", {"page": 2})
+        self.assertEqual(
+            response.json()["previous"], "http://testserver/async/course/"
+        )
+        response = self.client.get("/async/course/", {"page": 3})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
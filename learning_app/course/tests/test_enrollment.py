@@ -0,0 +1,121 @@
+from course.models import Course, WaitlistEntry
+from custom_auth.models import User
+from custom_auth.tests.factories import UserFactory
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from .factories import CourseFactory
+
+
+def student_factory(**kwargs):
+    return UserFactory(
+        role=User.Role.STUDENT, email_confirmed=True, is_active=True, **kwargs
+    )
+
+
+class TestEnrollment(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.course = CourseFactory(max_students=2)
+        cls.students = [student_factory() for _ in range(4)]
+
+    def join(self, student):
+        self.client.force_authenticate(user=student)
+        return self.client.post(
+            reverse("course-join-course", args=(self.course.id,))
+        )
+
+    def leave(self, student):
+        self.client.force_authenticate(user=student)
+        return self.client.post(
+            reverse("course-leave-course", args=(self.course.id,))
+        )
+
+    def test_join_takes_a_seat(self):
+        """
+        Ensure joining enrolls the student and maintains the seat counter.
+        """
+        response = self.join(self.students[0])
+        self.course.refresh_from_db()
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn(self.students[0], self.course.students.all())
+        self.assertEqual(self.course.enrolled_count, 1)
+
+    def test_join_twice(self):
+        """
+        Ensure a second join doesn't take another seat.
+        """
+        self.join(self.students[0])
+        response = self.join(self.students[0])
+        self.course.refresh_from_db()
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.course.enrolled_count, 1)
+
+    def test_full_course_waitlists(self):
+        """
+        Ensure students joining a full course are waitlisted in FIFO order.
+        """
+        for student in self.students[:2]:
+            self.join(student)
+
+        third = self.join(self.students[2])
+        fourth = self.join(self.students[3])
+        self.course.refresh_from_db()
+
+        self.assertEqual(third.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(third.data["waitlist_position"], 1)
+        self.assertEqual(fourth.data["waitlist_position"], 2)
+        self.assertEqual(self.course.enrolled_count, 2)
+        self.assertEqual(self.course.students.count(), 2)
+
+    def test_leave_promotes_waitlist(self):
+        """
+        Ensure a freed seat goes to the head of the waitlist.
+        """
+        for student in self.students:
+            self.join(student)
+
+        response = self.leave(self.students[0])
+        self.course.refresh_from_db()
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            set(self.course.students.all()), set(self.students[1:3])
+        )
+        self.assertEqual(self.course.enrolled_count, 2)
+        self.assertEqual(
+            list(self.course.waitlist.values_list("student", flat=True)),
+            [self.students[3].id],
+        )
+
+    def test_raising_capacity_promotes_waitlist(self):
+        """
+        Ensure raising max_students gives the new seats to the waitlist.
+        """
+        for student in self.students:
+            self.join(student)
+
+        self.client.force_authenticate(user=self.course.professor)
+        self.client.patch(
+            f"/professor/course/{self.course.id}/",
+            {"max_students": 4},
+            format="json",
+        )
+        self.course.refresh_from_db()
+
+        self.assertEqual(self.course.enrolled_count, 4)
+        self.assertFalse(WaitlistEntry.objects.exists())
+
+    def test_roster_edit_keeps_counter(self):
+        """
+        Ensure M2M roster edits, as done by the admin, keep the counter.
+        """
+        self.course.students.add(*self.students[:2])
+        self.course.students.remove(self.students[0])
+
+        self.assertEqual(
+            Course.objects.get(pk=self.course.pk).enrolled_count, 1
+        )
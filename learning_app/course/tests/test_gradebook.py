@@ -0,0 +1,90 @@
+import json
+
+from course_task.models import Task
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from task_result.models import Result
+
+from .factories import CourseFactory
+from .test_enrollment import student_factory
+
+
+class TestGradebook(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.course = CourseFactory()
+        cls.tasks = [
+            Task.objects.create(title=f"Task {i}", course=cls.course)
+            for i in range(3)
+        ]
+        cls.students = [
+            student_factory(last_name=name) for name in ("Adams", "Brown")
+        ]
+        cls.course.students.add(*cls.students)
+        adams, brown = cls.students
+        Result.objects.create(task=cls.tasks[0], student=adams, grade=80)
+        Result.objects.create(task=cls.tasks[1], student=adams)
+        Result.objects.create(task=cls.tasks[0], student=brown, grade=60)
+
+        other_course = CourseFactory()
+        other_course.students.add(adams)
+        other_task = Task.objects.create(title="Other", course=other_course)
+        Result.objects.create(task=other_task, student=adams, grade=5)
+
+        cls.url = reverse("course-gradebook", args=(cls.course.id,))
+
+    def setUp(self):
+        self.client.force_authenticate(user=self.course.professor)
+
+    def get_gradebook(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return json.loads(b"".join(response.streaming_content))
+
+    def test_gradebook_matrix(self):
+        """
+        Ensure the gradebook has a row per student and a column per task.
+        """
+        gradebook = self.get_gradebook()
+
+        self.assertEqual(
+            [task["id"] for task in gradebook["tasks"]],
+            [task.id for task in self.tasks],
+        )
+        adams, brown = gradebook["students"]
+        self.assertEqual(adams["grades"], [80, None, None])
+        self.assertEqual(adams["states"], ["graded", "submitted", "missing"])
+        self.assertEqual(adams["submitted"], 2)
+        self.assertEqual(adams["average"], 80)
+        self.assertEqual(brown["grades"], [60, None, None])
+        self.assertEqual(
+            gradebook["summary"][0],
+            {
+                "id": self.tasks[0].id,
+                "submitted": 2,
+                "graded": 2,
+                "average": 70,
+            },
+        )
+
+    def test_gradebook_query_count(self):
+        """
+        Ensure the matrix is built by one query whatever its size.
+        """
+        with self.assertNumQueries(3):
+            self.get_gradebook()
+
+        self.course.students.add(*(student_factory() for _ in range(5)))
+        Task.objects.create(title="Task 4", course=self.course)
+        with self.assertNumQueries(3):
+            self.get_gradebook()
+
+    def test_gradebook_of_other_professor(self):
+        """
+        Ensure a professor can't read the gradebook of another course.
+        """
+        self.client.force_authenticate(user=CourseFactory().professor)
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
@@ -0,0 +1,155 @@
+from course.models import WaitlistEntry
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from .factories import CourseFactory
+from .test_enrollment import student_factory
+
+
+class TestRosterSync(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.course = CourseFactory(max_students=50)
+        cls.students = [student_factory() for _ in range(6)]
+        cls.course.students.add(*cls.students[:3])
+        cls.url = reverse("course-roster", args=(cls.course.id,))
+
+    def setUp(self):
+        self.client.force_authenticate(user=self.course.professor)
+
+    def test_sync_adds_and_removes(self):
+        """
+        Ensure the roster ends up matching the list of emails
+        and document numbers.
+        """
+        data = {
+            "students": [
+                self.students[2].email,
+                self.students[3].document_number,
+                self.students[4].email,
+            ],
+            "remove_missing": True,
+        }
+        response = self.client.post(self.url, data, format="json")
+        self.course.refresh_from_db()
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["added"], 2)
+        self.assertEqual(response.data["removed"], 2)
+        self.assertEqual(response.data["unknown"], [])
+        self.assertEqual(
+            set(self.course.students.all()), set(self.students[2:5])
+        )
+        self.assertEqual(self.course.enrolled_count, 3)
+
+    def test_unknown_students(self):
+        """
+        Ensure unknown students are reported and refuse removals, so a typo
+        can't unenroll anybody.
+        """
+        data = {"students": [self.students[3].email, "nobdoy@example.com"]}
+        response = self.client.post(self.url, data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["added"], 1)
+        self.assertEqual(response.data["removed"], 0)
+        self.assertEqual(response.data["unknown"], ["nobdoy@example.com"])
+
+        data["remove_missing"] = True
+        response = self.client.post(self.url, data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data["unknown"], ["nobdoy@example.com"])
+        self.assertEqual(self.course.students.count(), 4)
+
+    def test_add_only_from_csv(self):
+        """
+        Ensure a CSV upload with `remove_missing` off only adds students.
+        """
+        content = "\n".join(s.email for s in self.students[3:]).encode()
+        data = {
+            "file": SimpleUploadedFile("roster.csv", content),
+            "remove_missing": False,
+        }
+        response = self.client.post(self.url, data, format="multipart")
+        self.course.refresh_from_db()
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["added"], 3)
+        self.assertEqual(response.data["removed"], 0)
+        self.assertEqual(self.course.enrolled_count, 6)
+
+    def test_sync_keeps_waitlist(self):
+        """
+        Ensure a sync enrolls exactly the listed students, seats it frees
+        don't go to the waitlist.
+        """
+        self.course.max_students = 3
+        self.course.save()
+        for student in self.students[3:5]:
+            WaitlistEntry.objects.create(course=self.course, student=student)
+
+        data = {
+            "students": [self.students[0].email, self.students[3].email],
+            "remove_missing": True,
+        }
+        response = self.client.post(self.url, data, format="json")
+        self.course.refresh_from_db()
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["added"], 1)
+        self.assertEqual(response.data["removed"], 2)
+        self.assertEqual(
+            set(self.course.students.all()),
+            {self.students[0], self.students[3]},
+        )
+        self.assertEqual(self.course.enrolled_count, 2)
+        self.assertEqual(
+            list(self.course.waitlist.values_list("student", flat=True)),
+            [self.students[4].id],
+        )
+
+    def test_file_not_utf8(self):
+        """
+        Ensure a CSV file in another encoding is rejected.
+        """
+        content = "José;Müller\n".encode("latin-1")
+        data = {"file": SimpleUploadedFile("roster.csv", content)}
+        response = self.client.post(self.url, data, format="multipart")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            response.data["file"], ["The file must be a UTF-8 CSV."]
+        )
+
+    def test_sync_over_capacity(self):
+        """
+        Ensure a roster larger than the course is rejected.
+        """
+        self.course.max_students = 2
+        self.course.save()
+
+        data = {"students": [s.email for s in self.students]}
+        response = self.client.post(self.url, data, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.course.students.count(), 3)
+
+    def test_sync_query_count_does_not_grow_with_roster(self):
+        """
+        Ensure a sync costs the same statements whatever the roster size.
+        """
+        data = {
+            "students": [s.email for s in self.students[3:]],
+            "remove_missing": True,
+        }
+        with self.assertNumQueries(10):
+            self.client.post(self.url, data, format="json")
+
+        students = [student_factory() for _ in range(30)]
+        data = {
+            "students": [s.email for s in students],
+            "remove_missing": True,
+        }
+        with self.assertNumQueries(10):
+            self.client.post(self.url, data, format="json")
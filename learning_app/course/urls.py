@@ -1,7 +1,12 @@
 from django.urls import include, path
 from rest_framework import routers
 
-from .views import CourseViewSet, ProfessorCourseViewSet, StudentCourseViewSet
+from .views import (
+    CourseViewSet,
+    ProfessorCourseViewSet,
+    StudentCourseViewSet,
+    course_list_async,
+)
 
 default_router = routers.SimpleRouter()
 default_router.register("course", CourseViewSet)
@@ -17,4 +22,5 @@ urlpatterns = [
     path("", include(default_router.urls)),
     path("", include(professor_router.urls)),
     path("", include(student_router.urls)),
+    path("async/course/", course_list_async),
 ]
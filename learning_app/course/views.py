@@ -1,16 +1,38 @@
+from config.async_views import async_api_view, paginate
+from config.conditional import ConditionalGetMixin
+from config.search import FullTextSearchFilter
 from custom_auth.permissions import IsEmailConfirmed, IsProfessor, IsStudent
+from django.db import transaction
+from django.http import StreamingHttpResponse
 from django.utils.decorators import method_decorator
-from drf_yasg.utils import swagger_auto_schema
+from drf_yasg.utils import no_body, swagger_auto_schema
 from rest_framework import status
 from rest_framework.decorators import action
-from rest_framework.filters import SearchFilter
 from rest_framework.generics import get_object_or_404
+from rest_framework.parsers import JSONParser, MultiPartParser
 from rest_framework.permissions import SAFE_METHODS, IsAuthenticated
+from rest_framework.request import Request
 from rest_framework.response import Response
 from rest_framework.viewsets import ModelViewSet, ReadOnlyModelViewSet
+from task_result.gradebook import stream_gradebook
 
+from . import enrollment
+from .cache import CatalogCacheMixin
 from .models import Course
-from .serializers import CourseSerializer
+from .pagination import StudentRosterPagination
+from .serializers import (
+    AnnouncementSerializer,
+    CourseSerializer,
+    CourseStudentSerializer,
+    RosterImportSerializer,
+)
+from .tasks import send_announcement
+
+
+def announcement_list(view, course):
+    page = view.paginate_queryset(course.announcements.all())
+    serializer = view.get_serializer(page, many=True)
+    return view.get_paginated_response(serializer.data)
 
 
 @method_decorator(
@@ -25,14 +47,32 @@ from .serializers import CourseSerializer
         operation_description="Returns a list of all courses."
     ),
 )
-class CourseViewSet(ReadOnlyModelViewSet):
+class CourseViewSet(CatalogCacheMixin, ReadOnlyModelViewSet):
     """A simple ViewSet for viewing courses."""
 
-    queryset = Course.objects.all()
+    queryset = Course.objects.all().order_by("-id")
     serializer_class = CourseSerializer
     permission_classes = (IsAuthenticated,)
-    filter_backends = (SearchFilter,)
+    filter_backends = (FullTextSearchFilter,)
     search_fields = ("title", "professor__first_name", "professor__last_name")
+    search_trigram_fields = ("title",)
+
+    @swagger_auto_schema(
+        operation_description="Returns a cursor paginated list of students "
+        "enrolled in the course."
+    )
+    @action(
+        methods=("get",),
+        detail=True,
+        serializer_class=CourseStudentSerializer,
+        pagination_class=StudentRosterPagination,
+        filter_backends=(),
+    )
+    def students(self, request, pk=None):
+        course = get_object_or_404(Course.objects.all(), pk=pk)
+        page = self.paginate_queryset(course.students.all())
+        serializer = self.get_serializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
 
 
 @method_decorator(
@@ -71,8 +111,9 @@ class ProfessorCourseViewSet(ModelViewSet):
     queryset = Course.objects.all().order_by("-id")
     serializer_class = CourseSerializer
     permission_classes = (IsAuthenticated, IsProfessor)
-    filter_backends = (SearchFilter,)
+    filter_backends = (FullTextSearchFilter,)
     search_fields = ("title",)
+    search_trigram_fields = ("title",)
 
     def get_queryset(self):
         if getattr(self, 'swagger_fake_view', False):
@@ -80,6 +121,87 @@ class ProfessorCourseViewSet(ModelViewSet):
 
         return super().get_queryset().filter(professor=self.request.user)
 
+    def perform_update(self, serializer):
+        course = serializer.save()
+        enrollment.promote_waitlist(course)
+
+    @swagger_auto_schema(
+        operation_description="Syncs the course roster with a list of "
+        "student emails or document numbers, passed as JSON or as the first "
+        "column of a CSV file. Students missing from the list are only "
+        "removed with `remove_missing`, which is refused while any of the "
+        "list is unknown.",
+        request_body=RosterImportSerializer,
+        responses={200: ""},
+    )
+    @action(
+        methods=("post",),
+        detail=True,
+        parser_classes=(JSONParser, MultiPartParser),
+    )
+    def roster(self, request, pk=None):
+        course = self.get_object()
+        serializer = RosterImportSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        added_ids, removed_ids = enrollment.sync_roster(
+            course,
+            serializer.validated_data["student_ids"],
+            remove_missing=serializer.validated_data["remove_missing"],
+        )
+        return Response(
+            {
+                "added": len(added_ids),
+                "removed": len(removed_ids),
+                "unknown": serializer.validated_data["unknown"],
+            },
+            status=status.HTTP_200_OK,
+        )
+
+    @swagger_auto_schema(
+        operation_description="Streams the students x tasks matrix of result "
+        "grades of the course. Every student row has the grade and the "
+        "state (`graded`, `submitted` or `missing`) of each task with row "
+        "aggregates, per task aggregates come in `summary`.",
+        responses={200: ""},
+    )
+    @action(methods=("get",), detail=True)
+    def gradebook(self, request, pk=None):
+        course = self.get_object()
+        return StreamingHttpResponse(
+            stream_gradebook(course), content_type="application/json"
+        )
+
+    @swagger_auto_schema(
+        method="post",
+        operation_description="Posts an announcement to the course. It's "
+        "emailed to the enrolled students in batches in the background.",
+        request_body=AnnouncementSerializer,
+        responses={201: AnnouncementSerializer},
+    )
+    @swagger_auto_schema(
+        method="get",
+        operation_description="Returns the announcements of the course.",
+    )
+    @action(
+        methods=("get", "post"),
+        detail=True,
+        serializer_class=AnnouncementSerializer,
+        filter_backends=(),
+    )
+    def announcements(self, request, pk=None):
+        course = self.get_object()
+        if request.method in SAFE_METHODS:
+            return announcement_list(self, course)
+
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        announcement = serializer.save(course=course)
+        transaction.on_commit(
+            lambda: send_announcement.delay(announcement.id)
+        )
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
 
 @method_decorator(
     name="retrieve",
@@ -93,12 +215,13 @@ class ProfessorCourseViewSet(ModelViewSet):
         operation_description="Returns a list courses of current student."
     ),
 )
-class StudentCourseViewSet(ReadOnlyModelViewSet):
+class StudentCourseViewSet(ConditionalGetMixin, ReadOnlyModelViewSet):
     queryset = Course.objects.all().order_by("-id")
     serializer_class = CourseSerializer
     permission_classes = (IsAuthenticated, IsStudent)
-    filter_backends = (SearchFilter,)
+    filter_backends = (FullTextSearchFilter,)
     search_fields = ("title", "professor__first_name", "professor__last_name")
+    search_trigram_fields = ("title",)
 
     def get_queryset(self):
         if getattr(self, 'swagger_fake_view', False):
@@ -106,6 +229,13 @@ class StudentCourseViewSet(ReadOnlyModelViewSet):
 
         return super().get_queryset().filter(students=self.request.user)
 
+    @swagger_auto_schema(
+        operation_description="Enrolls the student if the course has a free "
+        "seat. Otherwise puts them on the waitlist and responds with 202 and "
+        "their waitlist position.",
+        request_body=no_body,
+        responses={200: "Enrolled", 202: "Waitlisted"},
+    )
     @action(
         methods=["post"],
         detail=True,
@@ -113,5 +243,51 @@ class StudentCourseViewSet(ReadOnlyModelViewSet):
     )
     def join_course(self, request, pk=None):
         course = get_object_or_404(Course.objects.all(), pk=pk)
-        course.students.add(request.user)
+        entry = enrollment.join(course, request.user)
+        if entry is not None:
+            return Response(
+                {"waitlist_position": enrollment.waitlist_position(entry)},
+                status=status.HTTP_202_ACCEPTED,
+            )
+        return Response(status=status.HTTP_200_OK)
+
+    @swagger_auto_schema(
+        operation_description="Unenrolls the student or removes them from "
+        "the waitlist. A freed seat goes to the head of the waitlist.",
+        request_body=no_body,
+        responses={200: ""},
+    )
+    @action(
+        methods=["post"],
+        detail=True,
+        permission_classes=(IsAuthenticated, IsStudent),
+    )
+    def leave_course(self, request, pk=None):
+        course = get_object_or_404(Course.objects.all(), pk=pk)
+        enrollment.leave(course, request.user)
         return Response(status=status.HTTP_200_OK)
+
+    @swagger_auto_schema(
+        operation_description="Returns the announcements of the course."
+    )
+    @action(
+        methods=("get",),
+        detail=True,
+        serializer_class=AnnouncementSerializer,
+        filter_backends=(),
+    )
+    def announcements(self, request, pk=None):
+        return announcement_list(self, self.get_object())
+
+
+@async_api_view(permission_classes=(IsAuthenticated,))
+async def course_list_async(request):
+    """`CourseViewSet.list` on the async ORM, without the catalog cache."""
+    queryset = FullTextSearchFilter().filter_queryset(
+        Request(request), CourseViewSet.queryset.all(), CourseViewSet
+    )
+    return await paginate(
+        request,
+        queryset,
+        lambda courses: CourseSerializer(courses, many=True).data,
+    )
@@ -1,3 +1,4 @@
+from config.search import FullTextSearchAdminMixin
 from django.contrib import admin
 
 from .models import Question, Task
@@ -9,7 +10,8 @@ class TaskAdmin(admin.ModelAdmin):
 
 
 @admin.register(Question)
-class QuestionAdmin(admin.ModelAdmin):
+class QuestionAdmin(FullTextSearchAdminMixin, admin.ModelAdmin):
     search_fields = ("text", "task__title")
+    search_vector_fields = ("search_vector", "task__search_vector")
     list_display = ("__str__", "task")
     list_filter = ("task",)
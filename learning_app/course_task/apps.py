@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class CourseTaskConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "course_task"
+
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -0,0 +1,52 @@
+# Generated by Django 4.1.7 on 2026-10-18 16:45
+
+import django.contrib.postgres.search
+from django.contrib.postgres.search import SearchVector
+from django.db import migrations
+
+
+def create_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+
+    schema_editor.execute(
+        "CREATE INDEX course_task_task_search_vector_gin "
+        "ON course_task_task USING gin (search_vector)"
+    )
+    schema_editor.execute(
+        "CREATE INDEX course_task_question_search_vector_gin "
+        "ON course_task_question USING gin (search_vector)"
+    )
+    Task = apps.get_model("course_task", "Task")
+    Question = apps.get_model("course_task", "Question")
+    Task.objects.update(search_vector=SearchVector("title", weight="A"))
+    Question.objects.update(search_vector=SearchVector("text", weight="A"))
+
+
+def drop_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+
+    schema_editor.execute("DROP INDEX course_task_task_search_vector_gin")
+    schema_editor.execute("DROP INDEX course_task_question_search_vector_gin")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('course_task', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='question',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='task',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.RunPython(create_search_indexes, drop_search_indexes),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 4.1.7 on 2026-10-18 16:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('course_task', '0002_question_search_vector_task_search_vector'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='question',
+            name='weight',
+            field=models.PositiveSmallIntegerField(default=1),
+        ),
+        migrations.AddField(
+            model_name='task',
+            name='grade_from_answers',
+            field=models.BooleanField(default=False, help_text='Derive result grades from the weighted answer grades.'),
+        ),
+    ]
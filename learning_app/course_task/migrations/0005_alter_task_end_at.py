@@ -0,0 +1,19 @@
+# Generated by Django 4.1.7 on 2026-10-18 17:09
+
+import course_task.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('course_task', '0004_question_updated_at_task_updated_at'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='task',
+            name='end_at',
+            field=models.DateTimeField(blank=True, db_index=True, null=True, validators=[course_task.models.datetime_gt_now]),
+        ),
+    ]
@@ -1,4 +1,5 @@
 from course.models import Course
+from django.contrib.postgres.search import SearchVector, SearchVectorField
 from django.core.exceptions import ValidationError
 from django.db import models
 from django.utils import timezone
@@ -16,8 +17,14 @@ class Task(models.Model):
     )
     start_at = models.DateTimeField(blank=True, null=True)
     end_at = models.DateTimeField(
-        blank=True, null=True, validators=(datetime_gt_now,)
+        blank=True, null=True, db_index=True, validators=(datetime_gt_now,)
     )
+    grade_from_answers = models.BooleanField(
+        default=False,
+        help_text="Derive result grades from the weighted answer grades.",
+    )
+    updated_at = models.DateTimeField(auto_now=True)
+    search_vector = SearchVectorField(null=True, editable=False)
 
     class Meta:
         unique_together = ("title", "course")
@@ -38,6 +45,17 @@ class Question(models.Model):
     task = models.ForeignKey(
         Task, on_delete=models.CASCADE, related_name="questions"
     )
+    weight = models.PositiveSmallIntegerField(default=1)
+    updated_at = models.DateTimeField(auto_now=True)
+    search_vector = SearchVectorField(null=True, editable=False)
 
     def __str__(self):
         return f"{self.text[:10]} ({self.id})"
+
+
+def task_search_vector():
+    return SearchVector("title", weight="A")
+
+
+def question_search_vector():
+    return SearchVector("text", weight="A")
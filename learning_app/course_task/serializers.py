@@ -1,13 +1,16 @@
+from config.search import update_search_vector
+from django.db import transaction
 from rest_framework import serializers
 from rest_framework.validators import ValidationError
+from task_result.tasks import recompute_task_grades
 
-from .models import Question, Task
+from .models import Question, Task, question_search_vector
 
 
 class QuestionSerializer(serializers.ModelSerializer):
     class Meta:
         model = Question
-        fields = ("id", "text")
+        fields = ("id", "text", "weight")
 
     def to_internal_value(self, data):
         return Question(**data)
@@ -18,7 +21,15 @@ class TaskSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Task
-        fields = ("id", "title", "course", "start_at", "end_at", "questions")
+        fields = (
+            "id",
+            "title",
+            "course",
+            "start_at",
+            "end_at",
+            "grade_from_answers",
+            "questions",
+        )
 
     def validate(self, attrs):
         start_at = attrs.get("start_at") or getattr(
@@ -38,10 +49,11 @@ class TaskSerializer(serializers.ModelSerializer):
             for q in questions:
                 q.task = task
             Question.objects.bulk_create(questions)
+            update_search_vector(task.questions.all(), question_search_vector())
         return task
 
     def update(self, instance, validated_data):
-        questions = validated_data.pop("questions")
+        questions = validated_data.pop("questions", None)
         task = super().update(instance, validated_data)
         if questions:
             current_questions_ids = task.questions.values_list("id", flat=True)
@@ -68,9 +80,18 @@ class TaskSerializer(serializers.ModelSerializer):
                     questions_to_delete.append(question)
 
             Question.objects.bulk_create(questions_to_create)
-            Question.objects.bulk_update(questions_to_update, fields=("text",))
+            Question.objects.bulk_update(
+                questions_to_update, fields=("text", "weight")
+            )
             Question.objects.filter(
                 id__in=[q.id for q in questions_to_delete]
             ).delete()
+            update_search_vector(task.questions.all(), question_search_vector())
 
+        if task.grade_from_answers and (
+            questions or "grade_from_answers" in validated_data
+        ):
+            transaction.on_commit(
+                lambda: recompute_task_grades.delay(task.id)
+            )
         return task
@@ -0,0 +1,33 @@
+from config.search import update_search_vector
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .models import Question, Task, question_search_vector, task_search_vector
+
+
+@receiver(post_save, sender=Task)
+def update_task_search_vector(sender, instance, update_fields=None, **kwargs):
+    if update_fields and "title" not in update_fields:
+        return
+    update_search_vector(
+        Task.objects.filter(pk=instance.pk), task_search_vector()
+    )
+
+
+@receiver(post_save, sender=Question)
+def update_question_search_vector(
+    sender, instance, update_fields=None, **kwargs
+):
+    if update_fields and "text" not in update_fields:
+        return
+    update_search_vector(
+        Question.objects.filter(pk=instance.pk), question_search_vector()
+    )
+
+
+@receiver(post_save, sender=Question)
+@receiver(post_delete, sender=Question)
+def touch_question_task(sender, instance, **kwargs):
+    """Questions are served within their task, so they change it."""
+    Task.objects.filter(pk=instance.task_id).update(updated_at=timezone.now())
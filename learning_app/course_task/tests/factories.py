@@ -0,0 +1,19 @@
+import factory
+from course.tests.factories import CourseFactory
+from course_task.models import Question, Task
+
+
+class TaskFactory(factory.django.DjangoModelFactory):
+    class Meta:
+        model = Task
+
+    title = factory.Sequence(lambda n: f"Task {n}")
+    course = factory.SubFactory(CourseFactory)
+
+
+class QuestionFactory(factory.django.DjangoModelFactory):
+    class Meta:
+        model = Question
+
+    text = factory.Faker("sentence")
+    task = factory.SubFactory(TaskFactory)
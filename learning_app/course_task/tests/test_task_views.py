@@ -0,0 +1,95 @@
+from custom_auth.models import User
+from custom_auth.tests.factories import UserFactory
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APITestCase
+
+from .factories import QuestionFactory, TaskFactory
+
+
+class TestStudentTaskViewSet(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.question = QuestionFactory()
+        cls.task = cls.question.task
+        cls.student = UserFactory(role=User.Role.STUDENT)
+        cls.task.course.students.add(cls.student)
+
+    def setUp(self):
+        self.client.force_authenticate(user=self.student)
+
+    def test_question_change_modifies_task(self):
+        """
+        Ensure a cached task is revalidated after one of its questions
+        changes.
+        """
+        url = f"/student/task/{self.task.id}/"
+        etag = self.client.get(url)["ETag"]
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        self.question.text = "What is the answer?"
+        self.question.save()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.data["questions"][0]["text"], "What is the answer?"
+        )
+
+
+    def test_enrollment_seen_by_next_request(self):
+        """
+        Ensure the courses of a user aren't kept past the request, even if
+        the user instance is.
+        """
+        other = TaskFactory()
+        response = self.client.get("/student/task/")
+        self.assertEqual(response.data["count"], 1)
+
+        other.course.students.add(self.student)
+        response = self.client.get("/student/task/")
+        self.assertEqual(response.data["count"], 2)
+
+class TestStudentTaskListAsync(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.questions = QuestionFactory.create_batch(2)
+        cls.student = UserFactory(role=User.Role.STUDENT, is_active=True)
+        cls.token = Token.objects.create(user=cls.student)
+        for question in cls.questions:
+            question.task.course.students.add(cls.student)
+        QuestionFactory()
+
+    def test_list_matches_sync_view(self):
+        """
+        Ensure the async task list returns what the viewset does.
+        """
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {self.token}")
+        response = self.client.get("/async/student/task/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.json(), self.client.get("/student/task/").json()
+        )
+        self.assertEqual(response.json()["count"], 2)
+
+        course_id = self.questions[0].task.course_id
+        response = self.client.get(
+            "/async/student/task/", {"course_id": course_id}
+        )
+        self.assertEqual(
+            [task["course"] for task in response.json()["results"]],
+            [course_id],
+        )
+
+    def test_permissions(self):
+        """
+        Ensure the async task list is for authenticated students only.
+        """
+        response = self.client.get("/async/student/task/")
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+        professor = UserFactory(role=User.Role.PROFESSOR, is_active=True)
+        token = Token.objects.create(user=professor)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {token}")
+        response = self.client.get("/async/student/task/")
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
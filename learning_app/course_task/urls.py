@@ -1,7 +1,11 @@
 from django.urls import include, path
 from rest_framework import routers
 
-from .views import ProfessorTaskViewSet, StudentTaskViewSet
+from .views import (
+    ProfessorTaskViewSet,
+    StudentTaskViewSet,
+    student_task_list_async,
+)
 
 professor_router = routers.SimpleRouter()
 professor_router.register("professor/task", ProfessorTaskViewSet)
@@ -12,4 +16,5 @@ student_router.register("student/task", StudentTaskViewSet)
 urlpatterns = [
     path("", include(professor_router.urls)),
     path("", include(student_router.urls)),
+    path("async/student/task/", student_task_list_async),
 ]
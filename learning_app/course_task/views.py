@@ -1,9 +1,26 @@
+from config.async_views import async_api_view, paginate
+from config.conditional import ConditionalGetMixin
+from config.search import FullTextSearchFilter
+from config.streaming import zip_response
+from custom_auth.context import enrollment_context
+from course.models import Course
 from custom_auth.permissions import IsProfessor, IsStudent
 from django.utils.decorators import method_decorator
 from drf_yasg import openapi
-from drf_yasg.utils import swagger_auto_schema
+from drf_yasg.utils import no_body, swagger_auto_schema
+from rest_framework import status
+from rest_framework.decorators import action
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.request import Request
+from rest_framework.response import Response
 from rest_framework.viewsets import ModelViewSet, ReadOnlyModelViewSet
+from task_result.archive import attachment_files
+from task_result.serializers import (
+    StudentResultSerializer,
+    TaskSubmissionSerializer,
+)
+from task_result.submission import submit_task
+from task_result.tasks import recompute_task_grades
 
 from .models import Task
 from .serializers import TaskSerializer
@@ -72,9 +89,11 @@ from .serializers import TaskSerializer
     decorator=swagger_auto_schema(operation_description="Deletes a task."),
 )
 class ProfessorTaskViewSet(ModelViewSet):
-    queryset = Task.objects.all().order_by("-id")
+    queryset = Task.objects.prefetch_related("questions").order_by("-id")
     serializer_class = TaskSerializer
     permission_classes = (IsAuthenticated, IsProfessor)
+    filter_backends = (FullTextSearchFilter,)
+    search_fields = ("title",)
 
     def get_queryset(self):
         if getattr(self, 'swagger_fake_view', False):
@@ -86,6 +105,36 @@ class ProfessorTaskViewSet(ModelViewSet):
             qs = qs.filter(course=course_id)
         return qs
 
+    @swagger_auto_schema(
+        operation_description="Schedules recomputing the grades of all "
+        "results of the task from the weighted grades of their answers. "
+        "Only for tasks graded from answers.",
+        request_body=no_body,
+        responses={202: "", 400: "The task isn't graded from answers"},
+    )
+    @action(methods=("post",), detail=True)
+    def recompute_grades(self, request, pk=None):
+        task = self.get_object()
+        if not task.grade_from_answers:
+            return Response(
+                {"detail": "The task isn't graded from answers."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        recompute_task_grades.delay(task.id)
+        return Response(status=status.HTTP_202_ACCEPTED)
+
+    @swagger_auto_schema(
+        operation_description="Streams a ZIP archive of the attachments of "
+        "all answers to the task, with a folder per student.",
+        responses={200: ""},
+    )
+    @action(methods=("get",), detail=True, url_path="attachments.zip")
+    def attachments(self, request, pk=None):
+        task = self.get_object()
+        return zip_response(
+            f"task_{task.id}_attachments.zip", attachment_files(task)
+        )
+
 
 @method_decorator(
     name="retrieve",
@@ -101,17 +150,61 @@ class ProfessorTaskViewSet(ModelViewSet):
         "Can be filtered by course_id."
     ),
 )
-class StudentTaskViewSet(ReadOnlyModelViewSet):
-    queryset = Task.objects.all().order_by("-id")
+class StudentTaskViewSet(ConditionalGetMixin, ReadOnlyModelViewSet):
+    queryset = Task.objects.prefetch_related("questions").order_by("-id")
     serializer_class = TaskSerializer
     permission_classes = (IsAuthenticated, IsStudent)
+    filter_backends = (FullTextSearchFilter,)
+    search_fields = ("title",)
 
     def get_queryset(self):
         if getattr(self, 'swagger_fake_view', False):
             return Task.objects.none()
 
-        qs = super().get_queryset().filter(course__students=self.request.user)
+        course_ids = enrollment_context(self.request).studied_course_ids
+        qs = super().get_queryset().filter(course_id__in=course_ids)
         course_id = self.request.query_params.get("course_id")
         if course_id:
             qs = qs.filter(course=course_id)
         return qs
+
+    @swagger_auto_schema(
+        operation_description="Saves the answers to all questions of the "
+        "task and submits it for review at once. Questions answered before "
+        "can be left out.",
+        request_body=TaskSubmissionSerializer,
+        responses={201: StudentResultSerializer},
+    )
+    @action(methods=("post",), detail=True)
+    def submit(self, request, pk=None):
+        task = self.get_object()
+        serializer = TaskSubmissionSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        result = submit_task(
+            task, request.user, serializer.validated_data["answers"]
+        )
+        return Response(
+            StudentResultSerializer(result).data,
+            status=status.HTTP_201_CREATED,
+        )
+
+
+@async_api_view(permission_classes=(IsAuthenticated, IsStudent))
+async def student_task_list_async(request):
+    """`StudentTaskViewSet.list` on the async ORM."""
+    course_ids = Course.students.through.objects.filter(
+        user_id=request.user.id
+    ).values("course_id")
+    queryset = StudentTaskViewSet.queryset.filter(course_id__in=course_ids)
+    course_id = request.GET.get("course_id")
+    if course_id:
+        queryset = queryset.filter(course=course_id)
+    queryset = FullTextSearchFilter().filter_queryset(
+        Request(request), queryset, StudentTaskViewSet
+    )
+    return await paginate(
+        request,
+        queryset,
+        lambda tasks: TaskSerializer(tasks, many=True).data,
+    )
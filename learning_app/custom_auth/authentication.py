@@ -0,0 +1,183 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+from config.db_router import read_from_primary
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, transaction
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+from rest_framework import exceptions
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.authtoken.models import Token
+
+from .models import AUTHENTICATION_FIELDS, User
+
+# What authentication and the permissions need of a token's user, the rest
+# of its fields is loaded from the database if a view asks for it.
+CACHED_USER_FIELDS = ("id", *sorted(AUTHENTICATION_FIELDS))
+
+
+class LocalLRUCache:
+    """
+    A thread safe, size bounded LRU whose entries expire after `timeout`
+    seconds. It lives in the worker process and only fronts the shared cache,
+    so a short timeout bounds how long another process may serve an entry
+    which was invalidated elsewhere.
+    """
+
+    def __init__(self, maxsize, timeout):
+        self.maxsize = maxsize
+        self.timeout = timeout
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires, value = entry
+            if expires <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.timeout, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+local_token_cache = LocalLRUCache(
+    maxsize=settings.AUTH_TOKEN_LOCAL_CACHE_SIZE,
+    timeout=settings.AUTH_TOKEN_LOCAL_CACHE_TIMEOUT,
+)
+
+
+def token_cache_key(key):
+    return "auth:token:" + hashlib.sha256(key.encode()).hexdigest()
+
+
+def token_expires_at(token):
+    return token.created + settings.AUTH_TOKEN_TTL
+
+
+def is_token_expired(token):
+    return token_expires_at(token) <= timezone.now()
+
+
+def invalidate_token(key):
+    cache_key = token_cache_key(key)
+    cache.delete(cache_key)
+    local_token_cache.delete(cache_key)
+
+
+def invalidate_user_tokens(*users):
+    tokens = Token.objects.filter(user__in=users)
+    for key in tokens.values_list("key", flat=True):
+        invalidate_token(key)
+
+
+@transaction.atomic
+def rotate_token(user):
+    """
+    Replaces the token of the user, whoever holds it, by a new one. The old
+    one is evicted from the caches by post_delete.
+    """
+    Token.objects.filter(user=user).delete()
+    return Token.objects.create(user=user)
+
+
+def cached_token_entry(token):
+    """
+    The cached form of a token: when it was created and the fields of its
+    user in CACHED_USER_FIELDS, neither the key nor the password hash.
+    """
+    return {
+        "created": token.created,
+        "user": {f: getattr(token.user, f) for f in CACHED_USER_FIELDS},
+    }
+
+
+def instance_from_fields(model, values):
+    """An instance of the model with the fields not in `values` deferred."""
+    # from_db takes the values in the order of the model's fields.
+    names = [
+        f.attname for f in model._meta.concrete_fields if f.attname in values
+    ]
+    return model.from_db(
+        DEFAULT_DB_ALIAS, names, [values[name] for name in names]
+    )
+
+
+def token_from_entry(key, entry):
+    """
+    Builds the token and its user from a cache entry. Saving the user only
+    writes the fields which were loaded.
+    """
+    user = instance_from_fields(User, entry["user"])
+    token = instance_from_fields(
+        Token, {"key": key, "user_id": user.pk, "created": entry["created"]}
+    )
+    token.user = user
+    return token
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """
+    Token authentication which keeps the token with the fields of its user
+    needed to authenticate in a process local LRU backed by the shared
+    cache, so an authenticated request doesn't query the database. Tokens
+    expire `AUTH_TOKEN_TTL` after their creation.
+    """
+
+    def authenticate_credentials(self, key):
+        cache_key = token_cache_key(key)
+        entry = local_token_cache.get(cache_key)
+        if entry is None:
+            entry = cache.get(cache_key)
+            if entry is None:
+                token = self.get_token(key)
+                entry = cached_token_entry(token)
+                ttl = token_expires_at(token) - timezone.now()
+                timeout = min(
+                    ttl.total_seconds(), settings.AUTH_TOKEN_CACHE_TIMEOUT
+                )
+                cache.set(cache_key, entry, timeout=max(1, timeout))
+            local_token_cache.set(cache_key, entry)
+
+        # Every request gets its own instances, views are free to change the
+        # user.
+        token = token_from_entry(key, entry)
+        if is_token_expired(token):
+            token.delete()
+            raise exceptions.AuthenticationFailed(_("Token has expired."))
+
+        if not token.user.is_active:
+            msg = _("User inactive or deleted.")
+            raise exceptions.AuthenticationFailed(msg)
+
+        return (token.user, token)
+
+    def get_token(self, key):
+        model = self.get_model()
+        try:
+            # A replica may not have a token created a moment ago yet.
+            with read_from_primary():
+                return model.objects.select_related("user").get(key=key)
+        except model.DoesNotExist:
+            raise exceptions.AuthenticationFailed(_("Invalid token."))
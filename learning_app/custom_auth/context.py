@@ -0,0 +1,56 @@
+from functools import cached_property
+
+from course.models import Course
+
+
+class EnrollmentContext:
+    """
+    The ids of the courses a user studies and teaches, each loaded with one
+    query the first time it's needed.
+    """
+
+    def __init__(self, user):
+        self.user = user
+
+    @cached_property
+    def studied_course_ids(self):
+        return frozenset(
+            Course.students.through.objects.filter(
+                user_id=self.user.id
+            ).values_list("course_id", flat=True)
+        )
+
+    @cached_property
+    def taught_course_ids(self):
+        return frozenset(
+            Course.objects.filter(professor_id=self.user.id).values_list(
+                "id", flat=True
+            )
+        )
+
+    @property
+    def course_ids(self):
+        """The courses the user has access to in their role."""
+        if self.user.is_professor:
+            return self.taught_course_ids
+        return self.studied_course_ids
+
+    def studies(self, course_id):
+        return course_id in self.studied_course_ids
+
+    def teaches(self, course_id):
+        return course_id in self.taught_course_ids
+
+
+def enrollment_context(request):
+    """
+    The enrollment context of the request's user, shared by the view and
+    its serializers. It's kept on the request, so it can't outlive it, even
+    when the user instance does.
+    """
+    context = getattr(request, "_enrollment_context", None)
+    if context is None or context.user != request.user:
+        context = request._enrollment_context = EnrollmentContext(
+            request.user
+        )
+    return context
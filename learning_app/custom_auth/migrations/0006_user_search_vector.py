@@ -0,0 +1,50 @@
+# Generated by Django 4.1.7 on 2026-10-18 16:45
+
+import django.contrib.postgres.search
+from django.contrib.postgres.operations import TrigramExtension
+from django.contrib.postgres.search import SearchVector
+from django.db import migrations
+
+
+def create_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+
+    schema_editor.execute(
+        "CREATE INDEX custom_auth_user_search_vector_gin "
+        "ON custom_auth_user USING gin (search_vector)"
+    )
+    schema_editor.execute(
+        "CREATE INDEX custom_auth_user_email_trgm "
+        "ON custom_auth_user USING gin (email gin_trgm_ops)"
+    )
+    User = apps.get_model("custom_auth", "User")
+    User.objects.update(
+        search_vector=SearchVector("first_name", "last_name", weight="A")
+        + SearchVector("email", weight="B")
+    )
+
+
+def drop_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+
+    schema_editor.execute("DROP INDEX custom_auth_user_search_vector_gin")
+    schema_editor.execute("DROP INDEX custom_auth_user_email_trgm")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('custom_auth', '0005_alter_user_document_number'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddField(
+            model_name='user',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.RunPython(create_search_indexes, drop_search_indexes),
+    ]
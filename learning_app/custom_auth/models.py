@@ -1,9 +1,30 @@
 from django.contrib.auth.models import AbstractBaseUser, BaseUserManager
+from django.contrib.postgres.search import SearchVector, SearchVectorField
 from django.db import models
+from django.dispatch import Signal
 from django.utils.translation import gettext_lazy as _
 
+# The fields cached with the tokens of a user, see CachedTokenAuthentication.
+AUTHENTICATION_FIELDS = {"role", "is_active", "email_confirmed"}
 
-class UserManager(BaseUserManager):
+# Sent with the ids of the users whose authentication fields were changed by
+# QuerySet.update(), which bypasses post_save.
+authentication_fields_updated = Signal()
+
+
+class UserQuerySet(models.QuerySet):
+    def update(self, **kwargs):
+        if not AUTHENTICATION_FIELDS.intersection(kwargs):
+            return super().update(**kwargs)
+        user_ids = list(self.values_list("id", flat=True))
+        updated = super().update(**kwargs)
+        authentication_fields_updated.send(
+            sender=self.model, user_ids=user_ids
+        )
+        return updated
+
+
+class UserManager(BaseUserManager.from_queryset(UserQuerySet)):
     def create_superuser(self, email, password):
         superuser = self.model(
             email=self.normalize_email(email),
@@ -36,6 +57,7 @@ class User(AbstractBaseUser):
     document_number = models.CharField(max_length=16, null=True, unique=True)
     is_active = models.BooleanField(default=False)
     date_joined = models.DateTimeField(auto_now_add=True)
+    search_vector = SearchVectorField(null=True, editable=False)
 
     objects = UserManager()
 
@@ -64,3 +86,9 @@ class User(AbstractBaseUser):
     @property
     def is_student(self):
         return self.role == self.Role.STUDENT
+
+
+def user_search_vector():
+    return SearchVector("first_name", "last_name", weight="A") + SearchVector(
+        "email", weight="B"
+    )
@@ -0,0 +1,39 @@
+from config.search import update_search_vector
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from rest_framework.authtoken.models import Token
+
+from .authentication import invalidate_token, invalidate_user_tokens
+from .models import User, authentication_fields_updated, user_search_vector
+
+USER_SEARCH_FIELDS = {"first_name", "last_name", "email"}
+
+
+@receiver(post_save, sender=User)
+def update_user_search_vector(sender, instance, update_fields=None, **kwargs):
+    if update_fields and not USER_SEARCH_FIELDS.intersection(update_fields):
+        return
+    update_search_vector(
+        User.objects.filter(pk=instance.pk), user_search_vector()
+    )
+
+
+@receiver(post_save, sender=User)
+def invalidate_cached_user_tokens(
+    sender, instance, created=False, update_fields=None, **kwargs
+):
+    """Role, password or activity changes must reach cached tokens."""
+    if created or (update_fields and set(update_fields) <= {"last_login"}):
+        return
+    invalidate_user_tokens(instance)
+
+
+@receiver(authentication_fields_updated, sender=User)
+def invalidate_updated_user_tokens(sender, user_ids, **kwargs):
+    """The same for changes made with QuerySet.update()."""
+    invalidate_user_tokens(*user_ids)
+
+
+@receiver(post_delete, sender=Token)
+def invalidate_deleted_token(sender, instance, **kwargs):
+    invalidate_token(instance.key)
@@ -1,6 +1,11 @@
+import logging
+import smtplib
+
 from config.celery import app
 from django.conf import settings
-from django.core.mail import send_mail
+from django.core.mail import EmailMessage, get_connection, send_mail
+
+logger = logging.getLogger(__name__)
 
 
 @app.task
@@ -11,3 +16,33 @@ def send_email(subject, message, email):
         from_email=settings.EMAIL_HOST_USER,
         recipient_list=[email],
     )
+
+
+@app.task(
+    bind=True,
+    rate_limit=settings.EMAIL_BATCH_RATE_LIMIT,
+    max_retries=3,
+    default_retry_delay=60,
+)
+def send_email_batch(self, subject, message, emails):
+    """
+    Sends the message to each address separately over one SMTP connection.
+    An address the server refuses is skipped, it would be refused again.
+    When the connection breaks midway only the addresses which haven't been
+    tried yet are retried.
+    """
+    sent = tried = 0
+    try:
+        with get_connection() as connection:
+            for email in emails:
+                email_message = EmailMessage(
+                    subject, message, settings.EMAIL_HOST_USER, [email]
+                )
+                try:
+                    sent += connection.send_messages([email_message])
+                except smtplib.SMTPRecipientsRefused as exc:
+                    logger.warning("Skipped %s: %s", email, exc.recipients)
+                tried += 1
+    except (smtplib.SMTPException, OSError) as exc:
+        raise self.retry(args=(subject, message, emails[tried:]), exc=exc)
+    return sent
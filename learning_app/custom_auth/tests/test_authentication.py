@@ -0,0 +1,216 @@
+import pickle
+from datetime import datetime, timedelta
+
+import time_machine
+from custom_auth.models import User
+from django.conf import settings
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APITestCase
+
+from ..authentication import (
+    CachedTokenAuthentication,
+    local_token_cache,
+    token_cache_key,
+)
+from .factories import UserFactory
+
+
+class TestCachedTokenAuthentication(APITestCase):
+    password = "eib31wf-je345owb-pon"
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = UserFactory(
+            role=User.Role.PROFESSOR, email_confirmed=True, is_active=True
+        )
+        cls.user.set_password(cls.password)
+        cls.user.save()
+
+    def setUp(self):
+        cache.clear()
+        local_token_cache.clear()
+
+    def login(self):
+        response = self.client.post(
+            "/login/",
+            {"username": self.user.email, "password": self.password},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        key = response.data["token"]
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {key}")
+        return key
+
+    def test_cached_token_does_not_hit_database(self):
+        """
+        Ensure a request authenticated by a cached token runs no query.
+        """
+        self.login()
+        url = reverse("user-ping")
+        self.client.get(url)
+
+        with self.assertNumQueries(0):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_cache_holds_no_secrets(self):
+        """
+        Ensure the shared cache keeps neither the key nor the password hash
+        or the profile of the user.
+        """
+        key = self.login()
+        self.client.get(reverse("user-ping"))
+
+        entry = cache.get(token_cache_key(key))
+        self.assertEqual(
+            set(entry["user"]), {"id", "role", "is_active", "email_confirmed"}
+        )
+        pickled = pickle.dumps(entry)
+        for secret in (key, self.user.password, self.user.email):
+            self.assertNotIn(secret.encode(), pickled)
+
+    def test_cached_user_loads_other_fields(self):
+        """
+        Ensure the other fields of a cached user are loaded on access and
+        saving it keeps them.
+        """
+        key = self.login()
+        authentication = CachedTokenAuthentication()
+        authentication.authenticate_credentials(key)
+
+        user, token = authentication.authenticate_credentials(key)
+        self.assertEqual(token.user_id, self.user.id)
+        with self.assertNumQueries(1):
+            self.assertEqual(user.email, self.user.email)
+
+        user.role = User.Role.STUDENT
+        user.save()
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.role, User.Role.STUDENT)
+        self.assertTrue(self.user.check_password(self.password))
+        self.assertEqual(self.user.first_name, user.first_name)
+
+    def test_async_ping(self):
+        """
+        Ensure the async ping authenticates by the cached token too.
+        """
+        response = self.client.get("/async/users/ping/")
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(response["WWW-Authenticate"], "Token")
+
+        self.login()
+        self.client.get("/async/users/ping/")
+        with self.assertNumQueries(0):
+            response = self.client.get("/async/users/ping/")
+        self.assertEqual(response.json(), "Pong!")
+
+    def test_shared_cache_is_used_after_local_expiry(self):
+        """
+        Ensure the shared cache serves tokens dropped by the local LRU.
+        """
+        self.login()
+        url = reverse("user-ping")
+        self.client.get(url)
+        local_token_cache.clear()
+
+        with self.assertNumQueries(0):
+            self.client.get(url)
+
+    def test_login_rotates_token(self):
+        """
+        Ensure a new login revokes the previous token.
+        """
+        old_key = self.login()
+        new_key = self.login()
+
+        self.assertNotEqual(old_key, new_key)
+        self.assertFalse(Token.objects.filter(key=old_key).exists())
+
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {old_key}")
+        response = self.client.get(reverse("user-ping"))
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_expired_token(self):
+        """
+        Ensure a token can't be used after its TTL.
+        """
+        key = self.login()
+        self.client.get(reverse("user-ping"))
+
+        with time_machine.travel(
+            datetime.now() + settings.AUTH_TOKEN_TTL + timedelta(minutes=1)
+        ):
+            response = self.client.get(reverse("user-ping"))
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertFalse(Token.objects.filter(key=key).exists())
+
+    def test_logout_revokes_token(self):
+        """
+        Ensure the token is unusable right after logout.
+        """
+        self.login()
+        self.client.get(reverse("user-ping"))
+
+        response = self.client.post(reverse("user-logout"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        response = self.client.get(reverse("user-ping"))
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_role_change_invalidates_cache(self):
+        """
+        Ensure a role change is seen by the next request.
+        """
+        self.login()
+        url = "/professor/course/"
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_200_OK)
+
+        self.user.role = User.Role.STUDENT
+        self.user.save()
+
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_password_change_rotates_token(self):
+        """
+        Ensure the old token gets 401 after a password change, and the new
+        one returned by it works.
+        """
+        old_key = self.login()
+        self.client.get(reverse("user-ping"))
+
+        response = self.client.post(
+            reverse("user-reset-password"),
+            {
+                "old_password": self.password,
+                "password": "ahw9-Yoh1-eiph",
+                "confirmation_password": "ahw9-Yoh1-eiph",
+            },
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        new_key = response.data["token"]
+        self.assertNotEqual(new_key, old_key)
+
+        response = self.client.get(reverse("user-ping"))
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {new_key}")
+        response = self.client.get(reverse("user-ping"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_role_update_invalidates_cache(self):
+        """
+        Ensure a role change made with QuerySet.update() is seen by the
+        next request too.
+        """
+        self.login()
+        url = "/professor/course/"
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_200_OK)
+
+        User.objects.filter(id=self.user.id).update(role=User.Role.STUDENT)
+
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
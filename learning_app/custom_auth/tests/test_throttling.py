@@ -0,0 +1,147 @@
+from unittest import mock
+
+from config.throttling import counter_sliding_window
+from custom_auth.models import User
+from django.core.cache import cache
+from rest_framework import status
+from rest_framework.settings import api_settings
+from rest_framework.test import APITestCase
+
+from .factories import UserFactory
+
+THROTTLE_RATES = {
+    **api_settings.DEFAULT_THROTTLE_RATES,
+    "login.ip": "4/min",
+    "login.account": "2/min",
+    "reset_password.account": "1/hour",
+}
+
+
+@mock.patch.dict(api_settings.DEFAULT_THROTTLE_RATES, THROTTLE_RATES)
+class TestThrottling(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = UserFactory(role=User.Role.STUDENT, is_active=True)
+        cls.user.set_password("Str0ng-passw0rd")
+        cls.user.save()
+
+    def setUp(self):
+        cache.clear()
+
+    def login(self, username, **extra):
+        data = {"username": username, "password": "wrong"}
+        return self.client.post("/login/", data, **extra)
+
+    def test_login_throttled_per_account(self):
+        """
+        Ensure an account is locked out from any IP without a query or
+        password hashing, while other accounts can still log in.
+        """
+        for _ in range(2):
+            response = self.login(self.user.email)
+            self.assertEqual(
+                response.status_code, status.HTTP_400_BAD_REQUEST
+            )
+
+        with self.assertNumQueries(0):
+            response = self.login(
+                self.user.email.upper(), REMOTE_ADDR="10.0.0.2"
+            )
+        self.assertEqual(
+            response.status_code, status.HTTP_429_TOO_MANY_REQUESTS
+        )
+        self.assertIn("Retry-After", response)
+
+        response = self.login("other@example.com")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_login_throttled_per_ip(self):
+        """
+        Ensure one IP can't try many accounts.
+        """
+        for i in range(4):
+            self.login(f"user{i}@example.com")
+        response = self.login("user5@example.com")
+        self.assertEqual(
+            response.status_code, status.HTTP_429_TOO_MANY_REQUESTS
+        )
+
+        response = self.login("user5@example.com", REMOTE_ADDR="10.0.0.2")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_list_body(self):
+        """
+        Ensure a body which isn't an object is rejected, not a server error.
+        """
+        for url in ("/login/", "/users/register/"):
+            response = self.client.post(url, [], "json")
+            self.assertEqual(
+                response.status_code, status.HTTP_400_BAD_REQUEST
+            )
+
+    def test_spoofed_forwarded_for_throttled_per_ip(self):
+        """
+        Ensure a client can't dodge the IP limit with X-Forwarded-For.
+        """
+        for i in range(4):
+            self.login(
+                f"user{i}@example.com", HTTP_X_FORWARDED_FOR=f"1.1.1.{i}"
+            )
+        response = self.login(
+            "user5@example.com", HTTP_X_FORWARDED_FOR="1.1.1.5"
+        )
+        self.assertEqual(
+            response.status_code, status.HTTP_429_TOO_MANY_REQUESTS
+        )
+
+    @mock.patch.object(api_settings, "NUM_PROXIES", 1)
+    def test_forwarded_for_behind_proxy(self):
+        """
+        Ensure behind a proxy only the address it appended is counted.
+        """
+        for i in range(4):
+            self.login(
+                f"user{i}@example.com",
+                HTTP_X_FORWARDED_FOR=f"1.1.1.{i}, 10.0.0.2",
+            )
+        response = self.login(
+            "user5@example.com", HTTP_X_FORWARDED_FOR="1.1.1.5, 10.0.0.2"
+        )
+        self.assertEqual(
+            response.status_code, status.HTTP_429_TOO_MANY_REQUESTS
+        )
+
+        response = self.login(
+            "user5@example.com", HTTP_X_FORWARDED_FOR="10.0.0.3"
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_reset_password_throttled_per_user(self):
+        """
+        Ensure password changes of an authenticated user are throttled.
+        """
+        self.user.email_confirmed = True
+        self.client.force_authenticate(user=self.user)
+        data = {"password": "x"}
+        response = self.client.post("/users/reset_password/", data)
+        self.assertNotEqual(
+            response.status_code, status.HTTP_429_TOO_MANY_REQUESTS
+        )
+        response = self.client.post("/users/reset_password/", data)
+        self.assertEqual(
+            response.status_code, status.HTTP_429_TOO_MANY_REQUESTS
+        )
+
+    def test_sliding_window(self):
+        """
+        Ensure the previous window still counts in part.
+        """
+        with mock.patch("config.throttling.time.time", return_value=90):
+            for _ in range(4):
+                self.assertEqual(counter_sliding_window("key", 4, 60), 0)
+            self.assertEqual(counter_sliding_window("key", 4, 60), 30)
+        with mock.patch("config.throttling.time.time", return_value=150):
+            # The previous window counts half: 2 + 2 requests.
+            self.assertEqual(counter_sliding_window("key", 4, 60), 0)
+            self.assertEqual(counter_sliding_window("key", 4, 60), 0)
+            self.assertGreater(counter_sliding_window("key", 4, 60), 0)
@@ -3,6 +3,7 @@ from datetime import datetime, timedelta
 import time_machine
 from custom_auth.models import User
 from django.conf import settings
+from django.core.cache import cache
 from django.urls import reverse
 from django.utils.encoding import force_bytes
 from django.utils.http import urlsafe_base64_encode
@@ -18,6 +19,9 @@ class TestRegister(APITestCase):
     def setUpTestData(cls):
         cls.user = UserFactory(role=User.Role.PROFESSOR)
 
+    def setUp(self):
+        cache.clear()
+
     def test_register(self):
         """
         Ensure we can create a new account object.
@@ -1,8 +1,11 @@
+from django.urls import path
 from rest_framework import routers
 
-from .views import UserViewSet
+from .views import UserViewSet, ping_async
 
 router = routers.SimpleRouter()
 router.register("users", UserViewSet)
 
-urlpatterns = router.urls
+urlpatterns = router.urls + [
+    path("async/users/ping/", ping_async),
+]
@@ -1,7 +1,13 @@
+from config.async_views import async_api_view
+from config.throttling import AccountRateThrottle, IPRateThrottle
+from django.conf import settings
+from django.db import transaction
 from django.utils.encoding import force_bytes
 from django.utils.http import urlsafe_base64_encode
 from drf_yasg.utils import swagger_auto_schema
 from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.authtoken.views import ObtainAuthToken
 from rest_framework.decorators import action
 from rest_framework.mixins import (
     ListModelMixin,
@@ -12,6 +18,11 @@ from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.viewsets import GenericViewSet
 
+from .authentication import (
+    is_token_expired,
+    rotate_token,
+    token_expires_at,
+)
 from .models import User
 from .permissions import IsEmailConfirmed
 from .serializers import (
@@ -25,6 +36,35 @@ from .tasks import send_email
 from .tokens import account_activation_token
 
 
+class LoginView(ObtainAuthToken):
+    """
+    Returns a token for valid credentials. The previous token of the user is
+    revoked when AUTH_TOKEN_ROTATE_ON_LOGIN is set or when it has expired.
+    """
+
+    throttle_classes = (IPRateThrottle, AccountRateThrottle)
+    throttle_scope = "login"
+
+    def post(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        user = serializer.validated_data["user"]
+
+        with transaction.atomic():
+            token = Token.objects.select_for_update().filter(user=user).first()
+            if token and (
+                settings.AUTH_TOKEN_ROTATE_ON_LOGIN or is_token_expired(token)
+            ):
+                token.delete()
+                token = None
+            if token is None:
+                token = Token.objects.create(user=user)
+
+        return Response(
+            {"token": token.key, "expires_at": token_expires_at(token)}
+        )
+
+
 class UserViewSet(
     RetrieveModelMixin, ListModelMixin, UpdateModelMixin, GenericViewSet
 ):
@@ -35,13 +75,19 @@ class UserViewSet(
     queryset = User.objects.all()
     serializer_class = UserSerializer
     permission_classes = (IsAuthenticated,)
+    throttle_scope = None
 
     @swagger_auto_schema(
         method="POST",
         request_body=RegistrationSerializer,
         responses={200: ""},
     )
-    @action(methods=["post"], detail=False, permission_classes=[AllowAny])
+    @action(
+        methods=["post"],
+        detail=False,
+        permission_classes=[AllowAny],
+        throttle_scope="register",
+    )
     def register(self, request):
         """
         Check if user in db or create user and send activation link.
@@ -100,6 +146,18 @@ class UserViewSet(
         """
         return Response("Pong!")
 
+    @swagger_auto_schema(method="POST", request_body=None, responses={200: ""})
+    @action(
+        methods=["post"], detail=False, permission_classes=[IsAuthenticated]
+    )
+    def logout(self, request):
+        """
+        Revoke the token used for the request.
+        """
+        if isinstance(request.auth, Token):
+            request.auth.delete()
+        return Response(status=status.HTTP_200_OK)
+
     @swagger_auto_schema(
         methods=["post"],
         request_body=ChangePasswordSerializer,
@@ -109,10 +167,12 @@ class UserViewSet(
         methods=["post", "get"],
         detail=False,
         permission_classes=[IsAuthenticated, IsEmailConfirmed],
+        throttle_scope="reset_password",
     )
     def reset_password(self, request):
         """
-        Change password, if current is valid.
+        Change password, if current is valid. The token of the user is
+        replaced, the new one is returned.
         """
         user = request.user
         serializer = ChangePasswordSerializer(
@@ -123,6 +183,8 @@ class UserViewSet(
         password = serializer.validated_data["password"]
         user.set_password(password)
         user.save()
+        # A stolen token is the user's token, it mustn't outlive the password.
+        token = rotate_token(user)
 
         send_email.delay(
             subject="Reset password",
@@ -131,7 +193,9 @@ class UserViewSet(
             ),
             email=user.email,
         )
-        return Response(status=status.HTTP_200_OK)
+        return Response(
+            {"token": token.key, "expires_at": token_expires_at(token)}
+        )
 
     @swagger_auto_schema(
         methods=["post"],
@@ -142,6 +206,7 @@ class UserViewSet(
         methods=["post", "get"],
         detail=False,
         permission_classes=[IsAuthenticated, IsEmailConfirmed],
+        throttle_scope="reset_email",
     )
     def reset_email(self, request):
         """
@@ -167,3 +232,8 @@ class UserViewSet(
         )
 
         return Response(status=status.HTTP_200_OK)
+
+
+@async_api_view(permission_classes=(IsAuthenticated,))
+async def ping_async(request):
+    return "Pong!"
@@ -1,3 +1,4 @@
+from config.search import FullTextSearchAdminMixin
 from custom_auth.models import User
 from django.contrib import admin
 
@@ -5,7 +6,7 @@ from .models import Answer, Result
 
 
 @admin.register(Answer)
-class AnswerAdmin(admin.ModelAdmin):
+class AnswerAdmin(FullTextSearchAdminMixin, admin.ModelAdmin):
     list_display = (
         "__str__",
         "student",
@@ -14,12 +15,20 @@ class AnswerAdmin(admin.ModelAdmin):
         "question_task_course",
         "grade",
     )
+    list_select_related = ("student", "question__task__course")
     search_fields = (
         "student__email",
         "question__text",
         "question__task__title",
         "question__task__course__title",
     )
+    search_vector_fields = (
+        "student__search_vector",
+        "question__search_vector",
+        "question__task__search_vector",
+        "question__task__course__search_vector",
+    )
+    search_trigram_fields = ("student__email",)
 
     @admin.display(description="Task", ordering="question__task")
     def question_task(self, obj):
@@ -42,10 +51,12 @@ class AnswerAdmin(admin.ModelAdmin):
 
 
 @admin.register(Result)
-class ResultAdmin(admin.ModelAdmin):
+class ResultAdmin(FullTextSearchAdminMixin, admin.ModelAdmin):
     list_display = ("__str__", "created_at", "student", "task", "grade")
     readonly_fields = ("created_at",)
     search_fields = ("student__email", "task__title")
+    search_vector_fields = ("student__search_vector", "task__search_vector")
+    search_trigram_fields = ("student__email",)
 
     def get_readonly_fields(self, request, obj):
         read_only_fields = super().get_readonly_fields(request, obj)
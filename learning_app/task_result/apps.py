@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class TaskResultConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "task_result"
+
+    def ready(self):
+        from . import signals  # noqa: F401
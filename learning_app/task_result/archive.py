@@ -0,0 +1,40 @@
+import os
+from functools import partial
+
+from django.utils.text import get_valid_filename
+
+from .models import Answer
+
+
+def attachment_files(task, chunk_size=500):
+    """
+    The `(name, open)` pairs of the answer attachments of a task, for
+    `config.streaming.zip_response`. Every student gets a folder and every
+    file is prefixed with its question.
+    """
+    storage = Answer._meta.get_field("attachment").storage
+    answers = (
+        Answer.objects.filter(question__task=task, attachment__isnull=False)
+        .exclude(attachment="")
+        .order_by(
+            "student__last_name",
+            "student__first_name",
+            "student_id",
+            "question_id",
+        )
+        .values_list(
+            "attachment",
+            "student_id",
+            "student__first_name",
+            "student__last_name",
+            "question_id",
+        )
+        .iterator(chunk_size=chunk_size)
+    )
+    for name, student_id, first_name, last_name, question_id in answers:
+        folder = get_valid_filename(f"{last_name}_{first_name}_{student_id}")
+        filename = get_valid_filename(os.path.basename(name))
+        yield (
+            f"{folder}/question_{question_id}_{filename}",
+            partial(storage.open, name, "rb"),
+        )
@@ -0,0 +1,107 @@
+import json
+
+from custom_auth.models import User
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Count, FilteredRelation, Max, Q
+
+GRADED = "graded"
+SUBMITTED = "submitted"
+MISSING = "missing"
+
+
+def gradebook_rows(course, task_ids):
+    """
+    A row per enrolled student with the grade and the number of results of
+    every task, computed by one grouped query over the course roster left
+    joined to the results of the course tasks.
+    """
+    aggregates = {}
+    for task_id in task_ids:
+        task_results = Q(course_results__task_id=task_id)
+        aggregates[f"grade_{task_id}"] = Max(
+            "course_results__grade", filter=task_results
+        )
+        aggregates[f"results_{task_id}"] = Count(
+            "course_results", filter=task_results
+        )
+
+    return (
+        User.objects.filter(studied_courses=course)
+        .annotate(
+            course_results=FilteredRelation(
+                "results", condition=Q(results__task_id__in=task_ids)
+            )
+        )
+        .values("id", "email", "first_name", "last_name")
+        .annotate(**aggregates)
+        .order_by("last_name", "first_name", "id")
+    )
+
+
+def average(total, count):
+    return round(total / count, 2) if count else None
+
+
+def stream_gradebook(course, chunk_size=500):
+    """
+    Yields the students x tasks matrix of the course as JSON, a student row
+    at a time. The per task aggregates are accumulated while streaming and
+    come last.
+    """
+    tasks = list(course.tasks.order_by("id").values("id", "title", "end_at"))
+    task_ids = [task["id"] for task in tasks]
+    columns = [
+        {"id": task_id, "submitted": 0, "graded": 0, "total": 0}
+        for task_id in task_ids
+    ]
+
+    yield '{"tasks": ' + json.dumps(tasks, cls=DjangoJSONEncoder)
+    yield ', "students": ['
+
+    rows = gradebook_rows(course, task_ids).iterator(chunk_size=chunk_size)
+    for index, row in enumerate(rows):
+        grades, states = [], []
+        graded_total = graded_count = submitted_count = 0
+        for task_id, column in zip(task_ids, columns):
+            grade = row[f"grade_{task_id}"]
+            if grade is not None:
+                state = GRADED
+                graded_total += grade
+                graded_count += 1
+                column["graded"] += 1
+                column["total"] += grade
+            elif row[f"results_{task_id}"]:
+                state = SUBMITTED
+            else:
+                state = MISSING
+            if state != MISSING:
+                submitted_count += 1
+                column["submitted"] += 1
+            grades.append(grade)
+            states.append(state)
+
+        student_row = {
+            "student": {
+                "id": row["id"],
+                "email": row["email"],
+                "first_name": row["first_name"],
+                "last_name": row["last_name"],
+            },
+            "grades": grades,
+            "states": states,
+            "submitted": submitted_count,
+            "graded": graded_count,
+            "average": average(graded_total, graded_count),
+        }
+        yield ("," if index else "") + json.dumps(student_row)
+
+    summary = [
+        {
+            "id": column["id"],
+            "submitted": column["submitted"],
+            "graded": column["graded"],
+            "average": average(column["total"], column["graded"]),
+        }
+        for column in columns
+    ]
+    yield '], "summary": ' + json.dumps(summary) + "}"
@@ -0,0 +1,137 @@
+from course_task.models import Question
+from django.db import transaction
+from django.db.models import F, IntegerField, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce, NullIf
+from rest_framework.validators import ValidationError
+
+from .models import Answer, Result
+
+BULK_GRADE_BATCH_SIZE = 500
+
+
+def derived_grade(points, total_weight):
+    """
+    The grade of a result as the weighted mean of its answer grades,
+    rounded half up with integer arithmetic so it stays in the database.
+    """
+    return (points + total_weight / 2) / NullIf(total_weight, 0)
+
+
+def lock_results(results):
+    """
+    Locks the results in id order before their points are summed, so a
+    concurrent grading of another of their answers commits first and is
+    counted instead of lost.
+    """
+    return list(
+        results.select_for_update()
+        .order_by("id")
+        .values_list("id", flat=True)
+    )
+
+
+def update_result_grade(answer):
+    """Recomputes the result of a derived task from the student's answers."""
+    task = answer.question.task
+    if not task.grade_from_answers:
+        return 0
+
+    results = Result.objects.filter(task=task, student_id=answer.student_id)
+    if not lock_results(results):
+        return 0
+    return recompute_result_grades(results)
+
+
+def recompute_result_grades(results):
+    """
+    Recomputes points and grades of the results from the answers with one
+    set-based UPDATE, no matter how many results the queryset covers.
+    """
+    points = Subquery(
+        Answer.objects.filter(
+            question__task=OuterRef("task"), student=OuterRef("student")
+        )
+        .order_by()
+        .values("student")
+        .annotate(points=Sum(F("grade") * F("question__weight")))
+        .values("points"),
+        output_field=IntegerField(),
+    )
+    total_weight = Subquery(
+        Question.objects.filter(task=OuterRef("task"))
+        .order_by()
+        .values("task")
+        .annotate(total=Sum("weight"))
+        .values("total"),
+        output_field=IntegerField(),
+    )
+    # The points are NULL until an answer is graded, and so is the grade.
+    return results.update(
+        grade_points=Coalesce(points, 0),
+        grade=derived_grade(points, total_weight),
+    )
+
+
+def recompute_task_grades(task):
+    if not task.grade_from_answers:
+        return 0
+    return recompute_result_grades(task.results.all())
+
+
+def _set_grades(queryset, grades):
+    """
+    Locks the objects of the queryset with the ids of the id to grade
+    mapping in one query, rejects the whole batch if any id is outside of
+    the queryset and returns the objects whose grade changed.
+    """
+    objs = list(
+        queryset.select_for_update(of=("self",)).filter(id__in=grades)
+    )
+    unknown = set(grades).difference(obj.id for obj in objs)
+    if unknown:
+        raise ValidationError({"unknown": sorted(unknown)})
+
+    changed = []
+    for obj in objs:
+        if obj.grade != grades[obj.id]:
+            obj.grade = grades[obj.id]
+            changed.append(obj)
+    return changed
+
+
+@transaction.atomic
+def bulk_grade_answers(answers, grades):
+    answers = _set_grades(answers.select_related("question__task"), grades)
+    Answer.objects.bulk_update(
+        answers, ("grade",), batch_size=BULK_GRADE_BATCH_SIZE
+    )
+
+    derived = {
+        (answer.question.task_id, answer.student_id)
+        for answer in answers
+        if answer.question.task.grade_from_answers
+    }
+    if derived:
+        task_ids, student_ids = zip(*derived)
+        results = Result.objects.filter(
+            task_id__in=task_ids, student_id__in=student_ids
+        )
+        lock_results(results)
+        recompute_result_grades(results)
+    return len(answers)
+
+
+@transaction.atomic
+def bulk_grade_results(results, grades):
+    results = _set_grades(results.select_related("task"), grades)
+    derived = [
+        result.id for result in results if result.task.grade_from_answers
+    ]
+    if derived:
+        err = "The grades of these results are computed from their answers."
+        raise ValidationError({"derived": derived, "detail": err})
+
+    Result.objects.bulk_update(
+        results, ("grade",), batch_size=BULK_GRADE_BATCH_SIZE
+    )
+    return len(results)
@@ -0,0 +1,18 @@
+# Generated by Django 4.1.7 on 2026-10-18 16:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('task_result', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='result',
+            name='grade_points',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+    ]
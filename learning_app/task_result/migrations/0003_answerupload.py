@@ -0,0 +1,26 @@
+# Generated by Django 4.1.7 on 2026-10-18 16:56
+
+from django.db import migrations, models
+import django.db.models.deletion
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('task_result', '0002_result_grade_points'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AnswerUpload',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('filename', models.CharField(max_length=255)),
+                ('size', models.PositiveBigIntegerField()),
+                ('offset', models.PositiveBigIntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('answer', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='uploads', to='task_result.answer')),
+            ],
+        ),
+    ]
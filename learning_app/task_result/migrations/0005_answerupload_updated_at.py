@@ -0,0 +1,18 @@
+# Generated by Django 4.1.7 on 2026-10-18 17:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('task_result', '0004_deadlinereminder'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='answerupload',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, db_index=True),
+        ),
+    ]
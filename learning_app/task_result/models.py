@@ -1,4 +1,7 @@
+import uuid
+
 from course_task.models import Question, Task
+from custom_auth.context import EnrollmentContext
 from custom_auth.models import User
 from django.core.exceptions import ValidationError
 from django.core.validators import MaxValueValidator
@@ -28,10 +31,16 @@ class Answer(models.Model):
     def __str__(self):
         return f"Answer ({self.id})"
 
-    def clean(self):
+    def clean(self, enrollment=None):
+        """
+        `enrollment` is the EnrollmentContext of the student if the caller
+        has it, otherwise their courses are loaded.
+        """
         super().clean()
 
-        if self.question.task.course not in self.student.studied_courses.all():
+        enrollment = enrollment or EnrollmentContext(self.student)
+        course_id = self.question.task.course_id
+        if not enrollment.studies(course_id):
             err = "The question doesn't belong to user's courses."
             raise ValidationError(err)
 
@@ -50,9 +59,46 @@ class Result(models.Model):
     grade = models.PositiveSmallIntegerField(
         blank=True, null=True, validators=(MaxValueValidator(100),)
     )
+    grade_points = models.PositiveIntegerField(default=0, editable=False)
 
     class Meta:
         unique_together = ("task", "student")
 
     def __str__(self):
         return f"Result ({self.id})"
+
+
+class AnswerUpload(models.Model):
+    """A resumable upload of an answer attachment, assembled chunk by chunk."""
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    answer = models.ForeignKey(
+        Answer, on_delete=models.CASCADE, related_name="uploads"
+    )
+    filename = models.CharField(max_length=255)
+    size = models.PositiveBigIntegerField()
+    offset = models.PositiveBigIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+
+    def __str__(self):
+        return f"Upload ({self.id})"
+
+
+class DeadlineReminder(models.Model):
+    """
+    A deadline reminder sent to a student, one per task and reminder
+    window, so overlapping reminder runs can't send it twice.
+    """
+
+    task = models.ForeignKey(
+        Task, on_delete=models.CASCADE, related_name="reminders"
+    )
+    student = models.ForeignKey(
+        User, on_delete=models.CASCADE, related_name="deadline_reminders"
+    )
+    window = models.DurationField()
+    sent_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        unique_together = ("task", "student", "window")
@@ -0,0 +1,84 @@
+from functools import partial
+
+from course.models import Course
+from course_task.models import Task
+from custom_auth.tasks import send_email_batch
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Exists, OuterRef
+from django.utils import timezone
+
+from .models import DeadlineReminder, Result
+
+
+def due_tasks(now=None):
+    """
+    Yields the tasks due within the reminder windows, each with the shortest
+    window its deadline falls in, so a task created close to its deadline
+    gets a single reminder.
+    """
+    now = now or timezone.now()
+    windows = sorted(settings.DEADLINE_REMINDER_WINDOWS)
+    tasks = Task.objects.filter(
+        end_at__gt=now, end_at__lte=now + windows[-1]
+    ).select_related("course")
+    for task in tasks:
+        yield task, next(w for w in windows if task.end_at <= now + w)
+
+
+def students_to_remind(task, window):
+    """
+    The ids and emails of the students of the course who neither submitted
+    the task nor were reminded of it in the window, in one anti-join.
+    """
+    submitted = Result.objects.filter(task=task, student=OuterRef("user_id"))
+    reminded = DeadlineReminder.objects.filter(
+        task=task, window=window, student=OuterRef("user_id")
+    )
+    return (
+        Course.students.through.objects.filter(course_id=task.course_id)
+        .exclude(Exists(submitted))
+        .exclude(Exists(reminded))
+        .order_by("user_id")
+        .values_list("user_id", "user__email")
+    )
+
+
+@transaction.atomic
+def remind_students(task, window):
+    """
+    Records and sends the reminders of a task for a window. The task row is
+    locked for the run, a concurrent run skips the task and the next one
+    finds the reminders recorded.
+    """
+    locked = Task.objects.select_for_update(skip_locked=True).filter(
+        pk=task.pk
+    )
+    if locked.first() is None:
+        return 0
+
+    students = list(students_to_remind(task, window))
+    DeadlineReminder.objects.bulk_create(
+        DeadlineReminder(task=task, student_id=student_id, window=window)
+        for student_id, _ in students
+    )
+
+    subject = f"Deadline reminder: {task.title}"
+    message = (
+        f'The task "{task.title}" of the course "{task.course.title}" is '
+        f"due at {task.end_at:%Y-%m-%d %H:%M} UTC."
+    )
+    emails = [email for _, email in students]
+    batch_size = settings.EMAIL_BATCH_SIZE
+    for i in range(0, len(emails), batch_size):
+        batch = emails[i : i + batch_size]
+        transaction.on_commit(
+            partial(send_email_batch.delay, subject, message, batch)
+        )
+    return len(students)
+
+
+def send_deadline_reminders(now=None):
+    return sum(
+        remind_students(task, window) for task, window in due_tasks(now)
+    )
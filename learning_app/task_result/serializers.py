@@ -1,8 +1,17 @@
+import csv
+import io
+
+from course_task.models import Question
+from custom_auth.context import enrollment_context
+from django.conf import settings
+from django.core.validators import MaxValueValidator
+from django.db import transaction
 from django.utils import timezone
 from rest_framework import serializers
 from rest_framework.validators import ValidationError
 
-from .models import Answer, Result
+from . import grading
+from .models import Answer, AnswerUpload, Result
 
 
 class ProfessorAnswerSerializer(serializers.ModelSerializer):
@@ -11,28 +20,37 @@ class ProfessorAnswerSerializer(serializers.ModelSerializer):
         fields = "__all__"
         read_only_fields = ("question", "student", "text", "attachment")
 
+    @transaction.atomic
+    def update(self, instance, validated_data):
+        old_grade = instance.grade
+        answer = super().update(instance, validated_data)
+        if answer.grade != old_grade:
+            grading.update_result_grade(answer)
+        return answer
+
 
 class StudentAnswerSerializer(serializers.ModelSerializer):
     class Meta:
         model = Answer
         fields = "__all__"
         read_only_fields = ("student", "grade")
+        extra_kwargs = {
+            "question": {"queryset": Question.objects.select_related("task")}
+        }
 
     def validate(self, attrs):
         student = self.context["request"].user
-        task = attrs["question"].task
-
-        if Result.objects.filter(student=student, task=task).exists():
-            err = "You cannot change an answer after submition for review."
-            raise ValidationError(err)
+        task = (attrs.get("question") or self.instance.question).task
 
         if self.instance is None:
-            question_course = attrs["question"].task.course
-            student = self.context["request"].user
-            allowed_courses = student.studied_courses.all()
-            if question_course not in allowed_courses:
+            context = enrollment_context(self.context["request"])
+            if not context.studies(task.course_id):
                 err = "The question doesn't belong to user's courses"
                 raise ValidationError(err)
+
+        if Result.objects.filter(student=student, task=task).exists():
+            err = "You cannot change an answer after submition for review."
+            raise ValidationError(err)
         return attrs
 
     def create(self, validated_data):
@@ -47,12 +65,33 @@ class StudentAnswerUpdateSerializer(StudentAnswerSerializer):
         )
 
 
+class AnswerUploadSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = AnswerUpload
+        fields = ("id", "answer", "filename", "size", "offset", "created_at")
+        read_only_fields = ("answer", "offset")
+        extra_kwargs = {"size": {"min_value": 1}}
+
+    def validate_size(self, value):
+        if value > settings.ANSWER_UPLOAD_MAX_SIZE:
+            max_size = settings.ANSWER_UPLOAD_MAX_SIZE
+            err = f"The file can't be larger than {max_size} bytes."
+            raise ValidationError(err)
+        return value
+
+
 class ProfessorResultSerializer(serializers.ModelSerializer):
     class Meta:
         model = Result
         fields = "__all__"
         read_only_fields = ("task", "student")
 
+    def validate_grade(self, value):
+        if self.instance and self.instance.task.grade_from_answers:
+            err = "The grade of this task is computed from its answers."
+            raise ValidationError(err)
+        return value
+
 
 class StudentResultSerializer(serializers.ModelSerializer):
     class Meta:
@@ -64,6 +103,10 @@ class StudentResultSerializer(serializers.ModelSerializer):
         student = self.context["request"].user
         task = attrs["task"]
 
+        context = enrollment_context(self.context["request"])
+        if not context.studies(task.course_id):
+            raise ValidationError("The task doesn't belong to user's courses")
+
         if Result.objects.filter(student=student, task=task).exists():
             err = "You cannot submit a task for review a second time."
             raise ValidationError(err)
@@ -76,4 +119,74 @@ class StudentResultSerializer(serializers.ModelSerializer):
 
     def create(self, validated_data):
         validated_data["student"] = self.context["request"].user
-        return super().create(validated_data)
+        result = super().create(validated_data)
+        if result.task.grade_from_answers:
+            grading.recompute_result_grades(
+                Result.objects.filter(id=result.id)
+            )
+            result.refresh_from_db(fields=("grade_points", "grade"))
+        return result
+
+
+class GradeSerializer(serializers.Serializer):
+    id = serializers.IntegerField()
+    grade = serializers.IntegerField(
+        allow_null=True, min_value=0, validators=(MaxValueValidator(100),)
+    )
+
+
+class BulkGradeSerializer(serializers.Serializer):
+    """
+    Takes `{id, grade}` pairs as a JSON list or as the `id` and `grade`
+    columns of an uploaded CSV file, an empty grade clears it.
+    """
+
+    grades = GradeSerializer(many=True, required=False)
+    file = serializers.FileField(required=False)
+
+    def validate_file(self, file):
+        reader = csv.DictReader(io.TextIOWrapper(file, encoding="utf-8-sig"))
+        try:
+            if not {"id", "grade"}.issubset(reader.fieldnames or ()):
+                err = "The CSV file needs id and grade columns."
+                raise ValidationError(err)
+            rows = [
+                {"id": row["id"], "grade": row["grade"] or None}
+                for row in reader
+            ]
+        except (UnicodeDecodeError, csv.Error):
+            raise ValidationError("The file must be a UTF-8 CSV.")
+
+        serializer = GradeSerializer(data=rows, many=True)
+        serializer.is_valid(raise_exception=True)
+        return serializer.validated_data
+
+    def validate(self, attrs):
+        grades = attrs.pop("file", None) or attrs.pop("grades", None)
+        if not grades:
+            raise ValidationError("Pass a list of grades or a CSV file.")
+
+        attrs["grades"] = {row["id"]: row["grade"] for row in grades}
+        return attrs
+
+
+class SubmissionAnswerSerializer(serializers.Serializer):
+    question = serializers.IntegerField()
+    text = serializers.CharField()
+
+
+class TaskSubmissionSerializer(serializers.Serializer):
+    """
+    Takes the answers to the questions of a task, questions answered
+    before can be left out.
+    """
+
+    answers = SubmissionAnswerSerializer(many=True)
+
+    def validate_answers(self, answers):
+        texts = {}
+        for answer in answers:
+            if answer["question"] in texts:
+                raise ValidationError("A question can be answered only once.")
+            texts[answer["question"]] = answer["text"]
+        return texts
@@ -0,0 +1,15 @@
+import os
+
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+
+from .models import AnswerUpload
+from .uploads import part_path
+
+
+@receiver(post_delete, sender=AnswerUpload)
+def remove_upload_part(sender, instance, **kwargs):
+    try:
+        os.remove(part_path(instance))
+    except FileNotFoundError:
+        pass
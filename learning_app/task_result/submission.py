@@ -0,0 +1,62 @@
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from rest_framework.validators import ValidationError
+
+from . import grading
+from .models import Answer, Result
+
+
+@transaction.atomic
+def submit_task(task, student, texts):
+    """
+    Saves the answers of a student to the questions of a task, given as a
+    question id to text mapping, and submits the task for review. Answers
+    created before, e.g. by an attachment upload, are updated. Every
+    question has to be answered.
+    """
+    if task.end_at and timezone.now() > task.end_at:
+        raise ValidationError("The task fulfillment time has expired.")
+
+    question_ids = set(task.questions.values_list("id", flat=True))
+    unknown = set(texts).difference(question_ids)
+    if unknown:
+        err = "The questions don't belong to the task."
+        raise ValidationError({"unknown": sorted(unknown), "detail": err})
+
+    answers = {
+        answer.question_id: answer
+        for answer in Answer.objects.select_for_update().filter(
+            question__task=task, student=student
+        )
+    }
+    missing = question_ids.difference(texts, answers)
+    if missing:
+        err = "Every question of the task has to be answered."
+        raise ValidationError({"missing": sorted(missing), "detail": err})
+
+    answers_to_create = []
+    answers_to_update = []
+    for question_id, text in texts.items():
+        answer = answers.get(question_id)
+        if answer is None:
+            answers_to_create.append(
+                Answer(question_id=question_id, student=student, text=text)
+            )
+        elif answer.text != text:
+            answer.text = text
+            answers_to_update.append(answer)
+
+    Answer.objects.bulk_create(answers_to_create)
+    Answer.objects.bulk_update(answers_to_update, ("text",))
+
+    try:
+        with transaction.atomic():
+            result = Result.objects.create(task=task, student=student)
+    except IntegrityError:
+        err = "You cannot submit a task for review a second time."
+        raise ValidationError(err)
+
+    if task.grade_from_answers:
+        grading.recompute_result_grades(Result.objects.filter(id=result.id))
+        result.refresh_from_db(fields=("grade_points", "grade"))
+    return result
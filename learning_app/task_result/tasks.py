@@ -0,0 +1,21 @@
+from config.celery import app
+from course_task.models import Task
+
+from . import grading, reminders, uploads
+
+
+@app.task
+def recompute_task_grades(task_id):
+    task = Task.objects.filter(id=task_id).first()
+    if task is not None:
+        grading.recompute_task_grades(task)
+
+
+@app.task
+def send_deadline_reminders():
+    return reminders.send_deadline_reminders()
+
+
+@app.task
+def expire_answer_uploads():
+    return uploads.expire_uploads()
@@ -0,0 +1,22 @@
+import factory
+from course_task.tests.factories import QuestionFactory, TaskFactory
+from custom_auth.models import User
+from custom_auth.tests.factories import UserFactory
+from task_result.models import Answer, Result
+
+
+class AnswerFactory(factory.django.DjangoModelFactory):
+    class Meta:
+        model = Answer
+
+    question = factory.SubFactory(QuestionFactory)
+    student = factory.SubFactory(UserFactory, role=User.Role.STUDENT)
+    text = factory.Faker("sentence")
+
+
+class ResultFactory(factory.django.DjangoModelFactory):
+    class Meta:
+        model = Result
+
+    task = factory.SubFactory(TaskFactory)
+    student = factory.SubFactory(UserFactory, role=User.Role.STUDENT)
@@ -0,0 +1,39 @@
+from course_task.tests.factories import QuestionFactory
+from custom_auth.models import User
+from custom_auth.tests.factories import UserFactory
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+
+class TestStudentAnswers(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.question = QuestionFactory()
+        cls.student = UserFactory(role=User.Role.STUDENT)
+        cls.question.task.course.students.add(cls.student)
+
+    def setUp(self):
+        self.client.force_authenticate(user=self.student)
+
+    def test_create_answer(self):
+        """
+        Ensure creating an answer checks the enrollment and the submission
+        with a fixed number of queries.
+        """
+        with self.assertNumQueries(4):
+            response = self.client.post(
+                "/student/answer/",
+                {"question": self.question.id, "text": "Forty two"},
+            )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data["student"], self.student.id)
+
+    def test_create_answer_out_of_courses(self):
+        """
+        Ensure a student can't answer questions of other courses.
+        """
+        response = self.client.post(
+            "/student/answer/",
+            {"question": QuestionFactory().id, "text": "Forty two"},
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,139 @@
+import io
+import shutil
+import tempfile
+import zipfile
+
+from course_task.tests.factories import QuestionFactory
+from django.core.files.base import ContentFile
+from django.test import override_settings
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from .factories import AnswerFactory
+
+CONTENT = b"0123456789" * 10
+
+
+class TestAttachments(APITestCase):
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        settings = override_settings(MEDIA_ROOT=media_root)
+        settings.enable()
+        self.addCleanup(settings.disable)
+
+        self.answer = AnswerFactory()
+        self.answer.attachment.save("essay.txt", ContentFile(CONTENT))
+        self.professor = self.answer.question.task.course.professor
+        self.url = f"/professor/answer/{self.answer.id}/attachment/"
+        self.client.force_authenticate(user=self.professor)
+
+    def test_download(self):
+        """
+        Ensure a professor can download an attachment and revalidate it.
+        """
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(b"".join(response.streaming_content), CONTENT)
+        self.assertEqual(response["Content-Length"], str(len(CONTENT)))
+        self.assertEqual(
+            response["Content-Disposition"], 'attachment; filename="essay.txt"'
+        )
+
+        response = self.client.get(
+            self.url, HTTP_IF_NONE_MATCH=response["ETag"]
+        )
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_range_requests(self):
+        """
+        Ensure single byte ranges are served partially.
+        """
+        response = self.client.get(self.url, HTTP_RANGE="bytes=10-19")
+        self.assertEqual(response.status_code, status.HTTP_206_PARTIAL_CONTENT)
+        self.assertEqual(b"".join(response.streaming_content), CONTENT[10:20])
+        self.assertEqual(response["Content-Range"], "bytes 10-19/100")
+
+        response = self.client.get(self.url, HTTP_RANGE="bytes=-5")
+        self.assertEqual(b"".join(response.streaming_content), CONTENT[-5:])
+
+        response = self.client.get(
+            self.url, HTTP_RANGE="bytes=0-9", HTTP_IF_RANGE='"stale"'
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        response = self.client.get(self.url, HTTP_RANGE="bytes=100-")
+        self.assertEqual(
+            response.status_code,
+            status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+        )
+
+    @override_settings(SENDFILE_BACKEND="nginx")
+    def test_offloaded_download(self):
+        """
+        Ensure the transfer is handed off to the front proxy.
+        """
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.content, b"")
+        self.assertEqual(
+            response["X-Accel-Redirect"],
+            f"/protected/media/{self.answer.attachment.name}",
+        )
+
+    def test_download_permissions(self):
+        """
+        Ensure only the professor of the course and the author can
+        download the attachment.
+        """
+        student = self.answer.student
+        self.answer.question.task.course.students.add(student)
+        self.client.force_authenticate(user=student)
+        url = f"/student/answer/{self.answer.id}/attachment/"
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        self.client.force_authenticate(user=AnswerFactory().student)
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class TestAttachmentsArchive(APITestCase):
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        settings = override_settings(MEDIA_ROOT=media_root)
+        settings.enable()
+        self.addCleanup(settings.disable)
+
+        self.question = QuestionFactory()
+        self.task = self.question.task
+        self.answer = AnswerFactory(
+            question=self.question,
+            student__first_name="Ada",
+            student__last_name="Lovelace",
+        )
+        self.answer.attachment.save(
+            "notes on engine.txt", ContentFile(CONTENT)
+        )
+        AnswerFactory(question=self.question)
+        self.client.force_authenticate(user=self.task.course.professor)
+
+    def test_attachments_zip(self):
+        """
+        Ensure the attachments of a task are streamed as a ZIP archive.
+        """
+        response = self.client.get(
+            f"/professor/task/{self.task.id}/attachments.zip/"
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Type"], "application/zip")
+
+        content = b"".join(response.streaming_content)
+        with zipfile.ZipFile(io.BytesIO(content)) as archive:
+            name = (
+                f"Lovelace_Ada_{self.answer.student_id}/"
+                f"question_{self.question.id}_notes_on_engine.txt"
+            )
+            self.assertEqual(archive.namelist(), [name])
+            self.assertEqual(archive.read(name), CONTENT)
@@ -0,0 +1,102 @@
+import factory
+from course_task.tests.factories import QuestionFactory, TaskFactory
+from django.core.files.uploadedfile import SimpleUploadedFile
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from .factories import AnswerFactory, ResultFactory
+
+
+class TestBulkGrade(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.task = TaskFactory()
+        cls.professor = cls.task.course.professor
+        cls.question = QuestionFactory(task=cls.task)
+        cls.answers = AnswerFactory.create_batch(
+            300,
+            question=cls.question,
+            student__email=factory.Sequence(lambda n: f"student{n}@bulk.test"),
+            student__document_number=factory.Sequence(str),
+        )
+        cls.results = ResultFactory.create_batch(3, task=cls.task)
+        cls.foreign_answer = AnswerFactory()
+
+    def setUp(self):
+        self.client.force_authenticate(user=self.professor)
+
+    def test_bulk_grade_answers(self):
+        """
+        Ensure a professor can grade all answers of a task in one request.
+        """
+        grades = [
+            {"id": answer.id, "grade": i % 101}
+            for i, answer in enumerate(self.answers)
+        ]
+        with self.assertNumQueries(5):
+            response = self.client.post(
+                "/professor/answer/bulk_grade/", {"grades": grades}, "json"
+            )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, {"graded": 300})
+        self.answers[150].refresh_from_db()
+        self.assertEqual(self.answers[150].grade, 49)
+
+    def test_bulk_grade_results_from_csv(self):
+        """
+        Ensure results can be graded from an uploaded CSV file.
+        """
+        content = "id,grade\n{},90\n{},\n".format(
+            self.results[0].id, self.results[1].id
+        )
+        response = self.client.post(
+            "/professor/result/bulk_grade/",
+            {"file": SimpleUploadedFile("grades.csv", content.encode())},
+            format="multipart",
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, {"graded": 1})
+        self.results[0].refresh_from_db()
+        self.assertEqual(self.results[0].grade, 90)
+
+    def test_bulk_grade_file_not_utf8(self):
+        """
+        Ensure a CSV file in another encoding is rejected.
+        """
+        content = f"id,grade,note\n{self.answers[0].id},90,Très bien\n"
+        file = SimpleUploadedFile("grades.csv", content.encode("cp1252"))
+        response = self.client.post(
+            "/professor/answer/bulk_grade/",
+            {"file": file},
+            format="multipart",
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            response.data["file"], ["The file must be a UTF-8 CSV."]
+        )
+
+    def test_bulk_grade_is_all_or_nothing(self):
+        """
+        Ensure nothing is graded when an answer is out of the professor's
+        courses or a grade is invalid.
+        """
+        url = "/professor/answer/bulk_grade/"
+        grades = [
+            {"id": self.answers[0].id, "grade": 50},
+            {"id": self.foreign_answer.id, "grade": 50},
+        ]
+        response = self.client.post(url, {"grades": grades}, "json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            response.data["unknown"], [str(self.foreign_answer.id)]
+        )
+
+        grades = [
+            {"id": self.answers[0].id, "grade": 50},
+            {"id": self.answers[1].id, "grade": 101},
+        ]
+        response = self.client.post(url, {"grades": grades}, "json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        self.answers[0].refresh_from_db()
+        self.assertIsNone(self.answers[0].grade)
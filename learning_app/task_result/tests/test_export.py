@@ -0,0 +1,80 @@
+import csv
+import io
+
+from course_task.tests.factories import QuestionFactory, TaskFactory
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from .factories import AnswerFactory, ResultFactory
+
+
+def read_csv(response):
+    content = b"".join(response.streaming_content).decode()
+    return list(csv.DictReader(io.StringIO(content)))
+
+
+class TestExport(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.task = TaskFactory()
+        cls.professor = cls.task.course.professor
+        cls.other_task = TaskFactory(course=cls.task.course)
+        question = QuestionFactory(task=cls.task)
+        cls.answers = AnswerFactory.create_batch(3, question=question)
+        AnswerFactory(question=QuestionFactory(task=cls.other_task))
+        AnswerFactory()
+        cls.results = ResultFactory.create_batch(2, task=cls.task)
+        ResultFactory()
+
+    def setUp(self):
+        self.client.force_authenticate(user=self.professor)
+
+    def test_export_answers(self):
+        """
+        Ensure answers of the professor's courses are streamed as CSV
+        and can be filtered by task.
+        """
+        url = reverse("answer-export")
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Type"], "text/csv")
+        self.assertEqual(len(read_csv(response)), 4)
+
+        rows = read_csv(self.client.get(url, {"task_id": self.task.id}))
+        self.assertEqual(
+            [int(row["id"]) for row in rows],
+            sorted((a.id for a in self.answers), reverse=True),
+        )
+        self.assertEqual(rows[0]["student"], self.answers[-1].student.email)
+
+    def test_export_escapes_formulas(self):
+        """
+        Ensure answers which would run as spreadsheet formulas are escaped.
+        """
+        texts = ("=HYPERLINK(\"http://x\")", "+1", "-1", "@SUM(A1)", "ok")
+        question = QuestionFactory(task=self.task)
+        for text in texts:
+            AnswerFactory(question=question, text=text)
+
+        rows = read_csv(
+            self.client.get(
+                reverse("answer-export"), {"task_id": self.task.id}
+            )
+        )
+        exported = {row["text"] for row in rows}
+        for text in texts[:-1]:
+            self.assertIn("'" + text, exported)
+        self.assertIn("ok", exported)
+
+    def test_export_results(self):
+        """
+        Ensure results of the professor's courses are streamed as CSV.
+        """
+        response = self.client.get(reverse("result-export"))
+        rows = read_csv(response)
+
+        self.assertEqual(
+            {int(row["id"]) for row in rows}, {r.id for r in self.results}
+        )
+        self.assertEqual(rows[0]["task_id"], str(self.task.id))
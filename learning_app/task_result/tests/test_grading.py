@@ -0,0 +1,112 @@
+from course_task.tests.factories import QuestionFactory, TaskFactory
+from custom_auth.models import User
+from custom_auth.tests.factories import UserFactory
+from rest_framework import status
+from rest_framework.test import APITestCase
+from task_result import grading
+from task_result.models import Answer, Result
+
+from .factories import AnswerFactory, ResultFactory
+
+
+class TestGrading(APITestCase):
+    def setUp(self):
+        self.task = TaskFactory(grade_from_answers=True)
+        self.professor = self.task.course.professor
+        self.first = QuestionFactory(task=self.task, weight=1)
+        self.second = QuestionFactory(task=self.task, weight=3)
+        self.result = ResultFactory(task=self.task)
+        self.student = self.result.student
+        self.answers = [
+            AnswerFactory(question=self.first, student=self.student),
+            AnswerFactory(question=self.second, student=self.student),
+        ]
+        self.client.force_authenticate(user=self.professor)
+
+    def grade(self, answer, grade):
+        url = f"/professor/answer/{answer.id}/"
+        return self.client.patch(url, {"grade": grade}, "json")
+
+    def test_answer_grade_updates_result(self):
+        """
+        Ensure grading an answer shifts the weighted result grade.
+        """
+        response = self.grade(self.answers[0], 80)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.result.refresh_from_db()
+        self.assertEqual(self.result.grade_points, 80)
+        self.assertEqual(self.result.grade, 20)
+
+        self.grade(self.answers[1], 60)
+        self.grade(self.answers[0], 90)
+        self.result.refresh_from_db()
+        self.assertEqual(self.result.grade_points, 270)
+        self.assertEqual(self.result.grade, 68)
+
+    def test_answer_grade_recomputes_result(self):
+        """
+        Ensure the result follows its answers, not a stale old grade.
+        """
+        Answer.objects.filter(id=self.answers[1].id).update(grade=60)
+        self.grade(self.answers[0], 80)
+        self.result.refresh_from_db()
+        self.assertEqual(self.result.grade_points, 260)
+        self.assertEqual(self.result.grade, 65)
+
+        Answer.objects.filter(id=self.answers[1].id).update(grade=None)
+        self.grade(self.answers[0], None)
+        self.result.refresh_from_db()
+        self.assertEqual(self.result.grade_points, 0)
+        self.assertIsNone(self.result.grade)
+
+    def test_manual_grade_of_derived_result(self):
+        """
+        Ensure a professor can't set the grade of a derived result.
+        """
+        url = f"/professor/result/{self.result.id}/"
+        response = self.client.patch(url, {"grade": 50})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_recompute_task_grades(self):
+        """
+        Ensure the bulk recompute matches the incremental grades.
+        """
+        other = ResultFactory(task=self.task)
+        AnswerFactory(question=self.second, student=other.student, grade=100)
+        self.grade(self.answers[0], 40)
+        self.grade(self.answers[1], 100)
+
+        with self.assertNumQueries(1):
+            self.assertEqual(grading.recompute_task_grades(self.task), 2)
+        self.result.refresh_from_db()
+        other.refresh_from_db()
+        self.assertEqual(
+            (self.result.grade_points, self.result.grade), (340, 85)
+        )
+        self.assertEqual((other.grade_points, other.grade), (300, 75))
+
+        url = f"/professor/task/{self.task.id}/recompute_grades/"
+        response = self.client.post(url)
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+
+    def test_submit_without_graded_answers(self):
+        """
+        Ensure a derived result stays ungraded until an answer is graded.
+        """
+        task = TaskFactory(grade_from_answers=True)
+        question = QuestionFactory(task=task)
+        student = UserFactory(role=User.Role.STUDENT, is_active=True)
+        task.course.students.add(student)
+        AnswerFactory(question=question, student=student)
+
+        self.client.force_authenticate(user=student)
+        url = f"/student/task/{task.id}/submit/"
+        response = self.client.post(url, {"answers": []}, "json")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        result = Result.objects.get(task=task, student=student)
+        self.assertIsNone(result.grade)
+        self.assertEqual(result.grade_points, 0)
+
+        grading.recompute_task_grades(task)
+        result.refresh_from_db()
+        self.assertIsNone(result.grade)
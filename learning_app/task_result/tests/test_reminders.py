@@ -0,0 +1,62 @@
+from datetime import timedelta
+
+import time_machine
+from course_task.tests.factories import TaskFactory
+from custom_auth.models import User
+from custom_auth.tests.factories import UserFactory
+from django.core import mail
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from task_result import reminders
+from task_result.models import DeadlineReminder
+
+from .factories import ResultFactory
+
+
+@override_settings(EMAIL_BATCH_SIZE=2)
+class TestDeadlineReminders(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.task = TaskFactory(end_at=timezone.now() + timedelta(hours=20))
+        cls.students = UserFactory.create_batch(4, role=User.Role.STUDENT)
+        cls.task.course.students.add(*cls.students)
+        ResultFactory(task=cls.task, student=cls.students[0])
+
+    def send(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            return reminders.send_deadline_reminders()
+
+    def test_reminders(self):
+        """
+        Ensure students who didn't submit the task are reminded once in
+        each window.
+        """
+        with self.assertNumQueries(6):
+            self.assertEqual(self.send(), 3)
+        self.assertEqual(
+            sorted(message.to[0] for message in mail.outbox),
+            sorted(student.email for student in self.students[1:]),
+        )
+        self.assertEqual(self.send(), 0)
+
+        ResultFactory(task=self.task, student=self.students[1])
+        with time_machine.travel(self.task.end_at - timedelta(minutes=30)):
+            self.assertEqual(self.send(), 2)
+            self.assertEqual(self.send(), 0)
+        self.assertEqual(len(mail.outbox), 5)
+
+    def test_tasks_out_of_windows(self):
+        """
+        Ensure far and past deadlines get no reminders and a task due
+        soon gets only the reminder of the shortest window.
+        """
+        with time_machine.travel(self.task.end_at - timedelta(days=2)):
+            self.assertEqual(self.send(), 0)
+        with time_machine.travel(self.task.end_at + timedelta(minutes=1)):
+            self.assertEqual(self.send(), 0)
+        with time_machine.travel(self.task.end_at - timedelta(minutes=5)):
+            self.assertEqual(self.send(), 3)
+        self.assertEqual(
+            set(DeadlineReminder.objects.values_list("window", flat=True)),
+            {timedelta(hours=1)},
+        )
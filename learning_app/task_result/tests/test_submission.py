@@ -0,0 +1,104 @@
+from datetime import timedelta
+
+import time_machine
+from course_task.tests.factories import QuestionFactory, TaskFactory
+from custom_auth.models import User
+from custom_auth.tests.factories import UserFactory
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APITestCase
+from task_result.models import Answer, Result
+
+from .factories import AnswerFactory, ResultFactory
+
+
+class TestSubmission(APITestCase):
+    def setUp(self):
+        self.task = TaskFactory(end_at=timezone.now() + timedelta(days=1))
+        self.questions = QuestionFactory.create_batch(3, task=self.task)
+        self.student = UserFactory(role=User.Role.STUDENT)
+        self.task.course.students.add(self.student)
+        self.url = f"/student/task/{self.task.id}/submit/"
+        self.client.force_authenticate(user=self.student)
+
+    def answers(self, questions):
+        return [
+            {"question": question.id, "text": f"Answer {question.id}"}
+            for question in questions
+        ]
+
+    def test_submit_task(self):
+        """
+        Ensure a student can answer all questions and submit the task
+        in one request.
+        """
+        uploaded = AnswerFactory(
+            question=self.questions[0], student=self.student, text=""
+        )
+        response = self.client.post(
+            self.url, {"answers": self.answers(self.questions[1:])}, "json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data["task"], self.task.id)
+        self.assertEqual(
+            Answer.objects.filter(student=self.student).count(), 3
+        )
+        self.assertTrue(
+            Answer.objects.filter(id=uploaded.id, text="").exists()
+        )
+
+        response = self.client.post(
+            self.url, {"answers": self.answers(self.questions)}, "json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_submit_task_validation(self):
+        """
+        Ensure nothing is saved when a question is missing or doesn't
+        belong to the task, or the deadline has passed.
+        """
+        response = self.client.post(
+            self.url, {"answers": self.answers(self.questions[1:])}, "json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            response.data["missing"], [str(self.questions[0].id)]
+        )
+
+        answers = self.answers(self.questions + [QuestionFactory()])
+        response = self.client.post(self.url, {"answers": answers}, "json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        with time_machine.travel(self.task.end_at + timedelta(seconds=1)):
+            response = self.client.post(
+                self.url, {"answers": self.answers(self.questions)}, "json"
+            )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(Answer.objects.exists())
+        self.assertFalse(Result.objects.exists())
+
+
+class TestStudentResultAsync(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.result = ResultFactory(student__is_active=True)
+        cls.token = Token.objects.create(user=cls.result.student)
+
+    def test_retrieve_matches_sync_view(self):
+        """
+        Ensure the async result detail returns what the viewset does and
+        only to the author.
+        """
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {self.token}")
+        url = f"/async/student/result/{self.result.id}/"
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.json(),
+            self.client.get(f"/student/result/{self.result.id}/").json(),
+        )
+
+        other = ResultFactory()
+        response = self.client.get(f"/async/student/result/{other.id}/")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
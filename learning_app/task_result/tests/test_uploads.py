@@ -0,0 +1,150 @@
+import os
+import shutil
+import tempfile
+import time
+import uuid
+from datetime import timedelta
+
+import time_machine
+from django.test import override_settings
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from task_result import uploads
+from task_result.models import AnswerUpload
+
+from .factories import AnswerFactory, ResultFactory
+
+CONTENT = b"0123456789" * 10
+
+
+class TestUploads(APITestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root)
+        settings = override_settings(
+            MEDIA_ROOT=self.media_root, ANSWER_UPLOAD_CHUNK_SIZE=16
+        )
+        settings.enable()
+        self.addCleanup(settings.disable)
+
+        self.answer = AnswerFactory()
+        self.student = self.answer.student
+        self.answer.question.task.course.students.add(self.student)
+        self.client.force_authenticate(user=self.student)
+
+    def start(self, expected=status.HTTP_201_CREATED):
+        response = self.client.post(
+            f"/student/answer/{self.answer.id}/start_upload/",
+            {"filename": "../essay.txt", "size": len(CONTENT)},
+            "json",
+        )
+        self.assertEqual(response.status_code, expected)
+        if response.status_code == status.HTTP_201_CREATED:
+            return f"/student/upload/{response.data['id']}/"
+
+    def put(self, url, first, last):
+        return self.client.put(
+            url,
+            CONTENT[first : last + 1],
+            content_type="application/octet-stream",
+            HTTP_CONTENT_RANGE=f"bytes {first}-{last}/{len(CONTENT)}",
+        )
+
+    def test_resumable_upload(self):
+        """
+        Ensure a file uploaded in chunks is attached to the answer
+        on finalize.
+        """
+        url = self.start()
+        response = self.put(url, 0, 39)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["offset"], 40)
+
+        response = self.client.post(f"{url}finalize/")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        response = self.put(url, 0, 39)
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(response.data["offset"], 40)
+
+        self.assertEqual(self.client.get(url).data["offset"], 40)
+        self.put(url, 40, 99)
+        response = self.client.post(f"{url}finalize/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        self.answer.refresh_from_db()
+        self.assertEqual(
+            self.answer.attachment.name,
+            f"answers/student_{self.student.id}/essay.txt",
+        )
+        with self.answer.attachment.open("rb") as attachment:
+            self.assertEqual(attachment.read(), CONTENT)
+        self.assertEqual(
+            os.listdir(os.path.join(self.media_root, "uploads")), []
+        )
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_upload_validation(self):
+        """
+        Ensure ranges outside of the upload and uploads to submitted
+        answers are rejected.
+        """
+        url = self.start()
+        response = self.client.put(
+            url,
+            CONTENT,
+            content_type="application/octet-stream",
+            HTTP_CONTENT_RANGE=f"bytes 0-{len(CONTENT)}/{len(CONTENT) + 1}",
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        self.put(url, 0, 99)
+        ResultFactory(task=self.answer.question.task, student=self.student)
+        response = self.client.post(f"{url}finalize/")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.answer.refresh_from_db()
+        self.assertFalse(self.answer.attachment)
+
+    @override_settings(ANSWER_UPLOAD_MAX_OPEN=2)
+    def test_open_uploads_limit(self):
+        """
+        Ensure a student can't open more uploads than the limit, until one
+        is aborted or expires.
+        """
+        url = self.start()
+        self.start()
+        self.start(status.HTTP_400_BAD_REQUEST)
+
+        self.client.delete(url)
+        self.start()
+
+        later = timezone.now() + timedelta(hours=25)
+        with time_machine.travel(later):
+            self.start()
+
+    def test_expire_uploads(self):
+        """
+        Ensure abandoned uploads and stray part files are removed, while
+        uploads which got a chunk recently are kept.
+        """
+        abandoned = self.start()
+        directory = os.path.join(self.media_root, "uploads")
+        stray = os.path.join(directory, f"{uuid.uuid4()}.part")
+        open(stray, "wb").close()
+        day_ago = time.time() - 25 * 60 * 60
+        os.utime(stray, (day_ago, day_ago))
+
+        with time_machine.travel(timezone.now() + timedelta(hours=20)):
+            active = self.start()
+            self.put(active, 0, 9)
+        with time_machine.travel(timezone.now() + timedelta(hours=25)):
+            self.assertEqual(uploads.expire_uploads(), 2)
+
+        self.assertEqual(self.client.get(abandoned).status_code, 404)
+        self.assertEqual(self.client.get(active).data["offset"], 10)
+        self.assertEqual(
+            os.listdir(directory), [f"{AnswerUpload.objects.get().id}.part"]
+        )
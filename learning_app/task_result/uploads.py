@@ -0,0 +1,176 @@
+import os
+import re
+import time
+import uuid
+
+from custom_auth.models import User
+from django.conf import settings
+from django.core.files import File
+from django.db import transaction
+from django.utils import timezone
+from rest_framework.validators import ValidationError
+
+from .models import Answer, AnswerUpload, Result
+
+CONTENT_RANGE_RE = re.compile(r"^bytes (\d+)-(\d+)/(\d+)$")
+
+
+class AssembledFile(File):
+    """
+    An assembled upload. Having a temporary file path makes the file system
+    storage move it into place instead of copying it.
+    """
+
+    def temporary_file_path(self):
+        return self.file.name
+
+
+def part_path(upload):
+    return os.path.join(
+        settings.MEDIA_ROOT, settings.ANSWER_UPLOAD_DIR, f"{upload.id}.part"
+    )
+
+
+def ensure_not_submitted(answer):
+    if Result.objects.filter(
+        student_id=answer.student_id, task_id=answer.question.task_id
+    ).exists():
+        err = "You cannot change an answer after submition for review."
+        raise ValidationError(err)
+
+
+def open_uploads(student):
+    expired_at = timezone.now() - settings.ANSWER_UPLOAD_TTL
+    return AnswerUpload.objects.filter(
+        answer__student=student, updated_at__gte=expired_at
+    )
+
+
+@transaction.atomic
+def start_upload(answer, filename, size):
+    """
+    Opens an upload unless the student has ANSWER_UPLOAD_MAX_OPEN open
+    already. The student row is locked, so concurrent starts can't pass
+    the limit together.
+    """
+    ensure_not_submitted(answer)
+    User.objects.select_for_update().get(id=answer.student_id)
+    if open_uploads(answer.student_id).count() >= (
+        settings.ANSWER_UPLOAD_MAX_OPEN
+    ):
+        err = "Finish or abort your other uploads before starting a new one."
+        raise ValidationError(err)
+
+    upload = AnswerUpload.objects.create(
+        answer=answer, filename=os.path.basename(filename), size=size
+    )
+    path = part_path(upload)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    open(path, "wb").close()
+    return upload
+
+
+def parse_content_range(upload, header):
+    """Returns the first and the last byte position of a `Content-Range`."""
+    match = CONTENT_RANGE_RE.match(header or "")
+    if not match:
+        raise ValidationError("Pass a `Content-Range: bytes a-b/size` header.")
+
+    first, last, size = map(int, match.groups())
+    if size != upload.size or first > last or last >= size:
+        raise ValidationError("The range doesn't fit the upload.")
+    return first, last
+
+
+def write_chunk(upload, stream, first, last):
+    """
+    Writes the bytes of a range from the request stream into the part file,
+    a chunk at a time, and moves the upload offset past them. Returns False
+    without writing anything if the range doesn't start at the offset, e.g.
+    because the chunk was already received.
+    """
+    if first != upload.offset:
+        return False
+
+    remaining = last - first + 1
+    with open(part_path(upload), "r+b") as part:
+        part.seek(first)
+        while remaining:
+            chunk = stream.read(
+                min(remaining, settings.ANSWER_UPLOAD_CHUNK_SIZE)
+            )
+            if not chunk:
+                break
+            part.write(chunk)
+            remaining -= len(chunk)
+    if remaining:
+        raise ValidationError("The request body is shorter than the range.")
+
+    # Another request may have written the same range meanwhile, only one
+    # of them moves the offset.
+    moved = AnswerUpload.objects.filter(id=upload.id, offset=first).update(
+        offset=last + 1, updated_at=timezone.now()
+    )
+    if moved:
+        upload.offset = last + 1
+    return bool(moved)
+
+
+@transaction.atomic
+def finalize_upload(upload):
+    """
+    Moves the assembled file into the storage and attaches it to the answer.
+    The answer points to its previous attachment until the transaction
+    commits.
+    """
+    if upload.offset != upload.size:
+        raise ValidationError("The upload is incomplete.")
+
+    answer = (
+        Answer.objects.select_related("question")
+        .select_for_update(of=("self",))
+        .get(id=upload.answer_id)
+    )
+    ensure_not_submitted(answer)
+    with open(part_path(upload), "rb") as part:
+        answer.attachment.save(upload.filename, AssembledFile(part))
+    upload.delete()
+    return answer
+
+
+def expire_uploads():
+    """
+    Deletes the uploads without a chunk for ANSWER_UPLOAD_TTL with their
+    part files, and the part files left behind without an upload. Returns
+    the number of both.
+    """
+    ttl = settings.ANSWER_UPLOAD_TTL
+    # The part files are removed by the post_delete signal.
+    removed, _ = AnswerUpload.objects.filter(
+        updated_at__lt=timezone.now() - ttl
+    ).delete()
+
+    directory = os.path.join(settings.MEDIA_ROOT, settings.ANSWER_UPLOAD_DIR)
+    if not os.path.isdir(directory):
+        return removed
+    stale_before = time.time() - ttl.total_seconds()
+    stray = {}
+    for name in os.listdir(directory):
+        path = os.path.join(directory, name)
+        upload_id, extension = os.path.splitext(name)
+        try:
+            upload_id = uuid.UUID(upload_id)
+        except ValueError:
+            continue
+        if extension == ".part" and os.path.getmtime(path) < stale_before:
+            stray[upload_id] = path
+    for upload_id in AnswerUpload.objects.filter(id__in=stray).values_list(
+        "id", flat=True
+    ):
+        del stray[upload_id]
+    for path in stray.values():
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+    return removed + len(stray)
@@ -4,8 +4,10 @@ from rest_framework.routers import SimpleRouter
 from .views import (
     ProfessorAnswerViewSet,
     ProfessorResultViewSet,
+    StudentAnswerUploadViewSet,
     StudentAnswerViewSet,
     StudentResultViewSet,
+    student_result_detail_async,
 )
 
 professor_router = SimpleRouter()
@@ -14,9 +16,11 @@ professor_router.register("professor/result", ProfessorResultViewSet)
 
 student_router = SimpleRouter()
 student_router.register("student/answer", StudentAnswerViewSet)
+student_router.register("student/upload", StudentAnswerUploadViewSet)
 student_router.register("student/result", StudentResultViewSet)
 
 urlpatterns = [
     path("", include(professor_router.urls)),
     path("", include(student_router.urls)),
+    path("async/student/result/<int:pk>/", student_result_detail_async),
 ]
@@ -1,18 +1,27 @@
+from config.async_views import async_api_view
+from config.search import FullTextSearchFilter
+from config.sendfile import sendfile
+from config.streaming import csv_response
+from custom_auth.context import enrollment_context
 from custom_auth.permissions import IsProfessor, IsStudent
+from django.http import Http404
 from django.utils.decorators import method_decorator
 from drf_yasg import openapi
-from drf_yasg.utils import swagger_auto_schema
+from drf_yasg.utils import no_body, swagger_auto_schema
 from rest_framework import mixins, status
 from rest_framework.decorators import action
-from rest_framework.filters import SearchFilter
 from rest_framework.generics import get_object_or_404
-from rest_framework.parsers import MultiPartParser
+from rest_framework.parsers import JSONParser, MultiPartParser
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
+from rest_framework.validators import ValidationError
 from rest_framework.viewsets import GenericViewSet
 
-from .models import Answer, Result
+from . import grading, uploads
+from .models import Answer, AnswerUpload, Result
 from .serializers import (
+    AnswerUploadSerializer,
+    BulkGradeSerializer,
     ProfessorAnswerSerializer,
     ProfessorResultSerializer,
     StudentAnswerSerializer,
@@ -21,6 +30,27 @@ from .serializers import (
 )
 
 
+TASK_ID_PARAMETER = openapi.Parameter(
+    "task_id",
+    openapi.IN_QUERY,
+    description="Filter by task",
+    type=openapi.TYPE_INTEGER,
+)
+ATTACHMENT_RESPONSES = {
+    200: "The attachment",
+    206: "Requested range of the attachment",
+    304: "Not modified",
+    404: "The answer has no attachment",
+    416: "Range not satisfiable",
+}
+
+
+def attachment_response(request, answer):
+    if not answer.attachment:
+        raise Http404("The answer has no attachment.")
+    return sendfile(request, answer.attachment)
+
+
 class BaseAnswerViewSet(GenericViewSet):
     queryset = Answer.objects.all().order_by("-id")
 
@@ -28,8 +58,10 @@ class BaseAnswerViewSet(GenericViewSet):
         if getattr(self, 'swagger_fake_view', False):
             return Answer.objects.none()
 
-        qs = super().get_queryset()
-        qs = qs.filter(question__task__course__in=self.allowed_courses)
+        course_ids = enrollment_context(self.request).course_ids
+        qs = super().get_queryset().filter(
+            question__task__course_id__in=course_ids
+        )
 
         task_id = self.request.query_params.get("task_id")
         if task_id:
@@ -43,14 +75,7 @@ class BaseAnswerViewSet(GenericViewSet):
     decorator=swagger_auto_schema(
         operation_description="Returns a list of all answers belonging to "
         "professor's courses. Can be filtered by task_id.",
-        manual_parameters=[
-            openapi.Parameter(
-                "task_id",
-                openapi.IN_QUERY,
-                description="Filter by task",
-                type=openapi.TYPE_INTEGER,
-            )
-        ],
+        manual_parameters=[TASK_ID_PARAMETER],
     ),
 )
 @method_decorator(
@@ -72,15 +97,85 @@ class ProfessorAnswerViewSet(
     mixins.UpdateModelMixin,
     BaseAnswerViewSet,
 ):
-    queryset = Answer.objects.all().order_by("-id")
+    queryset = (
+        Answer.objects.select_related("question__task").order_by("-id")
+    )
     permission_classes = (IsAuthenticated, IsProfessor)
     serializer_class = ProfessorAnswerSerializer
-    filter_backends = (SearchFilter,)
+    filter_backends = (FullTextSearchFilter,)
     search_fields = ("student__email",)
+    search_vector_fields = ("student__search_vector",)
+    search_trigram_fields = ("student__email",)
+
+    export_chunk_size = 2000
+
+    @swagger_auto_schema(
+        operation_description="Downloads the attachment of an answer. "
+        "Supports range and conditional requests.",
+        responses=ATTACHMENT_RESPONSES,
+    )
+    @action(methods=("get",), detail=True)
+    def attachment(self, request, pk=None):
+        answer = get_object_or_404(self.get_queryset(), pk=pk)
+        return attachment_response(request, answer)
+
+    @swagger_auto_schema(
+        operation_description="Streams all answers belonging to professor's "
+        "courses as CSV. Can be filtered by task_id.",
+        manual_parameters=[TASK_ID_PARAMETER],
+        responses={200: ""},
+    )
+    @action(methods=("get",), detail=False)
+    def export(self, request):
+        rows = (
+            self.filter_queryset(self.get_queryset())
+            .values_list(
+                "id",
+                "question__task_id",
+                "question__task__title",
+                "question_id",
+                "student__email",
+                "text",
+                "attachment",
+                "grade",
+            )
+            .iterator(chunk_size=self.export_chunk_size)
+        )
+        return csv_response(
+            "answers.csv",
+            (
+                "id",
+                "task_id",
+                "task",
+                "question_id",
+                "student",
+                "text",
+                "attachment",
+                "grade",
+            ),
+            rows,
+        )
 
-    @property
-    def allowed_courses(self):
-        return self.request.user.profess_courses.all()
+    @swagger_auto_schema(
+        operation_description="Sets the grades of many answers at once, "
+        "passed as a JSON list of `{id, grade}` pairs or as the `id` and "
+        "`grade` columns of a CSV file. Nothing is saved if any answer "
+        "doesn't belong to professor's courses.",
+        request_body=BulkGradeSerializer,
+        responses={200: ""},
+    )
+    @action(
+        methods=("post",),
+        detail=False,
+        parser_classes=(JSONParser, MultiPartParser),
+    )
+    def bulk_grade(self, request):
+        serializer = BulkGradeSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        graded = grading.bulk_grade_answers(
+            self.get_queryset(), serializer.validated_data["grades"]
+        )
+        return Response({"graded": graded}, status=status.HTTP_200_OK)
 
 
 @method_decorator(
@@ -88,14 +183,7 @@ class ProfessorAnswerViewSet(
     decorator=swagger_auto_schema(
         operation_description="Returns a list of all answers belonging to "
         "students's courses. Can be filtered by task_id.",
-        manual_parameters=[
-            openapi.Parameter(
-                "task_id",
-                openapi.IN_QUERY,
-                description="Filter by task",
-                type=openapi.TYPE_INTEGER,
-            )
-        ],
+        manual_parameters=[TASK_ID_PARAMETER],
     ),
 )
 @method_decorator(
@@ -111,7 +199,9 @@ class StudentAnswerViewSet(
     mixins.UpdateModelMixin,
     BaseAnswerViewSet,
 ):
-    queryset = Answer.objects.all().order_by("-id")
+    queryset = (
+        Answer.objects.select_related("question__task").order_by("-id")
+    )
     permission_classes = (IsAuthenticated, IsStudent)
     serializer_classes = {
         "default": StudentAnswerSerializer,
@@ -128,9 +218,17 @@ class StudentAnswerViewSet(
             or self.serializer_classes["default"]
         )
 
-    @property
-    def allowed_courses(self):
-        return self.request.user.studied_courses.all()
+    @swagger_auto_schema(
+        operation_description="Downloads the attachment of an own answer. "
+        "Supports range and conditional requests.",
+        responses=ATTACHMENT_RESPONSES,
+    )
+    @action(methods=("get",), detail=True)
+    def attachment(self, request, pk=None):
+        answer = get_object_or_404(
+            self.get_queryset(), pk=pk, student=request.user
+        )
+        return attachment_response(request, answer)
 
     @swagger_auto_schema(
         manual_parameters=[
@@ -160,6 +258,104 @@ class StudentAnswerViewSet(
         answer.save()
         return Response(status=status.HTTP_200_OK)
 
+    @swagger_auto_schema(
+        operation_description="Starts a resumable upload of the answer "
+        "attachment. Send the file in chunks to `/student/upload/{id}/` and "
+        "finalize the upload to attach it.",
+        request_body=AnswerUploadSerializer,
+        responses={201: AnswerUploadSerializer},
+    )
+    @action(methods=("post",), detail=True, parser_classes=(JSONParser,))
+    def start_upload(self, request, pk=None):
+        answer = get_object_or_404(
+            self.get_queryset().select_related("question"),
+            pk=pk,
+            student=request.user,
+        )
+        serializer = AnswerUploadSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        upload = uploads.start_upload(answer, **serializer.validated_data)
+        return Response(
+            AnswerUploadSerializer(upload).data, status=status.HTTP_201_CREATED
+        )
+
+
+CONTENT_RANGE_PARAMETER = openapi.Parameter(
+    "Content-Range",
+    openapi.IN_HEADER,
+    description="Range of the chunk, `bytes first-last/size`.",
+    type=openapi.TYPE_STRING,
+    required=True,
+)
+
+
+@method_decorator(
+    name="retrieve",
+    decorator=swagger_auto_schema(
+        operation_description="Returns an upload with the offset to resume "
+        "it from."
+    ),
+)
+@method_decorator(
+    name="destroy",
+    decorator=swagger_auto_schema(
+        operation_description="Aborts an upload."
+    ),
+)
+class StudentAnswerUploadViewSet(
+    mixins.RetrieveModelMixin,
+    mixins.DestroyModelMixin,
+    GenericViewSet,
+):
+    queryset = AnswerUpload.objects.all()
+    permission_classes = (IsAuthenticated, IsStudent)
+    serializer_class = AnswerUploadSerializer
+
+    def get_queryset(self):
+        if getattr(self, 'swagger_fake_view', False):
+            return AnswerUpload.objects.none()
+
+        return super().get_queryset().filter(answer__student=self.request.user)
+
+    @swagger_auto_schema(
+        operation_description="Writes a chunk of the file, sent as the raw "
+        "request body. The chunk has to start at the upload offset, "
+        "otherwise nothing is written and 409 with the offset is returned.",
+        request_body=no_body,
+        manual_parameters=[CONTENT_RANGE_PARAMETER],
+        responses={200: AnswerUploadSerializer, 409: AnswerUploadSerializer},
+    )
+    def update(self, request, pk=None):
+        upload = self.get_object()
+        first, last = uploads.parse_content_range(
+            upload, request.META.get("HTTP_CONTENT_RANGE")
+        )
+        if int(request.META.get("CONTENT_LENGTH") or 0) != last - first + 1:
+            raise ValidationError("The request body doesn't match the range.")
+
+        if not uploads.write_chunk(upload, request.stream, first, last):
+            upload.refresh_from_db(fields=("offset",))
+            return Response(
+                self.get_serializer(upload).data,
+                status=status.HTTP_409_CONFLICT,
+            )
+        return Response(self.get_serializer(upload).data)
+
+    @swagger_auto_schema(
+        operation_description="Attaches the completely uploaded file to "
+        "the answer.",
+        request_body=no_body,
+        responses={200: StudentAnswerSerializer},
+    )
+    @action(methods=("post",), detail=True)
+    def finalize(self, request, pk=None):
+        answer = uploads.finalize_upload(self.get_object())
+        return Response(
+            StudentAnswerSerializer(
+                answer, context=self.get_serializer_context()
+            ).data
+        )
+
 
 @method_decorator(
     name="update",
@@ -175,22 +371,84 @@ class StudentAnswerViewSet(
         "Only grade field can be updated."
     ),
 )
+@method_decorator(
+    name="list",
+    decorator=swagger_auto_schema(
+        operation_description="Returns a list of all results belonging to "
+        "professor's courses. Can be filtered by task_id.",
+        manual_parameters=[TASK_ID_PARAMETER],
+    ),
+)
 class ProfessorResultViewSet(
     mixins.RetrieveModelMixin,
     mixins.ListModelMixin,
     mixins.UpdateModelMixin,
     GenericViewSet,
 ):
-    queryset = Result.objects.all().order_by("-id")
+    queryset = Result.objects.select_related("task").order_by("-id")
     permission_classes = (IsAuthenticated, IsProfessor)
     serializer_class = ProfessorResultSerializer
+    export_chunk_size = 2000
 
     def get_queryset(self):
         if getattr(self, 'swagger_fake_view', False):
             return Result.objects.none()
 
         professor = self.request.user
-        return super().get_queryset().filter(task__course__professor=professor)
+        qs = super().get_queryset().filter(task__course__professor=professor)
+
+        task_id = self.request.query_params.get("task_id")
+        if task_id:
+            qs = qs.filter(task=task_id)
+
+        return qs
+
+    @swagger_auto_schema(
+        operation_description="Streams all results belonging to professor's "
+        "courses as CSV. Can be filtered by task_id.",
+        manual_parameters=[TASK_ID_PARAMETER],
+        responses={200: ""},
+    )
+    @action(methods=("get",), detail=False)
+    def export(self, request):
+        rows = (
+            self.filter_queryset(self.get_queryset())
+            .values_list(
+                "id",
+                "task_id",
+                "task__title",
+                "student__email",
+                "created_at",
+                "grade",
+            )
+            .iterator(chunk_size=self.export_chunk_size)
+        )
+        return csv_response(
+            "results.csv",
+            ("id", "task_id", "task", "student", "created_at", "grade"),
+            rows,
+        )
+
+    @swagger_auto_schema(
+        operation_description="Sets the grades of many results at once, "
+        "passed as a JSON list of `{id, grade}` pairs or as the `id` and "
+        "`grade` columns of a CSV file. Nothing is saved if any result "
+        "doesn't belong to professor's courses or is graded from answers.",
+        request_body=BulkGradeSerializer,
+        responses={200: ""},
+    )
+    @action(
+        methods=("post",),
+        detail=False,
+        parser_classes=(JSONParser, MultiPartParser),
+    )
+    def bulk_grade(self, request):
+        serializer = BulkGradeSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        graded = grading.bulk_grade_results(
+            self.get_queryset(), serializer.validated_data["grades"]
+        )
+        return Response({"graded": graded}, status=status.HTTP_200_OK)
 
 
 @method_decorator(
@@ -215,3 +473,10 @@ class StudentResultViewSet(
             return Result.objects.none()
 
         return super().get_queryset().filter(student=self.request.user)
+
+
+@async_api_view(permission_classes=(IsAuthenticated, IsStudent))
+async def student_result_detail_async(request, pk):
+    """`StudentResultViewSet.retrieve` on the async ORM."""
+    result = await Result.objects.aget(pk=pk, student=request.user)
+    return StudentResultSerializer(result).data